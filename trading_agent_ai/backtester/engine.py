@@ -8,6 +8,7 @@ import sys
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from trading_agent_ai.src.core.logger import setup_logging
+from trading_agent_ai.src.data_handler.parquet_archive import ParquetArchive
 from trading_agent_ai.backtester.strategies import multi_fusion_strategy # Import the strategy logic
 
 log = setup_logging("backtest_engine")
@@ -93,18 +94,30 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run a backtest using the vectorbt engine.")
     parser.add_argument("--data", type=str, default="data/processed/feature_rich_data.csv", help="Path to the feature-rich data file for backtesting.")
     parser.add_argument("--plot", action="store_true", help="If set, plots the backtest results.")
+    parser.add_argument("--ticker", type=str, help="Load bars for this ticker from the Parquet archive instead of --data.")
+    parser.add_argument("--interval", type=str, default="1day", help="Archived bar interval (bars_<interval>).")
+    parser.add_argument("--start", type=str, help="Archive range start (ISO date/time, inclusive).")
+    parser.add_argument("--end", type=str, help="Archive range end (ISO date/time, exclusive).")
+    parser.add_argument("--archive", type=str, default="local_database/archive", help="Parquet archive root.")
 
     args = parser.parse_args()
 
     project_root = Path(__file__).parent.parent
     data_path = project_root / args.data
-
-    if not data_path.exists():
+    price_data = None
+
+    if args.ticker:
+        # Only the ticker's partitions in [start, end) are opened, and only the OHLCV columns decoded
+        archive = ParquetArchive(project_root / args.archive)
+        price_data = archive.read_bars(args.ticker, args.interval, args.start, args.end)
+        log.info(f"Loaded {len(price_data)} {args.interval} bars for {args.ticker} from {archive.root}")
+    elif not data_path.exists():
         log.error(f"Data file not found: {data_path}")
     else:
         # Load data
         price_data = pd.read_csv(data_path, index_col='date', parse_dates=True)
 
+    if price_data is not None:
         # Define strategy parameters (example)
         params = {
             'rsi_period': 14,
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Entity Linker Benchmark
+Measures headline-to-ticker linking cost for an alias index of a few
+thousand instruments: the EntityLinker's word-level Aho-Corasick
+automaton against a baseline that checks every alias against the
+headline's words, and one precompiled alternation regex.
+
+Usage: python benchmarks/bench_entity_linker.py [--instruments 3000] [--headlines 20000] [--seed 1]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+# Add the project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.news_handler.entity_linker import EntityLinker, tokenize
+
+SYLLABLES = ["ra", "ko", "tan", "vi", "shu", "mal", "dri", "pen", "gan", "lo", "sar", "bha", "tek", "nu", "zo"]
+SUFFIXES = ["Industries", "Finance", "Pharma", "Motors", "Bank", "Steel", "Power", "Chemicals", "Textiles", "Labs"]
+FILLER = ["shares", "rise", "fall", "after", "quarterly", "results", "beat", "estimates", "as", "investors",
+          "book", "profits", "amid", "global", "selloff", "on", "heavy", "volumes", "says", "report"]
+
+
+def make_aliases(n, rng):
+    aliases = {}
+    while len(aliases) < n:
+        name = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+        ticker = name.upper()[:10]
+        if ticker not in aliases:
+            aliases[ticker] = [f"{name} {rng.choice(SUFFIXES)}", name]
+    return aliases
+
+
+def make_headlines(n, aliases, rng):
+    names = [names[0] for names in aliases.values()]
+    headlines = []
+    for _ in range(n):
+        words = rng.sample(FILLER, rng.randint(8, 12))
+        for _ in range(rng.choice((0, 1, 1, 2))):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(names))
+        headlines.append(" ".join(words).capitalize())
+    return headlines
+
+
+class ScanLinker:
+    """Baseline: every alias checked against the headline's word sequence."""
+
+    def __init__(self, aliases):
+        self.aliases = [(" " + " ".join(tokenize(name)).lower() + " ", ticker)
+                        for ticker, names in aliases.items() for name in (ticker, *names)]
+
+    def link(self, text):
+        padded = " " + " ".join(tokenize(text)).lower() + " "
+        return tuple(dict.fromkeys(ticker for alias, ticker in self.aliases if alias in padded))
+
+
+class RegexLinker:
+    """Baseline: one alternation of all aliases (longest first), matched case-insensitively."""
+
+    def __init__(self, aliases):
+        lookup = {}
+        for ticker, names in aliases.items():
+            for name in (ticker, *names):
+                lookup[" ".join(tokenize(name)).lower()] = ticker
+        self.lookup = lookup
+        pattern = "|".join(re.escape(alias) for alias in sorted(lookup, key=len, reverse=True))
+        self.regex = re.compile(rf"\b(?:{pattern})\b")
+
+    def link(self, text):
+        normalized = " ".join(tokenize(text)).lower()
+        return tuple(dict.fromkeys(self.lookup[match] for match in self.regex.findall(normalized)))
+
+
+def measure(label, linker, headlines):
+    started = time.perf_counter()
+    linked = sum(1 for headline in headlines if linker.link(headline))
+    elapsed = time.perf_counter() - started
+    print(f"{label:<24} {elapsed / len(headlines) * 1e6:>8.2f} us/headline  {len(headlines) / elapsed:>10,.0f} headlines/s"
+          f"  ({linked:,} linked)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark headline-to-ticker linking.")
+    parser.add_argument("--instruments", type=int, default=3000, help="Instruments in the alias index.")
+    parser.add_argument("--headlines", type=int, default=20000, help="Headlines to link.")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    aliases = make_aliases(args.instruments, rng)
+    headlines = make_headlines(args.headlines, aliases, rng)
+
+    started = time.perf_counter()
+    linker = EntityLinker(aliases)
+    print(f"--- {len(aliases):,} instruments, {linker.alias_count:,} aliases, {len(linker.goto):,} states, "
+          f"built in {(time.perf_counter() - started) * 1e3:.0f} ms ---")
+    measure("EntityLinker", linker, headlines)
+    started = time.perf_counter()
+    regex_linker = RegexLinker(aliases)
+    print(f"(regex compiled in {(time.perf_counter() - started) * 1e3:.0f} ms)")
+    measure("Alternation regex", regex_linker, headlines)
+    measure("Alias scan", ScanLinker(aliases), headlines[:max(1, len(headlines) // 20)])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Event Types Benchmark
+Compares allocation size and construction throughput of the slotted,
+epoch-ns MarketEvent against the previous plain dataclass with a datetime
+timestamp, and of one MarketEventBatch per frame against per-tick events.
+
+Usage: python benchmarks/bench_event_types.py [--ticks 200000] [--frame-size 100]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+
+# Add the project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.core.event_types import MarketEvent, MarketEventBatch
+
+TICKERS = ["NIFTY", "BANKNIFTY", "RELIANCE", "TCS", "INFY", "HDFCBANK", "ICICIBANK", "SBIN"]
+
+
+@dataclass
+class LegacyMarketEvent:
+    """The MarketEvent layout before slots and integer timestamps."""
+    timestamp: datetime
+    ticker: str
+    price: float
+    volume: int
+
+
+def make_legacy(n):
+    return [LegacyMarketEvent(datetime.now(), TICKERS[i % 8], 100.0 + i, i) for i in range(n)]
+
+
+def make_slotted(n):
+    return [MarketEvent(TICKERS[i % 8], 100.0 + i, i) for i in range(n)]
+
+
+def make_batches(n, frame_size):
+    batches = []
+    for start in range(0, n, frame_size):
+        frame = [(TICKERS[i % 8], 100.0 + i, i) for i in range(start, min(start + frame_size, n))]
+        batches.append(MarketEventBatch.from_ticks(frame))
+    return batches
+
+
+def measure(label, factory, n, repeat=3):
+    # Throughput is timed without tracemalloc, which slows allocation down
+    elapsed = min(_timed(factory) for _ in range(repeat))
+
+    tracemalloc.start()
+    objects = factory()
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    print(f"{label:<32} {n / elapsed:>14,.0f} ticks/s {current / n:>10.1f} bytes/tick")
+
+
+def _timed(factory):
+    started = time.perf_counter()
+    factory()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark event type allocation and throughput.")
+    parser.add_argument("--ticks", type=int, default=200000, help="Number of ticks to create.")
+    parser.add_argument("--frame-size", type=int, default=100, help="Ticks per MarketEventBatch.")
+    args = parser.parse_args()
+
+    n = args.ticks
+    print(f"--- {n:,} ticks ---")
+    measure("dataclass + datetime (before)", lambda: make_legacy(n), n)
+    measure("slotted frozen + ts_ns", lambda: make_slotted(n), n)
+    measure(f"MarketEventBatch x{args.frame_size}", lambda: make_batches(n, args.frame_size), n)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Feed Decoder Benchmark
+Decoded ticks per second for the previous per-message path (json.loads and
+one MarketEvent per tick) against the batched decoders, over frames of
+several sizes. The JSON decoder uses orjson when it is installed.
+
+Usage: python benchmarks/bench_feed_decoders.py [--ticks 200000] [--frame-sizes 1,10,100,500]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+# Add the project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.core.event_types import MarketEvent
+from src.data_handler.feed_decoders import BinaryDecoder, JsonDecoder, orjson
+
+INSTRUMENTS = {100000 + i: f"SYM{i}" for i in range(500)}
+
+
+def make_ticks(n, seed=7):
+    rng = random.Random(seed)
+    symbols = list(INSTRUMENTS.values())
+    return [(rng.choice(symbols), round(rng.uniform(100, 5000), 2), rng.randint(1, 1000)) for _ in range(n)]
+
+
+def legacy_frames(ticks):
+    """One JSON message per tick, as WebsocketManager used to receive."""
+    return [json.dumps({"type": "tick", "ticker": t, "price": p, "volume": v}) for t, p, v in ticks]
+
+
+def legacy_decode(frames):
+    events = []
+    for message in frames:
+        data = json.loads(message)
+        if data.get("type") == "tick":
+            events.append(MarketEvent(ticker=data["ticker"], price=data["price"], volume=data["volume"]))
+    return events
+
+
+def json_frames(ticks, size):
+    return [
+        json.dumps({"type": "ticks", "data": [{"ticker": t, "price": p, "volume": v}
+                                              for t, p, v in ticks[i:i + size]]}).encode()
+        for i in range(0, len(ticks), size)
+    ]
+
+
+def binary_frames(decoder, ticks, size):
+    return [decoder.encode(ticks[i:i + size], ts_ns=time.time_ns()) for i in range(0, len(ticks), size)]
+
+
+def measure(label, decode, frames, n, repeat=3):
+    elapsed = min(_timed(decode, frames) for _ in range(repeat))
+    print(f"{label:<28} {n / elapsed:>14,.0f} ticks/s {len(frames) / elapsed:>12,.0f} frames/s")
+
+
+def _timed(decode, frames):
+    started = time.perf_counter()
+    decode(frames)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark websocket frame decoding throughput.")
+    parser.add_argument("--ticks", type=int, default=200000, help="Number of ticks to decode.")
+    parser.add_argument("--frame-sizes", default="1,10,100,500", help="Comma-separated ticks per frame.")
+    args = parser.parse_args()
+
+    n = args.ticks
+    ticks = make_ticks(n)
+    json_decoder = JsonDecoder()
+    binary_decoder = BinaryDecoder(INSTRUMENTS)
+    print(f"--- {n:,} ticks over {len(INSTRUMENTS)} instruments (orjson: {'yes' if orjson else 'no'}) ---")
+    measure("json.loads + MarketEvent", legacy_decode, legacy_frames(ticks), n)
+
+    for size in (int(s) for s in args.frame_sizes.split(",")):
+        frames = json_frames(ticks, size)
+        measure(f"JsonDecoder x{size}", lambda fs: [json_decoder.decode(f) for f in fs], frames, n)
+        frames = binary_frames(binary_decoder, ticks, size)
+        measure(f"BinaryDecoder x{size}", lambda fs: [binary_decoder.decode(f) for f in fs], frames, n)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Market Load Benchmark
+Drives MainFuser and PnLTracker from the market simulator at a target tick
+rate, with no broker connection, and prints the achieved rate, how far the
+simulator fell behind real time, and the event bus's per-subscriber stats.
+
+Usage: python benchmarks/bench_market_load.py [--rate 10000] [--seconds 10] [--tickers 200]
+                                              [--scenario open] [--seed 1]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+
+# Add the project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.core.event_bus import event_bus
+from src.core.event_types import MarketEvent, MarketEventBatch
+from src.data_handler.market_simulator import SCENARIOS, MarketSimulator
+from src.portfolio_manager.portfolio import Portfolio
+from src.portfolio_manager.pnl_tracker import PnLTracker
+from src.strategy_handler.main_fuser import MainFuser
+
+
+async def run(args):
+    tickers = {f"SYM{i:04d}": 100.0 + i for i in range(args.tickers)}
+    simulator = MarketSimulator(tickers, rate=args.rate, scenario=args.scenario, seed=args.seed, speed=args.speed)
+
+    fuser = MainFuser()
+    fuser.start()
+    pnl_tracker = PnLTracker(Portfolio())
+    subscription = event_bus.subscribe("pnl", (MarketEvent, MarketEventBatch), conflate=True)
+
+    async def feed_pnl():
+        while True:
+            event = await subscription.get()
+            await pnl_tracker.on_market_data(event)
+            subscription.task_done()
+
+    pnl_task = asyncio.create_task(feed_pnl())
+    started = time.perf_counter()
+    await simulator.run(event_bus, duration=args.seconds)
+    await event_bus.join()
+    elapsed = time.perf_counter() - started
+    pnl_task.cancel()
+    fuser.listen_task.cancel()
+    fuser.news_task.cancel()
+    fuser.depth_task.cancel()
+
+    stats = simulator.stats()
+    print(f"--- {args.tickers} tickers, target {args.rate:,.0f} ticks/s, scenario={args.scenario} ---")
+    print(f"ticks: {stats['ticks']:,}  wall: {elapsed:.2f}s  achieved: {stats['ticks'] / elapsed:,.0f} ticks/s  "
+          f"max lag: {stats['max_lag_ms']:.1f} ms")
+    for name, sub in event_bus.get_stats().items():
+        wait = sub["wait_us"].get("MarketEvent", {})
+        handler = sub["handler_us"].get("MarketEvent", {})
+        print(f"{name:<12} coalesced={sub['coalesced']:>9,} dropped={sub['dropped']:>7,} "
+              f"wait p99={wait.get('p99', 0)}us handler p99={handler.get('p99', 0)}us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the strategy and P&L path with synthetic ticks.")
+    parser.add_argument("--rate", type=float, default=10000, help="Target ticks per second.")
+    parser.add_argument("--seconds", type=float, default=10, help="Simulated seconds to run.")
+    parser.add_argument("--tickers", type=int, default=200, help="Number of simulated tickers.")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="none")
+    parser.add_argument("--speed", type=float, default=1.0, help="Simulated seconds per wall second (0 = unpaced).")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
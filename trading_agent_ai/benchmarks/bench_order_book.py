@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Order Book Benchmark
+Measures OrderBook update throughput for incremental single-level depth
+updates and for full snapshots, with and without reading best bid/ask,
+spread, depth-weighted mid and imbalance after every update. A
+dict-per-side book that sorts on every read is timed as the baseline.
+
+Usage: python benchmarks/bench_order_book.py [--updates 200000] [--depth 20] [--seed 1]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add the project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.core.event_types import DepthEvent
+from src.data_handler.order_book import OrderBook
+
+TICK = 0.05
+MID = 18000.0
+
+
+def make_updates(n, depth, seed):
+    """Single-level updates clustered near the touch of a slowly drifting mid; ~30% remove a level."""
+    rng = np.random.default_rng(seed)
+    drift = np.cumsum(rng.integers(-1, 2, n)) // 50
+    offsets = np.minimum(rng.geometric(0.25, n), depth + 5)
+    is_bid = rng.random(n) < 0.5
+    sizes = np.where(rng.random(n) < 0.3, 0, rng.integers(1, 500, n))
+    events = []
+    for i in range(n):
+        level = (round(MID + (drift[i] + (-offsets[i] if is_bid[i] else offsets[i])) * TICK, 2), int(sizes[i]))
+        events.append(DepthEvent("NIFTY", bids=(level,), ts_ns=i) if is_bid[i]
+                      else DepthEvent("NIFTY", asks=(level,), ts_ns=i))
+    return events
+
+
+def make_snapshots(n, depth, seed):
+    rng = np.random.default_rng(seed)
+    steps = np.arange(1, depth + 1)
+    return [
+        DepthEvent("NIFTY",
+                   bids=tuple(zip((MID - steps * TICK).round(2).tolist(), rng.integers(1, 500, depth).tolist())),
+                   asks=tuple(zip((MID + steps * TICK).round(2).tolist(), rng.integers(1, 500, depth).tolist())),
+                   ts_ns=i, snapshot=True)
+        for i in range(n)
+    ]
+
+
+class DictBook:
+    """Baseline: price -> size dicts, sorted whenever the top of book is read."""
+
+    def __init__(self, depth):
+        self.depth = depth
+        self.bids, self.asks = {}, {}
+
+    def apply(self, event):
+        if event.snapshot:
+            self.bids, self.asks = dict(event.bids), dict(event.asks)
+            return
+        for side, levels in ((self.bids, event.bids), (self.asks, event.asks)):
+            for price, size in levels:
+                if size:
+                    side[price] = size
+                else:
+                    side.pop(price, None)
+
+    def read(self):
+        bids = sorted(self.bids.items(), reverse=True)[:self.depth]
+        asks = sorted(self.asks.items())[:self.depth]
+        if not bids or not asks:
+            return None
+        bid_size, ask_size = sum(s for _, s in bids), sum(s for _, s in asks)
+        bid_vwap = sum(p * s for p, s in bids) / bid_size
+        ask_vwap = sum(p * s for p, s in asks) / ask_size
+        return (bids[0][0], asks[0][0], asks[0][0] - bids[0][0],
+                (bid_vwap * ask_size + ask_vwap * bid_size) / (bid_size + ask_size),
+                (bid_size - ask_size) / (bid_size + ask_size))
+
+
+def read_book(book):
+    return book.best_bid, book.best_ask, book.spread, book.weighted_mid(), book.imbalance()
+
+
+def measure(label, book_factory, events, read=None, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        book = book_factory()
+        started = time.perf_counter()
+        if read is None:
+            for event in events:
+                book.apply(event)
+        else:
+            for event in events:
+                book.apply(event)
+                read(book)
+        best = min(best, time.perf_counter() - started)
+    print(f"{label:<34} {len(events) / best:>12,.0f} updates/s  {best / len(events) * 1e9:>8.0f} ns/update")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark L2 order book updates.")
+    parser.add_argument("--updates", type=int, default=200000, help="Incremental updates to apply.")
+    parser.add_argument("--depth", type=int, default=20, help="Price levels kept per side.")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    updates = make_updates(args.updates, args.depth, args.seed)
+    snapshots = make_snapshots(max(1, args.updates // 10), args.depth, args.seed)
+    print(f"--- depth {args.depth}, {len(updates):,} incremental updates, {len(snapshots):,} snapshots ---")
+    measure("OrderBook incremental", lambda: OrderBook("NIFTY", args.depth), updates)
+    measure("OrderBook incremental + reads", lambda: OrderBook("NIFTY", args.depth), updates, read_book)
+    measure("DictBook incremental + reads", lambda: DictBook(args.depth), updates, DictBook.read)
+    measure("OrderBook snapshot", lambda: OrderBook("NIFTY", args.depth), snapshots)
+    measure("OrderBook snapshot + reads", lambda: OrderBook("NIFTY", args.depth), snapshots, read_book)
+    measure("DictBook snapshot + reads", lambda: DictBook(args.depth), snapshots, DictBook.read)
+
+
+if __name__ == "__main__":
+    main()
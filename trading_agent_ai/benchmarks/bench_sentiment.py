@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Sentiment Scoring Benchmark
+Measures headline scoring throughput for a market-open burst: the current
+one-call-per-headline SentimentAnalyzer path against SentimentService
+batches, uncached and cached, inline and on a thread or process pool. For
+the async runs the longest event-loop stall during the burst is reported
+as well.
+
+Usage: python benchmarks/bench_sentiment.py [--headlines 500] [--syndicated 0.4] [--workers 4] [--seed 1]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+# Add the project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.core.sentiment import SentimentAnalyzer, SentimentService
+
+SUBJECTS = ["Reliance", "TCS", "Infosys", "HDFC Bank", "ICICI Bank", "SBI", "Nifty", "Sensex", "Rupee", "RBI"]
+VERBS = ["surges", "slumps", "rallies", "crashes", "gains", "falls", "beats estimates", "misses estimates",
+         "holds steady", "hits record high"]
+TAILS = ["after strong quarterly results", "amid global selloff", "as investors book profits",
+         "on upbeat guidance", "despite weak demand", "ahead of policy meeting", "on heavy volumes",
+         "as FII outflows continue"]
+
+
+def make_headlines(n, syndicated, seed):
+    """`n` headlines; a `syndicated` share repeat an earlier one, as other feeds carry it."""
+    rng = random.Random(seed)
+    headlines = []
+    for i in range(n):
+        if headlines and rng.random() < syndicated:
+            headlines.append(rng.choice(headlines))
+        else:
+            headlines.append(f"{rng.choice(SUBJECTS)} {rng.choice(VERBS)} {rng.choice(TAILS)} ({i})")
+    return headlines
+
+
+def report(label, n, seconds, stall=None):
+    line = f"{label:<34} {n / seconds:>10,.0f} headlines/s  {seconds * 1e3:>8.1f} ms/burst"
+    if stall is not None:
+        line += f"  max loop stall {stall * 1e3:>6.1f} ms"
+    print(line)
+
+
+async def burst_on_loop(service, headlines):
+    """Scores `headlines` while a 1 ms ticker measures how long the loop was blocked."""
+    stall = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal stall
+        loop = asyncio.get_running_loop()
+        while not done:
+            before = loop.time()
+            await asyncio.sleep(0.001)
+            stall = max(stall, loop.time() - before - 0.001)
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    await service.ascore_many(headlines)
+    elapsed = time.perf_counter() - started
+    done = True
+    await task
+    return elapsed, stall
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batched, cached sentiment scoring.")
+    parser.add_argument("--headlines", type=int, default=500, help="Headlines in the burst.")
+    parser.add_argument("--syndicated", type=float, default=0.4, help="Share of headlines repeated across feeds.")
+    parser.add_argument("--workers", type=int, default=4, help="Processes for the process-pool run.")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    headlines = make_headlines(args.headlines, args.syndicated, args.seed)
+    n = len(headlines)
+    print(f"--- {n} headlines, {len(set(headlines))} distinct ---")
+    analyzer = SentimentAnalyzer()
+
+    started = time.perf_counter()
+    for headline in headlines:
+        analyzer.get_sentiment(headline)
+    report("get_sentiment per headline", n, time.perf_counter() - started)
+
+    service = SentimentService(analyzer, executor="none")
+    started = time.perf_counter()
+    service.score_many(headlines)
+    report("score_many uncached", n, time.perf_counter() - started)
+    started = time.perf_counter()
+    service.score_many(headlines)
+    report("score_many cached", n, time.perf_counter() - started)
+
+    for label, executor, workers in (("ascore_many inline", "none", 1), ("ascore_many thread", "thread", 1),
+                                     (f"ascore_many {args.workers} processes", "process", args.workers)):
+        service = SentimentService(analyzer, executor=executor, workers=workers)
+        if executor == "process":
+            # Start the workers and build their analyzers outside the timing
+            asyncio.run(service.ascore_many([f"warm-up {i}" for i in range(workers * service.chunk_size)]))
+        elapsed, stall = asyncio.run(burst_on_loop(service, headlines))
+        report(label + " uncached", n, elapsed, stall)
+        elapsed, stall = asyncio.run(burst_on_loop(service, headlines))
+        report(label + " cached", n, elapsed, stall)
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
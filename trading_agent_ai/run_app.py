@@ -4,130 +4,209 @@ Main runner script for the Trading Agent AI application.
 This script handles the proper module imports and runs the application.
 """
 
+import argparse
 import os
 import sys
 import asyncio
-import qasync
-from PyQt6.QtWidgets import QApplication
 
 # Add the project root to Python path
 project_root = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, project_root)
 
+# Installed before any other project import so that --startup-profile
+# sees every module the app loads
+from src.core.startup import StartupProfiler
+profiler = StartupProfiler(enabled="--startup-profile" in sys.argv)
+
 from src.core.config_loader import ConfigLoader
 from src.core.logger import setup_logging
-from src.core.database import Database
 from src.core.event_bus import event_bus
-from src.data_handler.broker_connector import BrokerConnector
-from src.news_handler.rss_fetcher import RSSFetcher
-from src.strategy_handler.main_fuser import MainFuser
-from src.portfolio_manager.portfolio import Portfolio
-from src.portfolio_manager.risk_manager import RiskManager
-from src.portfolio_manager.pnl_tracker import PnLTracker
-from src.execution_handler.broker_executor import BrokerExecutor
-from src.ui.main_overlay import MainOverlay
-from src.ui.ui_manager import UIManager
-from src.core.event_types import MarketEvent, NewsEvent, VisionEvent, SignalEvent, OrderRequestEvent, FillEvent
-
-async def main():
+from src.core.event_types import MarketEvent, MarketEventBatch, NewsEvent, VisionEvent, SignalEvent, OrderRequestEvent, FillEvent
+
+# Optional subsystems (Qt, RSS/VADER, vision, journal, workers, tick store)
+# are imported inside main() only when enabled in main_config.ini.
+
+
+def enabled(config: ConfigLoader, section: str, key: str = "enabled", fallback: str = "false") -> bool:
+    return config.get(section, key, fallback=fallback).lower() == "true"
+
+
+async def main(config: ConfigLoader):
     """Main application entry point."""
-    # Initialize configuration and logging
-    config = ConfigLoader()
+    # Initialize logging
     logging_config_path = os.path.join(project_root, 'config', 'logging.ini')
     setup_logging(logging_config_path)
+    event_bus.configure(config)
+    use_ui = enabled(config, "UI", fallback="true")
+    use_news = enabled(config, "News", fallback="true")
+    use_vision = enabled(config, "Vision")
+
+    # Record the session for offline replay if enabled
+    journal = None
+    if enabled(config, "Journal"):
+        JournalWriter = profiler.load("src.core.journal", "JournalWriter")
+        with profiler.phase("init JournalWriter"):
+            journal = JournalWriter.for_session(config.get("Journal", "journal_dir", fallback="local_database/journals"))
+            journal.attach(event_bus)
     
     # Initialize database
-    db = Database(config)
-    db.initialize()
+    Database = profiler.load("src.core.database", "Database")
+    with profiler.phase("init Database"):
+        db = Database(config)
+        db.initialize()
+
+    # Optionally record every tick into the time-series tables
+    tick_recorder = None
+    if enabled(config, "Database", "record_ticks"):
+        TickRecorder = profiler.load("src.data_handler.tick_recorder", "TickRecorder")
+        with profiler.phase("init TickRecorder"):
+            tick_recorder = TickRecorder.from_config(config, db)
+
+    # Optionally build live OHLCV bars from the ticks
+    bar_aggregator = None
+    if enabled(config, "Bars"):
+        BarAggregator = profiler.load("src.data_handler.bar_aggregator", "BarAggregator")
+        with profiler.phase("init BarAggregator"):
+            bar_aggregator = BarAggregator.from_config(config)
     
     # Initialize core components
-    broker_connector = BrokerConnector(config)
-    rss_fetcher = RSSFetcher(config)
-    main_fuser = MainFuser()
-    portfolio = Portfolio()
-    risk_manager = RiskManager(portfolio)
-    pnl_tracker = PnLTracker(portfolio)
-    broker_executor = BrokerExecutor(config)
+    BrokerConnector = profiler.load("src.data_handler.broker_connector", "BrokerConnector")
+    MainFuser = profiler.load("src.strategy_handler.main_fuser", "MainFuser")
+    Portfolio = profiler.load("src.portfolio_manager.portfolio", "Portfolio")
+    RiskManager = profiler.load("src.portfolio_manager.risk_manager", "RiskManager")
+    PnLTracker = profiler.load("src.portfolio_manager.pnl_tracker", "PnLTracker")
+    BrokerExecutor = profiler.load("src.execution_handler.broker_executor", "BrokerExecutor")
+    with profiler.phase("init core components"):
+        broker_connector = BrokerConnector(config)
+        main_fuser = MainFuser(config)
+        portfolio = Portfolio()
+        risk_manager = RiskManager(portfolio)
+        pnl_tracker = PnLTracker(portfolio)
+        broker_executor = BrokerExecutor(broker_connector.get_api_client())
+
+    # Optionally move news scoring and vision off the main event loop
+    supervisor = None
+    if enabled(config, "Workers"):
+        workers = profiler.load("src.core.workers")
+        supervisor = workers.WorkerSupervisor.from_config(config)
+        config_dir = str(config.config_dir)
+        if use_news and enabled(config, "Workers", "news", fallback="true"):
+            supervisor.add_worker("news", workers.news_worker, (config_dir,))
+        if use_vision and enabled(config, "Workers", "perception"):
+            ticker = config.get("Vision", "ticker", fallback="NIFTY")
+            supervisor.add_worker("perception", workers.perception_worker, (config_dir, ticker))
+
+    # News and vision run here unless a worker process owns them
+    rss_fetcher = None
+    if use_news and not (supervisor and "news" in supervisor.workers):
+        RSSFetcher = profiler.load("src.news_handler.rss_fetcher", "RSSFetcher")
+        with profiler.phase("init RSSFetcher"):
+            rss_fetcher = RSSFetcher(config)
+    perception = None
+    if use_vision and not (supervisor and "perception" in supervisor.workers):
+        Perception = profiler.load("src.vision.perception", "Perception")
+        with profiler.phase("init Perception"):
+            perception = Perception(config)
     
     # Initialize UI components
-    main_overlay = MainOverlay()
-    ui_manager = UIManager(main_overlay)
+    ui_manager = None
+    if use_ui:
+        MainOverlay = profiler.load("src.ui.main_overlay", "MainOverlay")
+        UIManager = profiler.load("src.ui.ui_manager", "UIManager")
+        with profiler.phase("init UI"):
+            main_overlay = MainOverlay()
+            ui_manager = UIManager(main_overlay)
     
-    # Event dispatcher
-    async def event_dispatcher():
-        try:
-            while True:
-                event = await asyncio.wait_for(event_bus.get(), timeout=1.0)
-                
+    # Event dispatcher for the components that don't own a subscription.
+    # MainFuser and UIManager subscribe to the bus themselves. Only market
+    # data may be conflated or shed under load: signals, orders and fills
+    # get a lossless subscription of their own.
+    dispatcher_subscription = event_bus.subscribe("dispatcher", (SignalEvent, OrderRequestEvent, FillEvent))
+    market_subscription = event_bus.subscribe("dispatcher_market", (MarketEvent, MarketEventBatch), conflate=True)
+
+    async def event_dispatcher(subscription):
+        while True:
+            event = await subscription.get()
+            try:
                 if isinstance(event, MarketEvent):
-                    await main_fuser.handle_market_event(event)
-                    # Portfolio doesn't handle market events directly in this implementation
                     await pnl_tracker.on_market_data(event)
-                    ui_manager.update_market_data(event)
-                    
-                elif isinstance(event, NewsEvent):
-                    await main_fuser.handle_news_event(event)
-                    
-                elif isinstance(event, VisionEvent):
-                    await main_fuser.handle_vision_event(event)
-                    
+
                 elif isinstance(event, SignalEvent):
+                    db.save_signal({
+                        'ticker': event.ticker, 'signal': event.signal,
+                        'confidence': event.confidence, 'reason': event.reason
+                    })
                     # Check with risk manager
                     await risk_manager.on_signal(event)
-                    ui_manager.add_signal(event)
-                    
+
                 elif isinstance(event, OrderRequestEvent):
-                    await broker_executor.execute_order(event)
-                    
+                    await broker_executor.on_order_request(event)
+
                 elif isinstance(event, FillEvent):
+                    db.save_trade({
+                        'ticker': event.ticker, 'action': event.action, 'quantity': event.quantity,
+                        'price': event.price, 'order_id': event.order_id
+                    })
                     portfolio.on_fill(event)
-                    # PnLTracker doesn't have update_fill method
-                    ui_manager.update_portfolio(portfolio.get_positions())
-                    
-        except asyncio.TimeoutError:
-            # Normal timeout, continue
-            pass
-        except Exception as e:
-            print(f"Error in event dispatcher: {e}")
+                    if ui_manager:
+                        ui_manager.update_portfolio(portfolio.get_positions())
+            except Exception as e:
+                print(f"Error in event dispatcher: {e}")
+            finally:
+                subscription.task_done()
     
     # Start all components
     try:
         print("Starting Trading Agent AI...")
         
         # Start background services
-        await broker_connector.start()
-        rss_fetcher.start()
-        
-        # Update UI with connection status
-        ui_manager.update_broker_status(broker_connector.is_connected())
-        ui_manager.update_news_status(True)
-        
-        # Start UI event listener
-        _ui_task = asyncio.create_task(ui_manager.listen_for_ui_events())
+        with profiler.phase("start services"):
+            await broker_connector.start()
+            if supervisor:
+                supervisor.start()
+            if rss_fetcher:
+                rss_fetcher.start()
+            if perception:
+                perception.start(config.get("Vision", "ticker", fallback="NIFTY"))
+            main_fuser.start()
+            if tick_recorder:
+                tick_recorder.start()
+            if bar_aggregator:
+                bar_aggregator.start()
+            event_bus.start_monitor()
         
         # Start event dispatcher  
-        _dispatcher_task = asyncio.create_task(event_dispatcher())  # Keep reference for GC
-        
-        # Show UI
-        main_overlay.show()
+        # Keep references for GC
+        _dispatcher_tasks = [asyncio.create_task(event_dispatcher(subscription))
+                             for subscription in (dispatcher_subscription, market_subscription)]
+
+        if ui_manager:
+            # Update UI with connection status
+            ui_manager.update_broker_status(broker_connector.is_connected())
+            ui_manager.update_news_status(use_news)
+
+            # Start UI event listener
+            _ui_task = asyncio.create_task(ui_manager.listen_for_ui_events())
+
+            # Show UI
+            main_overlay.show()
         
         print("Trading Agent AI started successfully!")
+        if profiler.enabled:
+            print(profiler.report())
         print("Demo mode is enabled - using mock market data")
-        print("Close the UI window or press Ctrl+C to stop the application")
-        
-        # Show UI
-        main_overlay.show()
-        
-        # Wait for the application to exit
-        print("Application running. Close the window to exit.")
-        
-        # Set up clean exit handling
-        import signal
-        def signal_handler(signum, frame):
-            print("\nReceived signal, shutting down...")
-            app.quit()
-        
-        signal.signal(signal.SIGINT, signal_handler)
+        if ui_manager:
+            print("Close the UI window or press Ctrl+C to stop the application")
+
+            # Set up clean exit handling
+            import signal
+            def signal_handler(signum, frame):
+                print("\nReceived signal, shutting down...")
+                app.quit()
+
+            signal.signal(signal.SIGINT, signal_handler)
+        else:
+            print("Running headless. Press Ctrl+C to stop the application")
         
         # Keep running until the application quits
         try:
@@ -146,13 +225,44 @@ async def main():
     finally:
         # Cleanup
         print("Cleaning up...")
+        event_bus.log_stats()
+        if journal:
+            journal.detach(event_bus)
+            journal.close()
         await broker_connector.stop()
-        rss_fetcher.stop()
+        if rss_fetcher:
+            rss_fetcher.stop()
+        if perception:
+            perception.stop()
+        if supervisor:
+            supervisor.stop()
+        if tick_recorder:
+            tick_recorder.stop()
+        if bar_aggregator:
+            bar_aggregator.stop()
         db.close()
         print("Cleanup completed")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the Trading Agent AI application.")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="Report import and initialization time per module once started.")
+    parser.parse_args()
+
+    config = ConfigLoader()
+
+    if not enabled(config, "UI", fallback="true"):
+        # Headless: plain asyncio loop, Qt is never imported
+        try:
+            asyncio.run(main(config))
+        except KeyboardInterrupt:
+            print("\nReceived interrupt signal...")
+        sys.exit(0)
+
     # Create PyQt application
+    with profiler.phase("import PyQt6/qasync"):
+        import qasync
+        from PyQt6.QtWidgets import QApplication
     app = QApplication(sys.argv)
     
     # Set up async event loop
@@ -160,7 +270,7 @@ if __name__ == "__main__":
     asyncio.set_event_loop(loop)
     
     # Create a task for the main application
-    main_task = asyncio.ensure_future(main())
+    main_task = asyncio.ensure_future(main(config))
     
     try:
         # Run the application
@@ -173,4 +283,4 @@ if __name__ == "__main__":
             main_task.cancel()
         
         # Close the event loop
-        loop.close()
\ No newline at end of file
+        loop.close()
@@ -1,23 +1,102 @@
+import asyncio
+import numbers
+import queue
 import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Bar tables and their widths in nanoseconds
+BAR_INTERVALS = {
+    "1s": 1_000_000_000,
+    "1m": 60 * 1_000_000_000,
+    "1d": 86400 * 1_000_000_000,
+}
+
+_TICK_SQL = ''' INSERT INTO ticks(ticker,ts,price,volume) VALUES(?,?,?,?) '''
+# Batches arrive in time order, so an existing bar keeps its open and the
+# incoming batch supplies the close.
+_BAR_UPSERT_SQL = ''' INSERT INTO bars_{interval}(ticker,ts,open,high,low,close,volume)
+                      VALUES(?,?,?,?,?,?,?)
+                      ON CONFLICT(ticker, ts) DO UPDATE SET
+                          high = max(high, excluded.high),
+                          low = min(low, excluded.low),
+                          close = excluded.close,
+                          volume = volume + excluded.volume '''
+
+_TRADE_SQL = ''' INSERT INTO trades(ticker,action,quantity,price,order_id)
+                 VALUES(?,?,?,?,?) '''
+_SIGNAL_SQL = ''' INSERT INTO signals(ticker,signal,confidence,reason)
+                  VALUES(?,?,?,?) '''
+
+TimeLike = Union[int, float, str, datetime]
+
+
+def to_ns(value: TimeLike) -> int:
+    """Epoch ns (int), epoch seconds (float), ISO string or datetime to epoch ns."""
+    if isinstance(value, numbers.Integral):
+        return int(value)
+    if isinstance(value, float):
+        return int(value * 1e9)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return int(value.replace(microsecond=0).timestamp()) * 1_000_000_000 + value.microsecond * 1000
+
+
+# Sentinel that tells the writer thread to drain and exit
+_STOP = object()
+
+
+def _fail_futures(items, error: BaseException) -> None:
+    for _sql, _rows, future in items:
+        if future is not None and not future.done():
+            future.set_exception(error)
+
 
 class Database:
+    """
+    SQLite store with write-behind persistence.
+    Writes are queued to a background thread that owns the write connection,
+    runs in WAL mode with synchronous=NORMAL and commits rows in batches
+    with executemany. Reads use a separate connection on the caller's thread.
+    """
+
     def __init__(self, config, db_path: str = None):
+        self.config = config
         if db_path is None:
             db_path = config.get("Paths", "database_path", fallback="local_database/app_data.db")
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = int(self._setting("batch_size", 500))
+        self.flush_interval = int(self._setting("flush_interval_ms", 200)) / 1000.0
+        self.synchronous = self._setting("synchronous", "NORMAL").upper()
+        # Daily bars start at exchange midnight (IST by default), not UTC midnight
+        self.day_offset_ns = int(self._setting("bar_day_offset_minutes", 330)) * 60 * 1_000_000_000
+
         self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
         self._initialize_db()
 
+        self._queue: queue.Queue = queue.Queue()
+        # Set if the writer thread died; later writes fail with it at once
+        self._writer_error: Optional[BaseException] = None
+        self._writer = threading.Thread(target=self._write_loop, name="db-writer", daemon=True)
+        self._writer.start()
+
+    def _setting(self, key: str, fallback: Any) -> Any:
+        if self.config is None:
+            return fallback
+        return self.config.get("Database", key, fallback=str(fallback))
+
     def _initialize_db(self) -> None:
         """Initialize the database and create tables if they don't exist."""
         cursor = self.conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
 
         # Create trades table
         cursor.execute('''
@@ -44,24 +123,158 @@ class Database:
             )
         ''')
 
+        # Create market data tables: raw ticks plus OHLCV bars keyed by
+        # bucket start (epoch ns)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS ticks (
+                ticker TEXT NOT NULL,
+                ts INTEGER NOT NULL,
+                price REAL NOT NULL,
+                volume INTEGER NOT NULL
+            )
+        ''')
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_ticks_ticker_ts ON ticks(ticker, ts)")
+        for interval in BAR_INTERVALS:
+            cursor.execute(f'''
+                CREATE TABLE IF NOT EXISTS bars_{interval} (
+                    ticker TEXT NOT NULL,
+                    ts INTEGER NOT NULL,
+                    open REAL NOT NULL,
+                    high REAL NOT NULL,
+                    low REAL NOT NULL,
+                    close REAL NOT NULL,
+                    volume INTEGER NOT NULL,
+                    PRIMARY KEY (ticker, ts)
+                ) WITHOUT ROWID
+            ''')
+
         self.conn.commit()
         logger.info("Database initialized successfully.")
 
-    def save_trade(self, trade_data: Dict[str, Any]) -> Optional[int]:
-        """Saves a trade to the database."""
-        sql = ''' INSERT INTO trades(ticker,action,quantity,price,order_id)
-                  VALUES(?,?,?,?,?) '''
-        cursor = self.conn.cursor()
-        cursor.execute(sql, (
+    def _write_loop(self) -> None:
+        """
+        Writer thread. If it dies on an unexpected error, every write still
+        pending or queued fails with that error instead of never resolving.
+        """
+        pending: List[Tuple[Optional[str], List[tuple], Optional[Future]]] = []
+        try:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                conn.execute(f"PRAGMA synchronous={self.synchronous}")
+                self._write_batches(conn, pending)
+            finally:
+                conn.close()
+        except BaseException as e:
+            logger.exception(f"Database writer thread died; failing pending writes: {e!r}")
+            self._writer_error = e
+            _fail_futures(pending, e)
+            self._fail_queued()
+
+    def _fail_queued(self) -> None:
+        items = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                items.append(item)
+        _fail_futures(items, self._writer_error)
+
+    def _write_batches(self, conn: sqlite3.Connection,
+                       pending: List[Tuple[Optional[str], List[tuple], Optional[Future]]]) -> None:
+        """Batches queued rows and commits on size or time, until stopped."""
+        pending_rows = 0
+        deadline = None
+        stopping = False
+
+        while not stopping:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                stopping = True
+            elif item is not None:
+                pending.append(item)
+                pending_rows += len(item[1])
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+
+            barrier = item is not None and item is not _STOP and item[0] is None
+            if pending and (stopping or barrier or pending_rows >= self.batch_size
+                            or time.monotonic() >= deadline):
+                self._flush(conn, pending)
+                pending.clear()
+                pending_rows = 0
+                deadline = None
+
+    def _flush(self, conn: sqlite3.Connection, pending: List[Tuple[Optional[str], List[tuple], Optional[Future]]]) -> None:
+        # Coalesce runs of the same statement, keeping queue order so that
+        # e.g. a downsample sees the ticks queued before it
+        batches: List[Tuple[str, List[tuple]]] = []
+        for sql, rows, _future in pending:
+            if sql is None:
+                continue
+            if batches and batches[-1][0] == sql:
+                batches[-1][1].extend(rows)
+            else:
+                batches.append((sql, list(rows)))
+        try:
+            with conn:
+                for sql, rows in batches:
+                    conn.executemany(sql, rows)
+            errors = {}
+        except sqlite3.Error as e:
+            # One bad row shouldn't lose the batch; retry row by row
+            logger.warning(f"Batch write failed ({e}); retrying {len(pending)} writes individually.")
+            errors = self._write_rows(conn, pending)
+
+        for index, (_sql, _rows, future) in enumerate(pending):
+            if future is not None and not future.done():
+                if index in errors:
+                    future.set_exception(errors[index])
+                else:
+                    future.set_result(None)
+
+    def _write_rows(self, conn: sqlite3.Connection, pending) -> Dict[int, Exception]:
+        errors = {}
+        for index, (sql, rows, _future) in enumerate(pending):
+            if sql is None:
+                continue
+            try:
+                with conn:
+                    conn.executemany(sql, rows)
+            except sqlite3.Error as e:
+                logger.error(f"Failed to write {len(rows)} row(s) {rows[:1]}: {e}")
+                errors[index] = e
+        return errors
+
+    def _enqueue(self, sql: Optional[str], rows: List[tuple], durable: bool = False) -> Optional[Future]:
+        future = Future() if durable else None
+        self._queue.put((sql, rows, future))
+        if self._writer_error is not None:
+            self._fail_queued()
+        return future
+
+    def save_trade(self, trade_data: Dict[str, Any]) -> Future:
+        """
+        Queues a trade for writing. Returns a concurrent.futures.Future (this
+        used to return None) that resolves once the trade is committed, or
+        fails with the write's error; `await asyncio.wrap_future(...)` it to
+        wait.
+        """
+        future = self._enqueue(_TRADE_SQL, [(
             trade_data.get('ticker'),
             trade_data.get('action'),
             trade_data.get('quantity'),
             trade_data.get('price'),
             trade_data.get('order_id')
-        ))
-        self.conn.commit()
-        logger.info(f"Trade saved with ID: {cursor.lastrowid}")
-        return cursor.lastrowid
+        )], durable=True)
+        logger.debug(f"Trade queued: {trade_data.get('order_id')}")
+        return future
 
     def get_trade_history(self, limit: int = 100) -> List[Any]:
         """Retrieves trade history from the database."""
@@ -69,26 +282,139 @@ class Database:
         cursor.execute("SELECT * FROM trades ORDER BY timestamp DESC LIMIT ?", (limit,))
         return cursor.fetchall()
 
-    def save_signal(self, signal_data: Dict[str, Any]) -> Optional[int]:
-        """Saves a signal to the database."""
-        sql = ''' INSERT INTO signals(ticker,signal,confidence,reason)
-                  VALUES(?,?,?,?) '''
-        cursor = self.conn.cursor()
-        cursor.execute(sql, (
+    def save_signal(self, signal_data: Dict[str, Any]) -> None:
+        """Queues a signal for writing."""
+        self._enqueue(_SIGNAL_SQL, [(
             signal_data.get('ticker'),
             signal_data.get('signal'),
             signal_data.get('confidence'),
             signal_data.get('reason')
-        ))
-        self.conn.commit()
-        logger.info(f"Signal saved with ID: {cursor.lastrowid}")
-        return cursor.lastrowid
+        )])
+
+    def _bucket_offset(self, width: int) -> int:
+        return self.day_offset_ns if width >= BAR_INTERVALS["1d"] else 0
+
+    def save_ticks(self, ticks: Iterable[Tuple[str, int, float, int]]) -> None:
+        """
+        Queues a batch of (ticker, ts_ns, price, volume) ticks, in time order.
+        The batch is rolled up into bars here, so the writer upserts each
+        bar once per batch instead of once per tick.
+        """
+        rows = list(ticks)
+        if not rows:
+            return
+        self._enqueue(_TICK_SQL, rows)
+        for interval, width in BAR_INTERVALS.items():
+            offset = self._bucket_offset(width)
+            bars: Dict[Tuple[str, int], List[float]] = {}
+            for ticker, ts_ns, price, volume in rows:
+                key = (ticker, (ts_ns + offset) // width * width - offset)
+                bar = bars.get(key)
+                if bar is None:
+                    bars[key] = [price, price, price, price, volume]
+                    continue
+                if price > bar[1]:
+                    bar[1] = price
+                if price < bar[2]:
+                    bar[2] = price
+                bar[3] = price
+                bar[4] += volume
+            self._enqueue(
+                _BAR_UPSERT_SQL.format(interval=interval),
+                [(ticker, ts, *bar) for (ticker, ts), bar in bars.items()]
+            )
+
+    def get_bars(self, ticker: str, interval: str, start: TimeLike, end: TimeLike, as_frame: bool = True):
+        """
+        Returns bars with start <= ts < end, oldest first: a pandas DataFrame
+        indexed by UTC timestamp, or with as_frame=False a dict of NumPy
+        arrays with 'ts' in epoch ns.
+        """
+        import numpy as np
+
+        if interval not in BAR_INTERVALS:
+            raise ValueError(f"Unknown bar interval '{interval}'; expected one of {list(BAR_INTERVALS)}.")
+        cursor = self.conn.cursor()
+        cursor.execute(
+            f"SELECT ts, open, high, low, close, volume FROM bars_{interval} "
+            "WHERE ticker = ? AND ts >= ? AND ts < ? ORDER BY ts",
+            (ticker, to_ns(start), to_ns(end))
+        )
+        rows = cursor.fetchall()
+        columns = list(zip(*rows)) if rows else [()] * 6
+        arrays = {
+            "ts": np.array(columns[0], dtype=np.int64),
+            "open": np.array(columns[1], dtype=np.float64),
+            "high": np.array(columns[2], dtype=np.float64),
+            "low": np.array(columns[3], dtype=np.float64),
+            "close": np.array(columns[4], dtype=np.float64),
+            "volume": np.array(columns[5], dtype=np.int64),
+        }
+        if not as_frame:
+            return arrays
+
+        import pandas as pd
+
+        index = pd.DatetimeIndex(pd.to_datetime(arrays.pop("ts"), unit="ns", utc=True), name="timestamp")
+        return pd.DataFrame(arrays, index=index)
+
+    def downsample(self, source: str, target: str, start: TimeLike, end: TimeLike) -> None:
+        """
+        Rebuilds `target` bars for [start, end) from a finer source, either
+        'ticks' or a bar interval, e.g. after bulk-importing ticks.
+        """
+        width = BAR_INTERVALS[target]
+        offset = self._bucket_offset(width)
+        if source == "ticks":
+            table, first, high, low, last, order = "ticks", "price", "price", "price", "price", "rowid"
+        else:
+            table, first, high, low, last, order = f"bars_{source}", "open", "high", "low", "close", "ts"
+        sql = f'''
+            INSERT OR REPLACE INTO bars_{target}(ticker,ts,open,high,low,close,volume)
+            SELECT b.ticker, b.bucket,
+                   (SELECT {first} FROM {table} WHERE ticker = b.ticker AND ts = b.first_ts
+                    ORDER BY {order} LIMIT 1),
+                   b.high, b.low,
+                   (SELECT {last} FROM {table} WHERE ticker = b.ticker AND ts = b.last_ts
+                    ORDER BY {order} DESC LIMIT 1),
+                   b.volume
+            FROM (
+                SELECT ticker, (ts + {offset}) / {width} * {width} - {offset} AS bucket,
+                       max({high}) AS high, min({low}) AS low, sum(volume) AS volume,
+                       min(ts) AS first_ts, max(ts) AS last_ts
+                FROM {table} WHERE ts >= ? AND ts < ?
+                GROUP BY ticker, bucket
+            ) AS b
+        '''
+        self._enqueue(sql, [(to_ns(start), to_ns(end))])
+
+    def apply_retention(self, retention_days: Dict[str, float]) -> None:
+        """
+        Queues deletes of market data older than the given age per table,
+        e.g. {'ticks': 7, '1s': 30, '1m': 365}. Coarser bars are built at
+        ingest, so pruning fine data doesn't lose the longer history.
+        """
+        now_ns = time.time_ns()
+        for name, days in retention_days.items():
+            table = "ticks" if name == "ticks" else f"bars_{name}"
+            cutoff = now_ns - int(days * BAR_INTERVALS["1d"])
+            self._enqueue(f"DELETE FROM {table} WHERE ts < ?", [(cutoff,)])
+
+    def flush(self) -> Future:
+        """Returns a future that resolves once everything queued so far is committed."""
+        return self._enqueue(None, [], durable=True)
+
+    async def barrier(self) -> None:
+        """Durability barrier: waits until everything queued so far is committed."""
+        await asyncio.wrap_future(self.flush())
 
     def close(self) -> None:
-        """Close the database connection."""
+        """Drain pending writes and close the database connections."""
+        self._queue.put(_STOP)
+        self._writer.join()
         self.conn.close()
         logger.info("Database connection closed.")
-        
+
     def initialize(self):
         """Initialize method (for compatibility with main app)."""
         # Already initialized in __init__, this is just for interface compatibility
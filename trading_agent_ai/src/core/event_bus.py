@@ -1,4 +1,364 @@
 import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import replace
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type
+
+from .event_types import MarketEvent, MarketEventBatch, OrderRequestEvent, FillEvent
+from .metrics import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+# Events that must reach every subscriber, even a conflating one.
+CRITICAL_EVENT_TYPES = (OrderRequestEvent, FillEvent)
+
+
+class _TickerSlot:
+    """Placeholder in a ConflatingQueue for the newest tick of a ticker."""
+    __slots__ = ("ticker",)
+
+    def __init__(self, ticker: str):
+        self.ticker = ticker
+
+
+class ConflatingQueue(asyncio.Queue):
+    """
+    Queue with latest-value semantics for market data.
+    Items are the bus's (enqueued_ns, event) envelopes.
+    Only the newest MarketEvent per ticker is kept, in the position of the
+    first unread tick for that ticker. A MarketEventBatch is expanded into
+    its ticks on arrival, so conflating consumers only see MarketEvents.
+    Above the high-water mark the oldest non-critical events are dropped;
+    order and fill events never are.
+    The queue never blocks producers.
+    """
+
+    def __init__(self, high_water_mark: int = 5000, merge_volume: bool = False):
+        super().__init__()
+        self.high_water_mark = high_water_mark
+        self.merge_volume = merge_volume
+        self.coalesced = 0
+        self.dropped = 0
+
+    def _init(self, maxsize):
+        self._queue = deque()
+        # Newest (enqueued_ns, MarketEvent) envelope per ticker; batches are
+        # expanded into their rows' ticks before they get here
+        self._latest: Dict[str, Tuple[int, MarketEvent]] = {}
+
+    def _get(self):
+        item = self._queue.popleft()
+        if isinstance(item, _TickerSlot):
+            return self._latest.pop(item.ticker)
+        return item
+
+    def put_nowait(self, item) -> None:
+        enqueued_ns, event = item
+        if isinstance(event, MarketEventBatch):
+            if self.merge_volume:
+                ticks = event
+            else:
+                latest = event.latest()
+                self.coalesced += len(event) - len(latest)
+                ticks = latest.values()
+            for tick in ticks:
+                self.put_nowait((enqueued_ns, tick))
+            return
+        if isinstance(event, MarketEvent):
+            previous = self._latest.get(event.ticker)
+            if previous is not None:
+                if self.merge_volume:
+                    event = replace(event, volume=previous[1].volume + event.volume)
+                self._latest[event.ticker] = (enqueued_ns, event)
+                self.coalesced += 1
+                return
+            self._latest[event.ticker] = item
+            super().put_nowait(_TickerSlot(event.ticker))
+        else:
+            super().put_nowait(item)
+
+        if self.qsize() > self.high_water_mark:
+            self._shed()
+
+    def _shed(self) -> None:
+        """Drops the oldest non-critical events until under the high-water mark."""
+        excess = self.qsize() - self.high_water_mark
+        kept = []
+        while excess > 0 and self._queue:
+            item = self._queue.popleft()
+            if isinstance(item, _TickerSlot):
+                del self._latest[item.ticker]
+            elif isinstance(item[1], CRITICAL_EVENT_TYPES):
+                kept.append(item)
+                continue
+            self.dropped += 1
+            excess -= 1
+            self.task_done()
+        self._queue.extendleft(reversed(kept))
+
+
+class Subscription:
+    """
+    A single consumer's view of the event bus.
+    Each subscription owns a bounded queue that only receives the event
+    types it subscribed to, so consumers never compete for events.
+    It also records, per event type, how long events waited in the queue
+    and how long the consumer took between `get()` and `task_done()`.
+    """
+
+    def __init__(self, bus: "EventBus", name: str, event_types: Tuple[Type, ...], queue: asyncio.Queue):
+        self.bus = bus
+        self.name = name
+        self.event_types = event_types
+        self.queue = queue
+        self.wait_times: Dict[str, LatencyHistogram] = {}
+        self.handler_times: Dict[str, LatencyHistogram] = {}
+        self.depth = LatencyHistogram()
+        self.depth_samples: deque = deque(maxlen=600)
+        self._current_type: Optional[str] = None
+        self._dequeued_ns = 0
+
+    def accepts(self, event_type: Type) -> bool:
+        return not self.event_types or issubclass(event_type, self.event_types)
+
+    async def get(self):
+        return self._unwrap(await self.queue.get())
+
+    def get_nowait(self):
+        return self._unwrap(self.queue.get_nowait())
+
+    def _unwrap(self, item):
+        enqueued_ns, event = item
+        now = time.monotonic_ns()
+        event_type = type(event).__name__
+        _histogram(self.wait_times, event_type).record(now - enqueued_ns)
+        self._current_type = event_type
+        self._dequeued_ns = now
+        return event
+
+    def task_done(self) -> None:
+        if self._current_type is not None:
+            elapsed = time.monotonic_ns() - self._dequeued_ns
+            _histogram(self.handler_times, self._current_type).record(elapsed)
+            self._current_type = None
+        self.queue.task_done()
+
+    def qsize(self) -> int:
+        return self.queue.qsize()
+
+    @property
+    def coalesced(self) -> int:
+        return getattr(self.queue, "coalesced", 0)
+
+    @property
+    def dropped(self) -> int:
+        return getattr(self.queue, "dropped", 0)
+
+    def sample_depth(self) -> None:
+        depth = self.qsize()
+        self.depth.record(depth)
+        self.depth_samples.append((time.time(), depth))
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of queue depth, counters and latencies (in microseconds)."""
+        return {
+            "depth": self.qsize(),
+            "depth_p99": self.depth.percentile(99),
+            "depth_max": self.depth.max,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "wait_us": {t: h.summary(1000.0) for t, h in self.wait_times.items()},
+            "handler_us": {t: h.summary(1000.0) for t, h in self.handler_times.items()},
+        }
+
+    def close(self) -> None:
+        """Detach this subscription from the bus."""
+        self.bus.unsubscribe(self)
+
+    def __repr__(self) -> str:
+        types = ", ".join(t.__name__ for t in self.event_types) or "*"
+        return f"Subscription({self.name!r}, [{types}], depth={self.qsize()})"
+
+
+def _histogram(histograms: Dict[str, LatencyHistogram], key: str) -> LatencyHistogram:
+    histogram = histograms.get(key)
+    if histogram is None:
+        histogram = histograms[key] = LatencyHistogram()
+    return histogram
+
+
+class EventBus:
+    """
+    Topic-based publish/subscribe bus.
+    Publishers call `put()` exactly as they did with the old shared queue;
+    every subscription whose event types match receives its own copy of the
+    reference. Routing tables are cached per concrete event type, so a
+    publish costs O(number of subscribers for that type).
+    Every publish is stamped with a monotonic enqueue time so subscribers
+    can report queue wait; see `get_stats()` and `monitor()`.
+    """
+
+    def __init__(self, default_maxsize: int = 10000, high_water_mark: int = 5000, merge_volume: bool = False):
+        self.default_maxsize = default_maxsize
+        self.high_water_mark = high_water_mark
+        self.merge_volume = merge_volume
+        self.depth_sample_interval = 0.1
+        self.stats_log_interval = 60.0
+        self.monitor_task = None
+        self._taps: List[Callable[[Tuple[int, Any]], None]] = []
+        self._subscriptions: List[Subscription] = []
+        self._routes: Dict[Type, Tuple[Subscription, ...]] = {}
+
+    def configure(self, config) -> None:
+        """Applies the [EventBus] section of main_config.ini."""
+        self.default_maxsize = int(config.get("EventBus", "default_maxsize", fallback=self.default_maxsize))
+        self.high_water_mark = int(config.get("EventBus", "high_water_mark", fallback=self.high_water_mark))
+        self.merge_volume = config.get(
+            "EventBus", "merge_volume", fallback=str(self.merge_volume)
+        ).lower() == "true"
+        self.depth_sample_interval = int(config.get(
+            "EventBus", "depth_sample_interval_ms", fallback=int(self.depth_sample_interval * 1000)
+        )) / 1000.0
+        self.stats_log_interval = float(config.get(
+            "EventBus", "stats_log_interval_seconds", fallback=self.stats_log_interval
+        ))
+
+    def subscribe(
+        self,
+        name: str,
+        event_types: Optional[Iterable[Type]] = None,
+        maxsize: Optional[int] = None,
+        conflate: bool = False
+    ) -> Subscription:
+        """
+        Registers a new consumer. An empty or missing `event_types` subscribes
+        to every event published on the bus.
+        With `conflate=True` the consumer only sees the newest MarketEvent per
+        ticker and never slows down the publisher (see ConflatingQueue).
+        """
+        types = tuple(event_types) if event_types else ()
+        if conflate:
+            queue = ConflatingQueue(self.high_water_mark, self.merge_volume)
+        else:
+            queue = asyncio.Queue(maxsize=self.default_maxsize if maxsize is None else maxsize)
+        subscription = Subscription(self, name, types, queue)
+        self._subscriptions.append(subscription)
+        self._routes.clear()
+        logger.debug(f"New subscription: {subscription}")
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+            self._routes.clear()
+            logger.debug(f"Removed subscription: {subscription.name}")
+
+    def add_tap(self, tap: Callable[[Tuple[int, Any]], None]) -> None:
+        """
+        Registers a synchronous callback that sees every published
+        (enqueued_ns, event) envelope in publish order, e.g. the journal.
+        """
+        self._taps.append(tap)
+
+    def remove_tap(self, tap: Callable[[Tuple[int, Any]], None]) -> None:
+        if tap in self._taps:
+            self._taps.remove(tap)
+
+    def subscribers_for(self, event_type: Type) -> Tuple[Subscription, ...]:
+        route = self._routes.get(event_type)
+        if route is None:
+            route = tuple(s for s in self._subscriptions if s.accepts(event_type))
+            self._routes[event_type] = route
+        return route
+
+    async def put(self, event) -> None:
+        """
+        Publishes an event to every matching subscriber.
+        Waits if a subscriber's queue is full, which applies backpressure to
+        the producer instead of silently dropping events. Conflating
+        subscribers never make the publisher wait.
+        """
+        item = (time.monotonic_ns(), event)
+        for tap in self._taps:
+            tap(item)
+        for subscription in self.subscribers_for(type(event)):
+            queue = subscription.queue
+            if queue.full():
+                await queue.put(item)
+            else:
+                queue.put_nowait(item)
+
+    def put_nowait(self, event) -> None:
+        """
+        Publishes an event without waiting.
+        Raises asyncio.QueueFull if any matching subscriber is full; the
+        subscribers before it will already have received the event.
+        """
+        item = (time.monotonic_ns(), event)
+        for tap in self._taps:
+            tap(item)
+        for subscription in self.subscribers_for(type(event)):
+            subscription.queue.put_nowait(item)
+
+    publish = put
+
+    def subscriptions(self) -> List[Subscription]:
+        return list(self._subscriptions)
+
+    async def join(self) -> None:
+        """
+        Waits until every subscriber has called task_done() for everything
+        it received, including events published while handling them.
+        """
+        while True:
+            pending = [s.queue for s in self._subscriptions if s.queue._unfinished_tasks]
+            if not pending:
+                return
+            for queue in pending:
+                await queue.join()
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Returns a per-subscriber snapshot of depth, counters and latency histograms."""
+        stats = {}
+        for subscription in self._subscriptions:
+            name = subscription.name
+            suffix = 2
+            while name in stats:
+                name = f"{subscription.name}#{suffix}"
+                suffix += 1
+            stats[name] = subscription.stats()
+        return stats
+
+    def log_stats(self) -> None:
+        for name, stats in self.get_stats().items():
+            logger.info(
+                f"[bus] {name}: depth={stats['depth']} p99={stats['depth_p99']} "
+                f"max={stats['depth_max']} coalesced={stats['coalesced']} dropped={stats['dropped']}"
+            )
+            for event_type, wait in stats["wait_us"].items():
+                handler = stats["handler_us"].get(event_type, {})
+                logger.info(
+                    f"[bus] {name} {event_type}: n={wait['count']} "
+                    f"wait p50/p99/max={wait['p50']}/{wait['p99']}/{wait['max']}us "
+                    f"handler p50/p99/max={handler.get('p50', 0)}/{handler.get('p99', 0)}/{handler.get('max', 0)}us"
+                )
+
+    async def monitor(self) -> None:
+        """Samples queue depths and periodically logs a stats snapshot."""
+        next_log = time.monotonic() + self.stats_log_interval
+        while True:
+            await asyncio.sleep(self.depth_sample_interval)
+            for subscription in self._subscriptions:
+                subscription.sample_depth()
+            if time.monotonic() >= next_log:
+                self.log_stats()
+                next_log += self.stats_log_interval
+
+    def start_monitor(self) -> None:
+        if self.monitor_task is None or self.monitor_task.done():
+            self.monitor_task = asyncio.create_task(self.monitor())
+
 
 # Global event bus for the application
-event_bus = asyncio.Queue()
+event_bus = EventBus()
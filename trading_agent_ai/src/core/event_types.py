@@ -1,29 +1,139 @@
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, Optional, Tuple
 
-@dataclass
+if TYPE_CHECKING:
+    import numpy as np
+
+@dataclass(frozen=True, slots=True)
 class MarketEvent:
-    timestamp: datetime
+    """
+    A single tick. Ticks are the most common object in the process, so the
+    timestamp is stored as integer epoch nanoseconds and only converted to
+    a datetime when something reads `timestamp`.
+    """
     ticker: str
     price: float
     volume: int
+    ts_ns: int = field(default_factory=time.time_ns)
+
+    @property
+    def timestamp(self) -> datetime:
+        return datetime.fromtimestamp(self.ts_ns / 1e9)
+
+@dataclass(frozen=True, slots=True, eq=False)
+class MarketEventBatch:
+    """
+    Many ticks from one websocket frame as parallel NumPy arrays.
+    `ticker_ids` index into `symbols`; `ts_ns` is the frame's epoch-ns time.
+    """
+    symbols: Tuple[str, ...]
+    ticker_ids: "np.ndarray"
+    prices: "np.ndarray"
+    volumes: "np.ndarray"
+    ts_ns: int = field(default_factory=time.time_ns)
+
+    @classmethod
+    def from_ticks(cls, ticks: Iterable[Tuple[str, float, int]], ts_ns: Optional[int] = None) -> "MarketEventBatch":
+        """Builds a batch from (ticker, price, volume) tuples."""
+        import numpy as np
+
+        index: Dict[str, int] = {}
+        ids, prices, volumes = [], [], []
+        for ticker, price, volume in ticks:
+            ids.append(index.setdefault(ticker, len(index)))
+            prices.append(price)
+            volumes.append(volume)
+        return cls(
+            symbols=tuple(index),
+            ticker_ids=np.asarray(ids, dtype=np.int32),
+            prices=np.asarray(prices, dtype=np.float64),
+            volumes=np.asarray(volumes, dtype=np.int64),
+            ts_ns=time.time_ns() if ts_ns is None else ts_ns
+        )
+
+    def __len__(self) -> int:
+        return len(self.ticker_ids)
+
+    def __iter__(self) -> Iterator[MarketEvent]:
+        symbols = self.symbols
+        for ticker_id, price, volume in zip(self.ticker_ids.tolist(), self.prices.tolist(), self.volumes.tolist()):
+            yield MarketEvent(symbols[ticker_id], price, volume, self.ts_ns)
+
+    def latest(self) -> Dict[str, MarketEvent]:
+        """Returns the last tick of each ticker in the batch."""
+        import numpy as np
+
+        ids = self.ticker_ids
+        present, from_end = np.unique(ids[::-1], return_index=True)
+        last = (len(ids) - 1 - from_end).tolist()
+        prices, volumes = self.prices[last].tolist(), self.volumes[last].tolist()
+        symbols = self.symbols
+        return {
+            symbols[ticker_id]: MarketEvent(symbols[ticker_id], price, volume, self.ts_ns)
+            for ticker_id, price, volume in zip(present.tolist(), prices, volumes)
+        }
+
+    @property
+    def timestamp(self) -> datetime:
+        return datetime.fromtimestamp(self.ts_ns / 1e9)
+
+@dataclass(frozen=True, slots=True)
+class BarEvent:
+    """
+    An OHLCV bar for `interval` starting at `ts_ns` (epoch ns). `synthetic`
+    marks bars that were not built from live ticks, e.g. bars backfilled
+    from the REST API after a feed outage.
+    """
+    ticker: str
+    interval: str
+    ts_ns: int
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: int
+    synthetic: bool = False
+
+    @property
+    def timestamp(self) -> datetime:
+        return datetime.fromtimestamp(self.ts_ns / 1e9)
+
+@dataclass(frozen=True, slots=True)
+class DepthEvent:
+    """
+    Order book changes for one ticker as (price, size) levels. With
+    `snapshot` the levels replace their side of the book; otherwise a size
+    of 0 removes the level at that price and any other size sets it.
+    """
+    ticker: str
+    bids: Tuple[Tuple[float, int], ...] = ()
+    asks: Tuple[Tuple[float, int], ...] = ()
+    ts_ns: int = field(default_factory=time.time_ns)
+    snapshot: bool = False
+
+    @property
+    def timestamp(self) -> datetime:
+        return datetime.fromtimestamp(self.ts_ns / 1e9)
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class NewsEvent:
+    """A scored headline; `tickers` are the instruments it mentions (empty for market-wide news)."""
     timestamp: datetime
     headline: str
     source: str
     sentiment: float
+    tickers: Tuple[str, ...] = ()
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class VisionEvent:
     timestamp: datetime
     ticker: str
     pattern: str
     confidence: float
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SignalEvent:
     timestamp: datetime
     ticker: str
@@ -31,7 +141,7 @@ class SignalEvent:
     confidence: float
     reason: str
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class OrderRequestEvent:
     timestamp: datetime
     ticker: str
@@ -39,7 +149,7 @@ class OrderRequestEvent:
     quantity: float
     order_type: str = 'MARKET'
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class FillEvent:
     timestamp: datetime
     ticker: str
@@ -48,30 +158,30 @@ class FillEvent:
     price: float
     order_id: str
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PnLUpdateEvent:
     timestamp: datetime
     pnl: float
     portfolio_value: float
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ChatRequestEvent:
     timestamp: datetime
     text: str
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AppLogEvent:
     timestamp: datetime
     level: str
     message: str
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AlertEvent:
     timestamp: datetime
     message: str
     level: str # 'INFO', 'WARNING', 'ERROR'
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class NewSignalEvent:
     timestamp: datetime
     reason: str
@@ -0,0 +1,337 @@
+import asyncio
+import logging
+import mmap
+import os
+import struct
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional, Tuple, Type
+
+from .event_types import (
+    MarketEvent, MarketEventBatch, BarEvent, NewsEvent, VisionEvent,
+    SignalEvent, OrderRequestEvent, FillEvent
+)
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"TAJRNL01"
+
+# Record header: payload length, event type code, bus enqueue time (monotonic ns)
+RECORD_HEADER = struct.Struct("<IBq")
+
+# Events a replay feeds back into the pipeline. Signals and orders are
+# left out because the replayed stack produces them again itself.
+REPLAY_INPUT_TYPES = (MarketEvent, MarketEventBatch, BarEvent, NewsEvent, VisionEvent, FillEvent)
+
+_STR_LEN = struct.Struct("<H")
+
+
+def _datetime_to_ns(value: datetime) -> int:
+    return int(value.replace(microsecond=0).timestamp()) * 1_000_000_000 + value.microsecond * 1000
+
+
+def _ns_to_datetime(value: int) -> datetime:
+    seconds, remainder = divmod(value, 1_000_000_000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=remainder // 1000)
+
+
+def _pack_str(parts: list, value: str) -> None:
+    encoded = value.encode("utf-8")
+    parts.append(_STR_LEN.pack(len(encoded)))
+    parts.append(encoded)
+
+
+def _unpack_str(view: memoryview, offset: int) -> Tuple[str, int]:
+    (length,) = _STR_LEN.unpack_from(view, offset)
+    offset += _STR_LEN.size
+    return str(view[offset:offset + length], "utf-8"), offset + length
+
+
+class _RecordCodec:
+    """
+    Encodes one event type as its numeric fields packed with a single
+    struct, followed by its string fields as length-prefixed UTF-8.
+    Datetime fields are stored as epoch nanoseconds; a tuple of strings
+    ("strs") as its length followed by the strings.
+    """
+
+    def __init__(self, event_type: Type, fields: Tuple[Tuple[str, str], ...]):
+        self.event_type = event_type
+        self.numeric = [(name, kind) for name, kind in fields if kind not in ("str", "strs")]
+        self.strings = [(name, kind) for name, kind in fields if kind in ("str", "strs")]
+        formats = {"f64": "d", "i64": "q", "dt": "q", "bool": "?"}
+        self.struct = struct.Struct("<" + "".join(formats[kind] for _, kind in self.numeric))
+
+    def encode(self, event) -> bytes:
+        values = []
+        for name, kind in self.numeric:
+            value = getattr(event, name)
+            values.append(_datetime_to_ns(value) if kind == "dt" else value)
+        parts = [self.struct.pack(*values)]
+        for name, kind in self.strings:
+            value = getattr(event, name)
+            if kind == "strs":
+                parts.append(_STR_LEN.pack(len(value)))
+                for item in value:
+                    _pack_str(parts, item)
+            else:
+                _pack_str(parts, value)
+        return b"".join(parts)
+
+    def decode(self, view: memoryview):
+        kwargs = {}
+        for (name, kind), value in zip(self.numeric, self.struct.unpack_from(view, 0)):
+            kwargs[name] = _ns_to_datetime(value) if kind == "dt" else value
+        offset = self.struct.size
+        for name, kind in self.strings:
+            if kind == "strs":
+                (count,) = _STR_LEN.unpack_from(view, offset)
+                offset += _STR_LEN.size
+                items = []
+                for _ in range(count):
+                    item, offset = _unpack_str(view, offset)
+                    items.append(item)
+                kwargs[name] = tuple(items)
+            else:
+                kwargs[name], offset = _unpack_str(view, offset)
+        return self.event_type(**kwargs)
+
+
+class _BatchCodec:
+    """Encodes a MarketEventBatch as its symbol table followed by the raw arrays."""
+
+    _HEADER = struct.Struct("<qHI")
+
+    def encode(self, batch: MarketEventBatch) -> bytes:
+        parts = [self._HEADER.pack(batch.ts_ns, len(batch.symbols), len(batch))]
+        for symbol in batch.symbols:
+            encoded = symbol.encode("utf-8")
+            parts.append(_STR_LEN.pack(len(encoded)))
+            parts.append(encoded)
+        parts.append(batch.ticker_ids.astype("<i4", copy=False).tobytes())
+        parts.append(batch.prices.astype("<f8", copy=False).tobytes())
+        parts.append(batch.volumes.astype("<i8", copy=False).tobytes())
+        return b"".join(parts)
+
+    def decode(self, view: memoryview) -> MarketEventBatch:
+        import numpy as np
+
+        ts_ns, symbol_count, n = self._HEADER.unpack_from(view, 0)
+        offset = self._HEADER.size
+        symbols = []
+        for _ in range(symbol_count):
+            (length,) = _STR_LEN.unpack_from(view, offset)
+            offset += _STR_LEN.size
+            symbols.append(str(view[offset:offset + length], "utf-8"))
+            offset += length
+        arrays = []
+        for dtype, width in (("<i4", 4), ("<f8", 8), ("<i8", 8)):
+            arrays.append(np.frombuffer(view, dtype=dtype, count=n, offset=offset).copy())
+            offset += n * width
+        return MarketEventBatch(tuple(symbols), arrays[0], arrays[1], arrays[2], ts_ns)
+
+
+# Type codes are part of the file format: append new types, never renumber.
+CODECS = {
+    1: _RecordCodec(MarketEvent, (("ticker", "str"), ("price", "f64"), ("volume", "i64"), ("ts_ns", "i64"))),
+    2: _RecordCodec(NewsEvent, (("timestamp", "dt"), ("headline", "str"), ("source", "str"), ("sentiment", "f64"))),
+    3: _RecordCodec(VisionEvent, (("timestamp", "dt"), ("ticker", "str"), ("pattern", "str"), ("confidence", "f64"))),
+    4: _RecordCodec(SignalEvent, (("timestamp", "dt"), ("ticker", "str"), ("signal", "str"),
+                                  ("confidence", "f64"), ("reason", "str"))),
+    5: _RecordCodec(OrderRequestEvent, (("timestamp", "dt"), ("ticker", "str"), ("action", "str"),
+                                        ("quantity", "f64"), ("order_type", "str"))),
+    6: _RecordCodec(FillEvent, (("timestamp", "dt"), ("ticker", "str"), ("action", "str"),
+                                ("quantity", "f64"), ("price", "f64"), ("order_id", "str"))),
+    7: _BatchCodec(),
+    8: _RecordCodec(BarEvent, (("ticker", "str"), ("interval", "str"), ("ts_ns", "i64"), ("open", "f64"),
+                               ("high", "f64"), ("low", "f64"), ("close", "f64"), ("volume", "i64"),
+                               ("synthetic", "bool"))),
+    # NewsEvent with the tickers it mentions; code 2 records still decode, with no tickers
+    9: _RecordCodec(NewsEvent, (("timestamp", "dt"), ("headline", "str"), ("source", "str"), ("sentiment", "f64"),
+                                ("tickers", "strs"))),
+}
+_TYPE_CODES: Dict[Type, int] = {
+    MarketEvent: 1, NewsEvent: 9, VisionEvent: 3, SignalEvent: 4,
+    OrderRequestEvent: 5, FillEvent: 6, MarketEventBatch: 7, BarEvent: 8,
+}
+
+
+def encode_event(event) -> Optional[Tuple[int, bytes]]:
+    """Returns (type_code, payload), or None for event types that aren't journaled."""
+    code = _TYPE_CODES.get(type(event))
+    if code is None:
+        return None
+    return code, CODECS[code].encode(event)
+
+
+def decode_event(code: int, payload: memoryview):
+    return CODECS[code].decode(payload)
+
+
+class JournalWriter:
+    """
+    Append-only, length-prefixed event journal written through a memory map.
+    The file grows in `chunk_size` steps and is truncated to its used length
+    on close. A record's length is written after its payload, so a crash
+    never leaves a half-written record that looks valid; readers stop at
+    the first zero length.
+    """
+
+    def __init__(self, path: str, chunk_size: int = 64 * 1024 * 1024):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.chunk_size = chunk_size
+        self.records = 0
+        self.skipped = 0
+        self._file = open(self.path, "w+b")
+        self._file.write(MAGIC)
+        self._file.flush()
+        self._offset = len(MAGIC)
+        self._capacity = 0
+        self._map: Optional[mmap.mmap] = None
+        self._grow(chunk_size)
+
+    def _grow(self, minimum: int) -> None:
+        if self._map is not None:
+            self._map.close()
+        self._capacity = max(self._capacity + self.chunk_size, minimum)
+        self._file.truncate(self._capacity)
+        self._map = mmap.mmap(self._file.fileno(), self._capacity)
+
+    def append(self, enqueued_ns: int, event) -> None:
+        encoded = encode_event(event)
+        if encoded is None:
+            self.skipped += 1
+            return
+        code, payload = encoded
+        start = self._offset + RECORD_HEADER.size
+        end = start + len(payload)
+        if end + RECORD_HEADER.size > self._capacity:
+            self._grow(end + RECORD_HEADER.size)
+        self._map[start:end] = payload
+        RECORD_HEADER.pack_into(self._map, self._offset, len(payload), code, enqueued_ns)
+        self._offset = end
+        self.records += 1
+
+    def on_publish(self, item: Tuple[int, object]) -> None:
+        """EventBus tap: records every published (enqueued_ns, event) envelope."""
+        self.append(*item)
+
+    def attach(self, bus) -> None:
+        bus.add_tap(self.on_publish)
+
+    def detach(self, bus) -> None:
+        bus.remove_tap(self.on_publish)
+
+    def flush(self) -> None:
+        self._map.flush()
+
+    def close(self) -> None:
+        if self._map is None:
+            return
+        self._map.flush()
+        self._map.close()
+        self._map = None
+        self._file.truncate(self._offset)
+        self._file.close()
+        logger.info(f"Journal {self.path} closed: {self.records} records, {self._offset} bytes.")
+
+    @classmethod
+    def for_session(cls, journal_dir: str) -> "JournalWriter":
+        """Opens a new journal named after the current time in `journal_dir`."""
+        filename = datetime.now().strftime("events_%Y%m%d_%H%M%S.journal")
+        return cls(os.path.join(journal_dir, filename))
+
+
+class JournalReader:
+    """
+    Memory-mapped journal reader. `records()` yields payloads as memoryview
+    slices of the map, so nothing is copied until an event is decoded.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        if bytes(self._view[:len(MAGIC)]) != MAGIC:
+            self.close()
+            raise ValueError(f"{self.path} is not an event journal.")
+
+    def records(self) -> Iterator[Tuple[int, int, memoryview]]:
+        """Yields (type_code, enqueued_ns, payload) without copying payloads."""
+        view = self._view
+        offset = len(MAGIC)
+        limit = len(view) - RECORD_HEADER.size
+        while offset <= limit:
+            length, code, enqueued_ns = RECORD_HEADER.unpack_from(view, offset)
+            if length == 0:
+                break
+            start = offset + RECORD_HEADER.size
+            yield code, enqueued_ns, view[start:start + length]
+            offset = start + length
+
+    def __iter__(self) -> Iterator[Tuple[int, object]]:
+        """Yields (enqueued_ns, event) for every record."""
+        for code, enqueued_ns, payload in self.records():
+            yield enqueued_ns, decode_event(code, payload)
+
+    def close(self) -> None:
+        self._view.release()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "JournalReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class JournalReplayer:
+    """
+    Re-publishes a journal onto an event bus.
+    With `speed=0` events are replayed as fast as possible; otherwise the
+    recorded inter-event gaps are scaled by 1/speed (1.0 = wall clock).
+    With `lockstep=True` each event is fully processed by every subscriber,
+    including the events it causes, before the next one is published, which
+    makes the replay deterministic.
+    """
+
+    def __init__(self, path: str, bus, speed: float = 0.0, lockstep: bool = True,
+                 event_types: Tuple[Type, ...] = REPLAY_INPUT_TYPES,
+                 on_event: Optional[Callable[[object], None]] = None):
+        self.path = path
+        self.bus = bus
+        self.speed = speed
+        self.lockstep = lockstep
+        self.event_types = event_types
+        self.on_event = on_event
+        self.published = 0
+        self.elapsed = 0.0
+
+    async def run(self) -> int:
+        started_ns = time.monotonic_ns()
+        first_ns = None
+        with JournalReader(self.path) as reader:
+            for enqueued_ns, event in reader:
+                if self.event_types and not isinstance(event, self.event_types):
+                    continue
+                if self.speed > 0:
+                    if first_ns is None:
+                        first_ns = enqueued_ns
+                    due_ns = started_ns + (enqueued_ns - first_ns) / self.speed
+                    delay_ns = due_ns - time.monotonic_ns()
+                    if delay_ns > 0:
+                        await asyncio.sleep(delay_ns / 1e9)
+                await self.bus.put(event)
+                if self.lockstep:
+                    await self.bus.join()
+                if self.on_event is not None:
+                    self.on_event(event)
+                self.published += 1
+        self.elapsed = (time.monotonic_ns() - started_ns) / 1e9
+        rate = self.published / self.elapsed if self.elapsed else 0.0
+        logger.info(f"Replayed {self.published} events from {self.path} in {self.elapsed:.2f}s ({rate:,.0f}/s).")
+        return self.published
@@ -0,0 +1,78 @@
+from typing import Dict, List
+
+
+class LatencyHistogram:
+    """
+    Log-linear histogram in the spirit of HdrHistogram.
+    Values below 2**sub_bucket_bits are recorded exactly; larger values land
+    in buckets whose width keeps the relative error under
+    1 / 2**(sub_bucket_bits - 1) (about 1.6% with the default of 7 bits).
+    Recording is O(1) and memory is fixed regardless of the sample count.
+    """
+
+    def __init__(self, sub_bucket_bits: int = 7):
+        self.sub_bucket_bits = sub_bucket_bits
+        self._half = 1 << (sub_bucket_bits - 1)
+        self.counts: List[int] = [0] * ((64 + 2) * self._half)
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def _index(self, value: int) -> int:
+        shift = value.bit_length() - self.sub_bucket_bits
+        if shift <= 0:
+            return value
+        return shift * self._half + (value >> shift)
+
+    def _highest_equivalent(self, index: int) -> int:
+        if index < 2 * self._half:
+            return index
+        shift = index // self._half - 1
+        mantissa = index - shift * self._half
+        return ((mantissa + 1) << shift) - 1
+
+    def record(self, value: int) -> None:
+        if value < 0:
+            value = 0
+        self.counts[self._index(value)] += 1
+        if self.count == 0 or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.count += 1
+        self.total += value
+
+    def percentile(self, pct: float) -> int:
+        """Returns the value at the given percentile (0-100)."""
+        if self.count == 0:
+            return 0
+        target = max(1, int(round(self.count * pct / 100.0)))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count:
+                seen += bucket_count
+                if seen >= target:
+                    return min(self._highest_equivalent(index), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def reset(self) -> None:
+        self.counts = [0] * len(self.counts)
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def summary(self, scale: float = 1.0) -> Dict[str, float]:
+        """Snapshot of count, mean, p50, p99 and max, divided by `scale`."""
+        return {
+            "count": self.count,
+            "mean": round(self.mean / scale, 3),
+            "p50": round(self.percentile(50) / scale, 3),
+            "p99": round(self.percentile(99) / scale, 3),
+            "max": round(self.max / scale, 3),
+        }
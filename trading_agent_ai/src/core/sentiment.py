@@ -1,8 +1,22 @@
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+import asyncio
 import logging
+import multiprocessing
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+from .config_loader import ConfigLoader
 
 logger = logging.getLogger(__name__)
 
+_WHITESPACE = re.compile(r"\s+")
+
+EXECUTORS = ("none", "thread", "process")
+
 
 class SentimentAnalyzer:
     def __init__(self):
@@ -21,3 +35,147 @@ class SentimentAnalyzer:
         except Exception as e:
             logger.error(f"Error in sentiment analysis: {e}")
             return 0.0  # Neutral score on error
+
+
+def normalize_text(text: str) -> str:
+    """
+    Cache key for a text: Unicode-normalized with whitespace collapsed.
+    Case and punctuation are kept, since VADER scores capitals and "!".
+    """
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text)).strip()
+
+
+# One analyzer per pool process, built on first use
+_process_analyzer: Optional[SentimentAnalyzer] = None
+
+
+def _score_in_process(texts: List[str]) -> List[float]:
+    global _process_analyzer
+    if _process_analyzer is None:
+        _process_analyzer = SentimentAnalyzer()
+    return [_process_analyzer.get_sentiment(text) for text in texts]
+
+
+class SentimentService:
+    """
+    Batched, memoized VADER scoring. `score_many` scores a list of texts,
+    computing each distinct normalized text once and remembering the last
+    `cache_size` scores, so a headline syndicated across feeds is scored
+    once. `ascore_many` does the same from the event loop. Uncached texts
+    are scored on `executor`: "thread" keeps a burst off the loop,
+    "process" spreads it over `workers` processes (VADER holds the GIL),
+    and "none" scores inline. A daemonic process (the news worker) may not
+    start children, so there "process" falls back to "thread".
+    """
+
+    def __init__(self, analyzer: Optional[SentimentAnalyzer] = None, cache_size: int = 4096,
+                 executor: str = "thread", workers: int = 1, chunk_size: int = 64):
+        if executor not in EXECUTORS:
+            raise ValueError(f"Unknown sentiment executor '{executor}'; expected one of {list(EXECUTORS)}.")
+        if executor == "process" and multiprocessing.current_process().daemon:
+            logger.warning("Sentiment executor 'process' is not available in a worker process; using 'thread'.")
+            executor = "thread"
+        self.analyzer = analyzer or SentimentAnalyzer()
+        self.cache_size = cache_size
+        self.executor_kind = executor
+        self.workers = max(1, workers)
+        self.chunk_size = max(1, chunk_size)
+        self.cache: "OrderedDict[str, float]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: ConfigLoader) -> "SentimentService":
+        return cls(
+            cache_size=int(config.get("News", "sentiment_cache_size", fallback=4096)),
+            executor=config.get("News", "sentiment_executor", fallback="thread"),
+            workers=int(config.get("News", "sentiment_workers", fallback=1)),
+        )
+
+    def score(self, text: str) -> float:
+        return self.score_many([text])[0]
+
+    def score_many(self, texts: Iterable[str]) -> List[float]:
+        """Compound score for each text, in order; scores the misses inline."""
+        keys, scores = self._lookup(texts)
+        missing = [key for key, score in scores.items() if score is None]
+        if missing:
+            self._store(scores, missing, [self.analyzer.get_sentiment(text) for text in missing])
+        return [scores[key] for key in keys]
+
+    async def ascore_many(self, texts: Iterable[str]) -> List[float]:
+        """Like `score_many`, with the misses scored on the configured executor."""
+        keys, scores = self._lookup(texts)
+        missing = [key for key, score in scores.items() if score is None]
+        if missing:
+            if self.executor_kind == "none":
+                computed = [self.analyzer.get_sentiment(text) for text in missing]
+            else:
+                computed = await self._score_on_executor(missing)
+            self._store(scores, missing, computed)
+        return [scores[key] for key in keys]
+
+    def _lookup(self, texts: Iterable[str]):
+        """
+        Cache keys for `texts`, and each distinct key's score: the cached
+        one, or None when it still has to be scored.
+        """
+        keys = [normalize_text(text) for text in texts]
+        scores: Dict[str, Optional[float]] = {}
+        with self._lock:
+            for key in keys:
+                if key in scores:
+                    self.hits += 1
+                elif key in self.cache:
+                    self.cache.move_to_end(key)
+                    scores[key] = self.cache[key]
+                    self.hits += 1
+                else:
+                    scores[key] = None
+                    self.misses += 1
+        return keys, scores
+
+    def _store(self, scores: Dict[str, Optional[float]], keys: List[str], computed: List[float]) -> None:
+        """Fills the batch's `scores` with the `computed` ones and caches them."""
+        # The batch keeps its own scores, so evicting them here (a batch
+        # larger than the cache) never means scoring them again
+        with self._lock:
+            for key, score in zip(keys, computed):
+                scores[key] = score
+                self.cache[key] = score
+                self.cache.move_to_end(key)
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+
+    async def _score_on_executor(self, texts: List[str]) -> List[float]:
+        loop = asyncio.get_running_loop()
+        if self._executor is None:
+            if self.executor_kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="sentiment")
+        if self.executor_kind == "process":
+            chunks = [texts[i:i + self.chunk_size] for i in range(0, len(texts), self.chunk_size)]
+            results = await asyncio.gather(
+                *(loop.run_in_executor(self._executor, _score_in_process, chunk) for chunk in chunks)
+            )
+            return [score for chunk in results for score in chunk]
+        return await loop.run_in_executor(
+            self._executor, lambda: [self.analyzer.get_sentiment(text) for text in texts]
+        )
+
+    def stats(self) -> Dict[str, object]:
+        lookups = self.hits + self.misses
+        return {
+            "cached": len(self.cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
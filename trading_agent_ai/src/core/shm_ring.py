@@ -0,0 +1,137 @@
+import logging
+import struct
+from multiprocessing import shared_memory
+from typing import Iterator, Optional, Tuple
+
+from .journal import encode_event, decode_event
+
+logger = logging.getLogger(__name__)
+
+# Producer-owned counters and the consumer-owned read position live on
+# separate cache lines at the start of the segment
+_POSITION = struct.Struct("<Q")
+_WRITE_POS_OFFSET = 0
+_DROPPED_OFFSET = 8
+_READ_POS_OFFSET = 64
+_DATA_OFFSET = 128
+
+# Record header: payload length, event type code
+_RECORD = struct.Struct("<IB")
+_WRAP = 0xFFFFFFFF
+_ALIGN = 8
+
+
+def _aligned(size: int) -> int:
+    return (size + _ALIGN - 1) & ~(_ALIGN - 1)
+
+
+class SharedRingBuffer:
+    """
+    Single-producer, single-consumer ring buffer in shared memory.
+    Records are events encoded with the journal codec, so crossing the
+    process boundary costs a struct pack/unpack instead of a pickle.
+    Positions are ever-increasing byte counters; the producer only moves
+    the write position after a record is complete, and the consumer only
+    moves the read position after decoding it.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self.shm = shm
+        self.owner = owner
+        self.buf = shm.buf
+        self.capacity = (shm.size - _DATA_OFFSET) & ~(_ALIGN - 1)
+
+    @classmethod
+    def create(cls, size: int = 1024 * 1024) -> "SharedRingBuffer":
+        shm = shared_memory.SharedMemory(create=True, size=_DATA_OFFSET + _aligned(size))
+        shm.buf[:_DATA_OFFSET] = bytes(_DATA_OFFSET)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedRingBuffer":
+        # Spawned workers share the parent's resource tracker, so the
+        # segment stays registered once and is unlinked by its creator.
+        shm = shared_memory.SharedMemory(name=name)
+        return cls(shm, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def _load(self, offset: int) -> int:
+        return _POSITION.unpack_from(self.buf, offset)[0]
+
+    def _store(self, offset: int, value: int) -> None:
+        _POSITION.pack_into(self.buf, offset, value)
+
+    @property
+    def dropped(self) -> int:
+        """Events the producer dropped because the ring was full."""
+        return self._load(_DROPPED_OFFSET)
+
+    def push(self, code: int, payload: bytes) -> bool:
+        """Appends one record. Returns False if the ring is full."""
+        size = _aligned(_RECORD.size + len(payload))
+        write_pos = self._load(_WRITE_POS_OFFSET)
+        free = self.capacity - (write_pos - self._load(_READ_POS_OFFSET))
+        index = write_pos % self.capacity
+        contiguous = self.capacity - index
+
+        if size > contiguous:
+            if free < contiguous + size:
+                return False
+            _RECORD.pack_into(self.buf, _DATA_OFFSET + index, _WRAP, 0)
+            write_pos += contiguous
+            index = 0
+        elif free < size:
+            return False
+
+        start = _DATA_OFFSET + index
+        self.buf[start + _RECORD.size:start + _RECORD.size + len(payload)] = payload
+        _RECORD.pack_into(self.buf, start, len(payload), code)
+        self._store(_WRITE_POS_OFFSET, write_pos + size)
+        return True
+
+    def push_event(self, event) -> bool:
+        encoded = encode_event(event)
+        if encoded is None:
+            return True
+        if not self.push(*encoded):
+            self._store(_DROPPED_OFFSET, self.dropped + 1)
+            logger.warning(f"Ring {self.name} is full; dropped {type(event).__name__}.")
+            return False
+        return True
+
+    def on_publish(self, item: Tuple[int, object]) -> None:
+        """EventBus tap: forwards every event published in this process into the ring."""
+        self.push_event(item[1])
+
+    def pop(self) -> Optional[object]:
+        """Decodes and removes the oldest record, or returns None if the ring is empty."""
+        read_pos = self._load(_READ_POS_OFFSET)
+        while read_pos != self._load(_WRITE_POS_OFFSET):
+            index = read_pos % self.capacity
+            start = _DATA_OFFSET + index
+            length, code = _RECORD.unpack_from(self.buf, start)
+            if length == _WRAP:
+                read_pos += self.capacity - index
+                self._store(_READ_POS_OFFSET, read_pos)
+                continue
+            payload_start = start + _RECORD.size
+            event = decode_event(code, self.buf[payload_start:payload_start + length])
+            self._store(_READ_POS_OFFSET, read_pos + _aligned(_RECORD.size + length))
+            return event
+        return None
+
+    def drain(self, limit: int = 10000) -> Iterator[object]:
+        for _ in range(limit):
+            event = self.pop()
+            if event is None:
+                return
+            yield event
+
+    def close(self) -> None:
+        self.buf = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
@@ -0,0 +1,113 @@
+import importlib
+import importlib.abc
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+class _TimingLoader:
+    """Wraps a module's loader for the duration of its exec_module call."""
+
+    def __init__(self, loader, profiler: "StartupProfiler"):
+        self._loader = loader
+        self._profiler = profiler
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module) -> None:
+        # Put the real loader back first so nothing downstream sees the wrapper
+        module.__loader__ = self._loader
+        if module.__spec__ is not None:
+            module.__spec__.loader = self._loader
+        self._profiler._enter_import()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._exit_import(module.__name__)
+
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    def __init__(self, profiler: "StartupProfiler"):
+        self.profiler = profiler
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimingLoader(spec.loader, self.profiler)
+                return spec
+        return None
+
+
+class StartupProfiler:
+    """
+    Measures cold start. `phase()` times named startup steps (subsystem
+    imports, component construction); with `enabled=True` every module
+    imported while the profiler is installed is also timed, split into
+    self time and cumulative time like `python -X importtime`.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.started = time.perf_counter()
+        self.phases: List[Tuple[str, float]] = []
+        self.imports: Dict[str, Tuple[float, float]] = {}
+        self._stack: List[List[float]] = []
+        self._finder = None
+        if enabled:
+            self.install()
+
+    def install(self) -> None:
+        if self._finder is None:
+            self._finder = _TimingFinder(self)
+            sys.meta_path.insert(0, self._finder)
+
+    def uninstall(self) -> None:
+        if self._finder is not None:
+            sys.meta_path.remove(self._finder)
+            self._finder = None
+
+    def _enter_import(self) -> None:
+        self._stack.append([time.perf_counter(), 0.0])
+
+    def _exit_import(self, name: str) -> None:
+        started, children = self._stack.pop()
+        cumulative = time.perf_counter() - started
+        self.imports[name] = (cumulative - children, cumulative)
+        if self._stack:
+            self._stack[-1][1] += cumulative
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - started))
+
+    def load(self, module: str, attr: Optional[str] = None) -> Any:
+        """Imports `module` as a timed phase and returns it, or `module.attr`."""
+        with self.phase(f"import {module}"):
+            loaded = importlib.import_module(module)
+        return loaded if attr is None else getattr(loaded, attr)
+
+    def report(self, top: int = 25) -> str:
+        total = time.perf_counter() - self.started
+        lines = [f"Startup profile: {total * 1000:.1f} ms since profiler start", "", "Phases (ms):"]
+        lines += [f"  {elapsed * 1000:9.1f}  {name}" for name, elapsed in self.phases]
+        if self.imports:
+            lines += ["", f"Slowest imports (ms, top {top} by cumulative time):", "       self  cumulative  module"]
+            ranked = sorted(self.imports.items(), key=lambda item: item[1][1], reverse=True)[:top]
+            lines += [
+                f"  {own * 1000:9.1f}  {cumulative * 1000:10.1f}  {name}"
+                for name, (own, cumulative) in ranked
+            ]
+        return "\n".join(lines)
@@ -0,0 +1,150 @@
+import asyncio
+import logging
+import multiprocessing
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from .config_loader import ConfigLoader
+from .event_bus import event_bus
+from .shm_ring import SharedRingBuffer
+
+logger = logging.getLogger(__name__)
+
+
+def _run_worker(ring_name: str, main: Callable[[], object]) -> None:
+    """
+    Runs `main()` in this worker process with every event it publishes
+    forwarded into the shared-memory ring instead of a local consumer.
+    """
+    ring = SharedRingBuffer.attach(ring_name)
+    event_bus.add_tap(ring.on_publish)
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        ring.close()
+
+
+def news_worker(ring_name: str, config_dir: str) -> None:
+    """Worker entry point: RSS fetching and VADER scoring."""
+    async def main():
+        from ..news_handler.rss_fetcher import RSSFetcher
+
+        fetcher = RSSFetcher(ConfigLoader(config_dir))
+        fetcher.start()
+        await asyncio.Event().wait()
+
+    _run_worker(ring_name, main)
+
+
+def perception_worker(ring_name: str, config_dir: str, ticker: str) -> None:
+    """Worker entry point: screen capture and YOLO inference."""
+    async def main():
+        from ..vision.perception import Perception
+
+        perception = Perception(ConfigLoader(config_dir))
+        perception.start(ticker)
+        await asyncio.Event().wait()
+
+    _run_worker(ring_name, main)
+
+
+class _Worker:
+    def __init__(self, name: str, target: Callable, args: Tuple, ring: SharedRingBuffer):
+        self.name = name
+        self.target = target
+        self.args = args
+        self.ring = ring
+        self.process: Optional[multiprocessing.Process] = None
+        self.restarts = 0
+        self.next_start = 0.0
+
+
+class WorkerSupervisor:
+    """
+    Runs CPU-heavy producers (perception, news scoring) in separate
+    processes. Each worker writes its events into its own shared-memory
+    ring, which the supervisor drains onto the main event bus. Workers that
+    exit are restarted with exponential backoff.
+    """
+
+    def __init__(self, bus=event_bus, ring_size: int = 1024 * 1024, poll_interval: float = 0.005,
+                 max_backoff: float = 30.0):
+        self.bus = bus
+        self.ring_size = ring_size
+        self.poll_interval = poll_interval
+        self.max_backoff = max_backoff
+        self.workers: Dict[str, _Worker] = {}
+        self.poll_task = None
+        self._context = multiprocessing.get_context("spawn")
+
+    @classmethod
+    def from_config(cls, config: ConfigLoader, bus=event_bus) -> "WorkerSupervisor":
+        return cls(
+            bus,
+            ring_size=int(config.get("Workers", "ring_size_kb", fallback=1024)) * 1024,
+            poll_interval=int(config.get("Workers", "poll_interval_ms", fallback=5)) / 1000.0,
+        )
+
+    def add_worker(self, name: str, target: Callable, args: Tuple = ()) -> None:
+        """`target(ring_name, *args)` must be a module-level function."""
+        ring = SharedRingBuffer.create(self.ring_size)
+        self.workers[name] = _Worker(name, target, args, ring)
+
+    def _spawn(self, worker: _Worker) -> None:
+        worker.process = self._context.Process(
+            target=worker.target, args=(worker.ring.name, *worker.args),
+            name=f"worker-{worker.name}", daemon=True
+        )
+        worker.process.start()
+        logger.info(f"Started worker '{worker.name}' (pid {worker.process.pid}).")
+
+    def start(self) -> None:
+        for worker in self.workers.values():
+            self._spawn(worker)
+        self.poll_task = asyncio.create_task(self._poll())
+
+    def _supervise(self, worker: _Worker) -> None:
+        process = worker.process
+        if process is None or process.is_alive():
+            return
+        now = time.monotonic()
+        if worker.next_start == 0.0:
+            delay = min(self.max_backoff, 2 ** worker.restarts)
+            worker.next_start = now + delay
+            logger.warning(
+                f"Worker '{worker.name}' exited with code {process.exitcode}; restarting in {delay:.0f}s."
+            )
+        elif now >= worker.next_start:
+            worker.restarts += 1
+            worker.next_start = 0.0
+            self._spawn(worker)
+
+    async def _poll(self) -> None:
+        while True:
+            for worker in self.workers.values():
+                for event in worker.ring.drain():
+                    await self.bus.put(event)
+                self._supervise(worker)
+            await asyncio.sleep(self.poll_interval)
+
+    def stats(self) -> Dict[str, Dict[str, object]]:
+        return {
+            name: {
+                "alive": bool(worker.process and worker.process.is_alive()),
+                "restarts": worker.restarts,
+                "dropped": worker.ring.dropped,
+            }
+            for name, worker in self.workers.items()
+        }
+
+    def stop(self) -> None:
+        if self.poll_task:
+            self.poll_task.cancel()
+        for worker in self.workers.values():
+            if worker.process and worker.process.is_alive():
+                worker.process.terminate()
+                worker.process.join(timeout=5)
+            worker.ring.close()
+        logger.info("Worker processes stopped.")
@@ -1,13 +1,79 @@
-import requests
+import asyncio
+import importlib.util
 import logging
+import random
+import threading
+import time
+import weakref
+from datetime import timezone
+from email.utils import parsedate_to_datetime
 from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
 
 from ..core.config_loader import ConfigLoader
+from .request_scheduler import RequestScheduler
 
 logger = logging.getLogger(__name__)
 
+# Responses worth retrying: throttling and transient upstream failures
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+# Errors raised before the request reached the server; only these are
+# retried for non-idempotent calls such as placing an order
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """Seconds the server asked us to wait, from Retry-After as seconds or an HTTP date."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:  # "-0000": UTC without a zone
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class _LoopThread:
+    """A private event loop on a daemon thread that runs the sync API's coroutines."""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="api-client-loop", daemon=True)
+        self.thread.start()
+
+    def run(self, coro) -> Any:
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def stop(self) -> None:
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+
 class APIClient:
-    def __init__(self, config: ConfigLoader):
+    """
+    Broker REST client on pooled keep-alive connections (httpx).
+    Every endpoint has an async variant (`aplace_order`, ...) for use from
+    coroutines. The sync methods are thin wrappers that run the same
+    coroutine on a private background loop, so they never block an
+    event loop they weren't called from. Each host gets its own
+    connection pool, using HTTP/2 when the `h2` package is installed.
+    Transient failures are retried with capped exponential backoff and full jitter.
+    Every attempt, retries included, first waits for the `scheduler` in the
+    endpoint's priority lane, so all REST traffic shares the broker's rate limits.
+    """
+
+    def __init__(self, config: ConfigLoader, transport: Optional[httpx.AsyncBaseTransport] = None,
+                 scheduler: Optional[RequestScheduler] = None):
         self.config = config
         self.base_url = self.config.get("Broker", "rest_url")
         self.api_key = self.config.get("Broker", "api_key")
@@ -17,18 +83,100 @@ class APIClient:
             'Accept': 'application/json',
             # Add other necessary headers, e.g., for authentication
         }
+        self.max_connections = int(self.config.get("API", "max_connections_per_host", fallback=10))
+        self.max_keepalive = int(self.config.get("API", "max_keepalive_connections", fallback=5))
+        self.keepalive_expiry = float(self.config.get("API", "keepalive_expiry_seconds", fallback=30))
+        self.retries = int(self.config.get("API", "retries", fallback=3))
+        self.backoff_base = int(self.config.get("API", "retry_backoff_ms", fallback=100)) / 1000.0
+        self.backoff_cap = int(self.config.get("API", "retry_max_backoff_ms", fallback=2000)) / 1000.0
+        self.retry_after_cap = float(self.config.get("API", "retry_after_max_seconds", fallback=60))
+        http2 = self.config.get("API", "http2", fallback="auto").lower()
+        self.http2 = importlib.util.find_spec("h2") is not None if http2 == "auto" else http2 == "true"
+        self._transport = transport
+        self.scheduler = scheduler or RequestScheduler.from_config(config)
+        # httpx clients are bound to the loop they were first used on:
+        # one pool per (loop, host)
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._sync_loop: Optional[_LoopThread] = None
+        self._sync_lock = threading.Lock()
+
+    def _client(self, url: str) -> httpx.AsyncClient:
+        parts = urlsplit(url)
+        host = f"{parts.scheme}://{parts.netloc}"
+        clients = self._clients.setdefault(asyncio.get_running_loop(), {})
+        client = clients.get(host)
+        if client is None:
+            client = httpx.AsyncClient(
+                http2=self.http2,
+                timeout=self.timeout,
+                headers=self.headers,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive,
+                    keepalive_expiry=self.keepalive_expiry,
+                ),
+                transport=self._transport,
+            )
+            clients[host] = client
+        return client
 
-    def _request(self, method: str, endpoint: str, params: Optional[Dict] = None, data: Optional[Dict] = None) -> Any:
+    def _backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Jittered exponential backoff, but never sooner than the server's Retry-After."""
+        delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+        return delay if retry_after is None else max(delay, retry_after)
+
+    async def _arequest(self, method: str, endpoint: str, params: Optional[Dict] = None, data: Optional[Dict] = None,
+                        lane: str = "account") -> Any:
         url = f"{self.base_url}{endpoint}"
-        try:
-            response = requests.request(method, url, params=params, json=data, headers=self.headers, timeout=self.timeout)
-            response.raise_for_status()
+        client = self._client(url)
+        idempotent = method.upper() in _IDEMPOTENT_METHODS
+        attempt = 0
+        while True:
+            await self.scheduler.acquire(lane)
+            try:
+                response = await client.request(method, url, params=params, json=data)
+            except httpx.TransportError as e:
+                if attempt < self.retries and (idempotent or isinstance(e, _NOT_SENT_ERRORS)):
+                    delay = self._backoff(attempt)
+                    logger.warning(f"API {method} {endpoint} failed ({e!r}); retry {attempt + 1} in {delay:.2f}s")
+                    await asyncio.sleep(delay)
+                    attempt += 1
+                    continue
+                logger.error(f"API request failed: {e!r}")
+                raise
+
+            retry_after = _retry_after(response)
+            if response.status_code in RETRY_STATUSES and attempt < self.retries and (
+                    idempotent or response.status_code == 429) and (
+                    retry_after is None or retry_after <= self.retry_after_cap):
+                delay = self._backoff(attempt, retry_after)
+                logger.warning(f"API {method} {endpoint} returned {response.status_code}; "
+                               f"retry {attempt + 1} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            try:
+                response.raise_for_status()
+            except httpx.HTTPStatusError as e:
+                logger.error(f"API request failed: {e}")
+                raise
             return response.json()
-        except requests.exceptions.RequestException as e:
-            logger.error(f"API request failed: {e}")
-            raise
 
-    def get_historical_data(self, ticker: str, interval: str, from_date: str, to_date: str) -> Any:
+    def _request(self, method: str, endpoint: str, params: Optional[Dict] = None, data: Optional[Dict] = None,
+                 lane: str = "account") -> Any:
+        return self._request_sync(self._arequest(method, endpoint, params=params, data=data, lane=lane))
+
+    def _request_sync(self, coro) -> Any:
+        with self._sync_lock:
+            if self._sync_loop is None:
+                self._sync_loop = _LoopThread()
+        return self._sync_loop.run(coro)
+
+    # --- Async API ---
+
+    async def aget_historical_data(self, ticker: str, interval: str, from_date: str, to_date: str) -> Any:
         """
         Fetches historical data for a given ticker.
         The endpoint and parameters are broker-specific.
@@ -39,33 +187,59 @@ class APIClient:
             "from": from_date,
             "to": to_date
         }
-        return self._request("GET", endpoint, params=params)
+        return await self._arequest("GET", endpoint, params=params, lane="historical")
 
-    def get_account_balance(self) -> Any:
+    async def aget_account_balance(self) -> Any:
         """
         Fetches the account balance.
         """
-        endpoint = "/user/balance"
-        return self._request("GET", endpoint)
+        return await self._arequest("GET", "/user/balance")
 
-    def get_order_status(self, order_id: str) -> Any:
+    async def aget_order_status(self, order_id: str) -> Any:
         """
         Fetches the status of a specific order.
         """
-        endpoint = f"/orders/{order_id}"
-        return self._request("GET", endpoint)
+        return await self._arequest("GET", f"/orders/{order_id}", lane="status")
 
-    def place_order(self, order_details: Dict) -> Any:
+    async def aplace_order(self, order_details: Dict) -> Any:
         """
-        Places a new order.
+        Places a new order. Only retried when the request never reached the
+        broker, so an order is never submitted twice.
         """
-        endpoint = "/orders"
-        return self._request("POST", endpoint, data=order_details)
+        return await self._arequest("POST", "/orders", data=order_details, lane="order")
 
-    def get_websocket_url(self) -> str:
+    async def aget_websocket_url(self) -> str:
         """
         Fetches the websocket URL for market data feed.
         """
-        endpoint = "/feed/market-data-feed/authorize"
-        response = self._request("GET", endpoint)
+        response = await self._arequest("GET", "/feed/market-data-feed/authorize")
         return response.get("data", {}).get("authorized_redirect_uri")
+
+    # --- Sync API ---
+
+    def get_historical_data(self, ticker: str, interval: str, from_date: str, to_date: str) -> Any:
+        return self._request_sync(self.aget_historical_data(ticker, interval, from_date, to_date))
+
+    def get_account_balance(self) -> Any:
+        return self._request_sync(self.aget_account_balance())
+
+    def get_order_status(self, order_id: str) -> Any:
+        return self._request_sync(self.aget_order_status(order_id))
+
+    def place_order(self, order_details: Dict) -> Any:
+        return self._request_sync(self.aplace_order(order_details))
+
+    def get_websocket_url(self) -> str:
+        return self._request_sync(self.aget_websocket_url())
+
+    async def aclose(self) -> None:
+        """Closes the connection pools owned by the running loop."""
+        for client in self._clients.pop(asyncio.get_running_loop(), {}).values():
+            await client.aclose()
+
+    def close(self) -> None:
+        """Closes the sync API's pools and background loop."""
+        if self._sync_loop is not None:
+            self._sync_loop.run(self.aclose())
+            self._sync_loop.stop()
+            self._sync_loop = None
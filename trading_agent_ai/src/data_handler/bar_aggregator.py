@@ -0,0 +1,284 @@
+import asyncio
+import logging
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from ..core.config_loader import ConfigLoader
+from ..core.event_bus import event_bus
+from ..core.event_types import BarEvent, MarketEvent, MarketEventBatch
+from .historical_cache import interval_ns
+
+logger = logging.getLogger(__name__)
+
+BAR_DTYPE = np.dtype([
+    ("ts_ns", np.int64),
+    ("open", np.float64),
+    ("high", np.float64),
+    ("low", np.float64),
+    ("close", np.float64),
+    ("volume", np.int64),
+])
+
+DAY_NS = 86400 * 1_000_000_000
+
+
+class BarRing:
+    """
+    The last `capacity` closed bars of one ticker and interval, oldest
+    first. Every bar is written twice, at slot i and i + capacity, so any
+    window of recent bars is one contiguous slice: `window()` returns a
+    view into the buffer instead of a copy. Views are only valid until the
+    slots they cover are overwritten, `capacity` appends later.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.count = 0
+        self._data = np.zeros(2 * capacity, dtype=BAR_DTYPE)
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    def append(self, ts_ns: int, open_: float, high: float, low: float, close: float, volume: int) -> None:
+        slot = self.count % self.capacity
+        row = (ts_ns, open_, high, low, close, volume)
+        self._data[slot] = row
+        self._data[slot + self.capacity] = row
+        self.count += 1
+
+    def window(self, n: Optional[int] = None) -> np.ndarray:
+        """The last `n` bars (all retained bars by default) as a structured array view."""
+        size = len(self)
+        n = size if n is None else min(n, size)
+        if n <= 0:
+            return self._data[:0]
+        end = (self.count - 1) % self.capacity + self.capacity + 1
+        return self._data[end - n:end]
+
+
+class _TickerBars:
+    __slots__ = ("forming", "last_closed", "rings", "last_tick_ns")
+
+    def __init__(self, n_intervals: int, capacity: int):
+        # forming[i] is [start_ns, open, high, low, close, volume, synthetic]
+        self.forming: List[Optional[list]] = [None] * n_intervals
+        self.last_closed = [-1] * n_intervals
+        self.rings = [BarRing(capacity) for _ in range(n_intervals)]
+        self.last_tick_ns = 0
+
+
+class BarAggregator:
+    """
+    Builds OHLCV bars from the tick stream and publishes a BarEvent as each
+    bar closes. Every tick updates the forming bar of each interval in
+    constant time, and a batch is first reduced to one OHLCV update per
+    ticker. A bar closes when its ticker trades in the next bucket, or
+    when ticks on any ticker move past the bar's end by more than
+    `allowed_lateness_ms`, so illiquid tickers close on time as well.
+    Ticks for an already closed bucket are counted in `late` and dropped.
+    Closed bars go to a per-ticker BarRing (see `bars()`).
+
+    Synthetic bars backfilled after a feed outage are merged in. A
+    synthetic bar replaces the forming bar of the same interval and
+    fills missing buckets. It rolls up into coarser intervals when it
+    starts after the ticker's last live tick, so volume is not counted
+    twice. Bars built from any synthetic input are published with
+    synthetic=True.
+    """
+
+    def __init__(self, bus=event_bus, intervals: Iterable[str] = ("1s", "1m", "5m", "15m"), history: int = 1000,
+                 allowed_lateness_ms: float = 250.0, day_offset_minutes: int = 330):
+        self.bus = bus
+        self.intervals = sorted(intervals, key=interval_ns)
+        self.widths = [interval_ns(name) for name in self.intervals]
+        day_offset_ns = day_offset_minutes * 60 * 1_000_000_000
+        # Daily and longer bars follow the exchange day, like Database bars
+        self.offsets = [day_offset_ns if width >= DAY_NS else 0 for width in self.widths]
+        self.history = history
+        self.lateness_ns = int(allowed_lateness_ms * 1e6)
+        self.tickers: Dict[str, _TickerBars] = {}
+        self.watermark_ns = 0
+        self.ticks = 0
+        self.bars_closed = 0
+        self.late = 0
+        self.backfilled = 0
+        self.subscription = None
+        self._closed: List[BarEvent] = []
+        self._sweep_ns = 0
+        self._outbox: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    @classmethod
+    def from_config(cls, config: ConfigLoader, bus=event_bus) -> "BarAggregator":
+        intervals = config.get("Bars", "intervals", fallback="1s,1m,5m,15m")
+        return cls(
+            bus,
+            intervals=[name.strip() for name in intervals.split(",") if name.strip()],
+            history=int(config.get("Bars", "history", fallback=1000)),
+            allowed_lateness_ms=float(config.get("Bars", "allowed_lateness_ms", fallback=250)),
+            day_offset_minutes=int(config.get("Database", "bar_day_offset_minutes", fallback=330)),
+        )
+
+    def bars(self, ticker: str, interval: str, n: Optional[int] = None) -> np.ndarray:
+        """The last `n` closed bars as a zero-copy BAR_DTYPE view, oldest first."""
+        state = self.tickers.get(ticker)
+        if state is None:
+            return np.zeros(0, dtype=BAR_DTYPE)
+        return state.rings[self.intervals.index(interval)].window(n)
+
+    def forming(self, ticker: str, interval: str) -> Optional[BarEvent]:
+        """The bar currently being built, if the ticker has traded in this bucket."""
+        state = self.tickers.get(ticker)
+        bar = state.forming[self.intervals.index(interval)] if state else None
+        return BarEvent(ticker, interval, *bar[:6], synthetic=bar[6]) if bar else None
+
+    def _state(self, ticker: str) -> _TickerBars:
+        state = self.tickers.get(ticker)
+        if state is None:
+            state = self.tickers[ticker] = _TickerBars(len(self.widths), self.history)
+        return state
+
+    def _close(self, ticker: str, state: _TickerBars, index: int) -> None:
+        bar = state.forming[index]
+        state.forming[index] = None
+        state.last_closed[index] = bar[0]
+        state.rings[index].append(bar[0], bar[1], bar[2], bar[3], bar[4], bar[5])
+        self._closed.append(BarEvent(ticker, self.intervals[index], *bar[:6], synthetic=bar[6]))
+        self.bars_closed += 1
+
+    def _update(self, ticker: str, state: _TickerBars, ts_ns: int, open_: float, high: float, low: float,
+                close: float, volume: int, synthetic: bool = False, first: int = 0) -> bool:
+        """Folds one OHLCV update into intervals[first:]; False if it was too late for any of them."""
+        on_time = True
+        forming = state.forming
+        for index in range(first, len(self.widths)):
+            width, offset = self.widths[index], self.offsets[index]
+            start = (ts_ns + offset) // width * width - offset
+            bar = forming[index]
+            if bar is not None and start == bar[0]:
+                if high > bar[2]:
+                    bar[2] = high
+                if low < bar[3]:
+                    bar[3] = low
+                bar[4] = close
+                bar[5] += volume
+                bar[6] = bar[6] or synthetic
+            elif start > (bar[0] if bar is not None else state.last_closed[index]):
+                if bar is not None:
+                    self._close(ticker, state, index)
+                forming[index] = [start, open_, high, low, close, volume, synthetic]
+            else:
+                on_time = False
+        return on_time
+
+    def _merge_bar(self, event: BarEvent) -> None:
+        width = interval_ns(event.interval)
+        state = self._state(event.ticker)
+        bar = [event.ts_ns, event.open, event.high, event.low, event.close, event.volume, True]
+        index = self.widths.index(width) if width in self.widths else None
+        if index is not None:
+            current = state.forming[index]
+            if event.ts_ns <= state.last_closed[index] or (current is not None and event.ts_ns < current[0]):
+                # Already have it (including our own bars echoed back), or too old
+                return
+            if current is not None and event.ts_ns > current[0]:
+                self._close(event.ticker, state, index)
+            state.forming[index] = bar
+            self._close(event.ticker, state, index)
+        if event.ts_ns >= state.last_tick_ns:
+            for coarser in range(len(self.widths)):
+                if self.widths[coarser] > width and self.widths[coarser] % width == 0:
+                    self._update(event.ticker, state, *bar, first=coarser)
+                    break
+        self.backfilled += 1
+
+    def _sweep(self) -> None:
+        cutoff = self.watermark_ns - self.lateness_ns
+        for ticker, state in self.tickers.items():
+            for index, bar in enumerate(state.forming):
+                if bar is not None and bar[0] + self.widths[index] <= cutoff:
+                    self._close(ticker, state, index)
+        finest = self.widths[0]
+        self._sweep_ns = (cutoff // finest + 1) * finest + self.lateness_ns
+
+    def on_event(self, event) -> List[BarEvent]:
+        """Applies one event and returns the bars it closed, oldest first."""
+        if isinstance(event, MarketEvent):
+            state = self._state(event.ticker)
+            price, ts_ns = event.price, event.ts_ns
+            if not self._update(event.ticker, state, ts_ns, price, price, price, price, event.volume):
+                self.late += 1
+            state.last_tick_ns = max(state.last_tick_ns, ts_ns)
+            self.ticks += 1
+        elif isinstance(event, MarketEventBatch):
+            ts_ns = event.ts_ns
+            order = np.argsort(event.ticker_ids, kind="stable")
+            ids = event.ticker_ids[order]
+            prices = event.prices[order]
+            starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+            ends = np.r_[starts[1:], len(ids)] - 1
+            for ticker_id, open_, high, low, close, volume in zip(
+                ids[starts].tolist(), prices[starts].tolist(), np.maximum.reduceat(prices, starts).tolist(),
+                np.minimum.reduceat(prices, starts).tolist(), prices[ends].tolist(),
+                np.add.reduceat(event.volumes[order], starts).tolist(),
+            ):
+                ticker = event.symbols[ticker_id]
+                state = self._state(ticker)
+                if not self._update(ticker, state, ts_ns, open_, high, low, close, volume):
+                    self.late += 1
+                state.last_tick_ns = max(state.last_tick_ns, ts_ns)
+            self.ticks += len(ids)
+        elif isinstance(event, BarEvent):
+            if event.synthetic:
+                self._merge_bar(event)
+            ts_ns = 0
+        else:
+            return []
+        if ts_ns > self.watermark_ns:
+            self.watermark_ns = ts_ns
+            if ts_ns >= self._sweep_ns:
+                self._sweep()
+        closed, self._closed = self._closed, []
+        return closed
+
+    def start(self) -> None:
+        self.subscription = self.bus.subscribe("bar_aggregator", (MarketEvent, MarketEventBatch, BarEvent))
+        # Bars are published from a separate task: this subscription receives
+        # them back, so publishing inline could block on our own full queue
+        self._outbox = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._aggregate()), asyncio.create_task(self._publish())]
+        logger.info(f"Bar aggregator started ({', '.join(self.intervals)}).")
+
+    async def _aggregate(self) -> None:
+        while True:
+            event = await self.subscription.get()
+            try:
+                for bar in self.on_event(event):
+                    self._outbox.put_nowait(bar)
+            except Exception as e:
+                logger.error(f"Bar aggregator failed on {type(event).__name__}: {e!r}")
+            finally:
+                self.subscription.task_done()
+
+    async def _publish(self) -> None:
+        while True:
+            await self.bus.put(await self._outbox.get())
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "tickers": len(self.tickers),
+            "ticks": self.ticks,
+            "bars_closed": self.bars_closed,
+            "late": self.late,
+            "backfilled": self.backfilled,
+        }
+
+    def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        if self.subscription is not None:
+            self.bus.unsubscribe(self.subscription)
+            self.subscription = None
+        logger.info(f"Bar aggregator stopped: {self.stats()}")
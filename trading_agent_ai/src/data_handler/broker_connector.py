@@ -5,7 +5,7 @@ from typing import Any, Dict
 from ..core.config_loader import ConfigLoader
 from ..core.event_bus import event_bus
 from .api_client import APIClient
-from .websocket_manager import WebsocketManager
+from .subscription_manager import SubscriptionManager
 
 logger = logging.getLogger(__name__)
 
@@ -13,7 +13,9 @@ class BrokerConnector:
     def __init__(self, config: ConfigLoader):
         self.config = config
         self.api_client = APIClient(config)
-        self.websocket_manager = WebsocketManager(config)
+        self.subscription_manager = SubscriptionManager(config, api_client=self.api_client)
+        watchlist = self.config.get("Feed", "watchlist", fallback="")
+        self.watchlist = [t.strip() for t in watchlist.split(",") if t.strip()]
 
     async def start(self):
         logger.info("Starting Broker Connector...")
@@ -27,14 +29,15 @@ class BrokerConnector:
         # For example, getting an access token
         # self.api_client.authenticate()
         
-        # Start the websocket connection
-        await self.websocket_manager.connect()
-        self.listen_task = asyncio.create_task(self.websocket_manager.listen())
+        # Open the feed connections, sharding the watchlist across them
+        await self.subscription_manager.start(self.watchlist)
         logger.info("Broker Connector started.")
 
     async def stop(self):
         logger.info("Stopping Broker Connector...")
-        await self.websocket_manager.close()
+        await self.subscription_manager.stop()
+        self.api_client.scheduler.log_stats()
+        await self.api_client.aclose()
         logger.info("Broker Connector stopped.")
 
     def get_api_client(self) -> APIClient:
@@ -42,5 +45,4 @@ class BrokerConnector:
 
     def is_connected(self) -> bool:
         """Check if the broker connection is active."""
-        return (self.websocket_manager.websocket is not None or 
-                self.websocket_manager.mock_mode)
+        return self.subscription_manager.is_connected()
@@ -0,0 +1,223 @@
+import importlib
+import json
+import logging
+import struct
+import time
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+
+from ..core.config_loader import ConfigLoader
+from ..core.event_types import DepthEvent, MarketEvent, MarketEventBatch
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib parser
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+Frame = Union[str, bytes, bytearray, memoryview]
+Tick = Tuple[str, float, int]
+Decoded = Union[MarketEvent, MarketEventBatch, DepthEvent, None]
+
+
+class FeedDecoder:
+    """
+    Turns one websocket frame into a MarketEventBatch, or None when the
+    frame carries no ticks (heartbeats, acks, ...). A frame may carry any
+    number of instruments; all its ticks share the frame's receive time.
+    Single-tick frames come back as a plain MarketEvent, which is cheaper
+    to build than a one-row batch. Order book frames, where a format has
+    them, come back as a DepthEvent.
+    """
+
+    name = "base"
+
+    def decode(self, frame: Frame, ts_ns: Optional[int] = None) -> Decoded:
+        raise NotImplementedError
+
+
+class JsonDecoder(FeedDecoder):
+    """
+    JSON feed, parsed with orjson when it is installed. Accepts a single
+    tick (`{"type": "tick", "ticker", "price", "volume"}`), a frame of
+    ticks (`{"type": "ticks", "data": [...]}`) or a bare list of ticks.
+    Depth frames (`{"type": "depth", "ticker", "bids": [[price, size], ...],
+    "asks": [...], "snapshot": false}`) carry order book changes.
+    An optional `ts` (epoch ns) on a dict frame is used as its time.
+    """
+
+    name = "json"
+
+    def __init__(self):
+        self.loads = orjson.loads if orjson is not None else json.loads
+
+    def decode(self, frame: Frame, ts_ns: Optional[int] = None) -> Decoded:
+        data = self.loads(frame)
+        if isinstance(data, dict):
+            ts_ns = data.get("ts") or ts_ns
+            kind = data.get("type")
+            if kind == "tick":
+                data = (data,)
+            elif kind == "ticks":
+                data = data.get("data") or ()
+            elif kind == "depth":
+                return DepthEvent(
+                    data["ticker"],
+                    tuple((float(price), int(size)) for price, size in data.get("bids") or ()),
+                    tuple((float(price), int(size)) for price, size in data.get("asks") or ()),
+                    time.time_ns() if ts_ns is None else ts_ns,
+                    bool(data.get("snapshot")),
+                )
+            else:
+                return None
+        if not data:
+            return None
+        if len(data) == 1:
+            tick = data[0]
+            return MarketEvent(tick["ticker"], tick["price"], tick["volume"],
+                               time.time_ns() if ts_ns is None else ts_ns)
+        return MarketEventBatch.from_ticks(
+            ((tick["ticker"], tick["price"], tick["volume"]) for tick in data), ts_ns
+        )
+
+
+class BinaryDecoder(FeedDecoder):
+    """
+    Packed little-endian feed: a header of (uint16 tick count, int64
+    exchange time in epoch ns) followed by one (uint32 instrument token,
+    float64 price, int64 volume) record per tick. The records are read
+    straight into NumPy with one `frombuffer`, so the cost per frame is
+    nearly independent of how many instruments it carries; below
+    `NUMPY_MIN_TICKS` plain `struct` unpacking is cheaper. Tokens map to
+    tickers through `instruments`; unknown tokens are dropped.
+    """
+
+    name = "binary"
+    HEADER = struct.Struct("<Hq")
+    RECORD = np.dtype([("token", "<u4"), ("price", "<f8"), ("volume", "<i8")])
+    _RECORD_STRUCT = struct.Struct("<Idq")
+    NUMPY_MIN_TICKS = 64
+
+    def __init__(self, instruments: Mapping[int, str]):
+        self.instruments = dict(instruments)
+        self._tokens = np.fromiter(self.instruments, dtype=np.uint32, count=len(self.instruments))
+        order = np.argsort(self._tokens)
+        self._tokens = self._tokens[order]
+        self._symbols = np.array(list(self.instruments.values()), dtype=object)[order]
+
+    def decode(self, frame: Frame, ts_ns: Optional[int] = None) -> Decoded:
+        count, exchange_ns = self.HEADER.unpack_from(frame)
+        if count == 0:
+            return None
+        ts_ns = exchange_ns or (time.time_ns() if ts_ns is None else ts_ns)
+        if count < self.NUMPY_MIN_TICKS:
+            end = self.HEADER.size + count * self._RECORD_STRUCT.size
+            get = self.instruments.get
+            ticks = [(get(token), price, volume)
+                     for token, price, volume in self._RECORD_STRUCT.iter_unpack(memoryview(frame)[self.HEADER.size:end])]
+            ticks = [tick for tick in ticks if tick[0] is not None]
+            if len(ticks) == 1:
+                return MarketEvent(*ticks[0], ts_ns)
+            return MarketEventBatch.from_ticks(ticks, ts_ns) if ticks else None
+        records = np.frombuffer(frame, dtype=self.RECORD, count=count, offset=self.HEADER.size)
+        positions = np.searchsorted(self._tokens, records["token"]).clip(max=len(self._tokens) - 1)
+        known = self._tokens[positions] == records["token"]
+        if not known.all():
+            records, positions = records[known], positions[known]
+            if not len(records):
+                return None
+        present, ticker_ids = np.unique(positions, return_inverse=True)
+        return MarketEventBatch(
+            symbols=tuple(self._symbols[present]),
+            ticker_ids=ticker_ids.astype(np.int32),
+            prices=records["price"].astype(np.float64),
+            volumes=records["volume"].astype(np.int64),
+            ts_ns=ts_ns,
+        )
+
+    def encode(self, ticks: Iterable[Tick], ts_ns: int = 0) -> bytes:
+        """Packs (ticker, price, volume) ticks into one frame; used by tests and tools."""
+        tokens = {ticker: token for token, ticker in self.instruments.items()}
+        records = np.array([(tokens[ticker], price, volume) for ticker, price, volume in ticks], dtype=self.RECORD)
+        return self.HEADER.pack(len(records), ts_ns) + records.tobytes()
+
+
+def upstox_feed_ticks(message: Any) -> Iterable[Tick]:
+    """Default protobuf extractor: a `feeds` map of instrument key to a feed with `ltpc`."""
+    for key, feed in message.feeds.items():
+        ltpc = feed.ltpc
+        yield key, ltpc.ltp, ltpc.ltq
+
+
+class ProtobufDecoder(FeedDecoder):
+    """
+    Hook for brokers that publish protobuf frames. `message_class` is the
+    generated message type (`FromString` is called per frame) and
+    `extract` yields (ticker, price, volume) ticks from a parsed message.
+    """
+
+    name = "protobuf"
+
+    def __init__(self, message_class: Any, extract: Callable[[Any], Iterable[Tick]] = upstox_feed_ticks):
+        self.message_class = message_class
+        self.extract = extract
+
+    def decode(self, frame: Frame, ts_ns: Optional[int] = None) -> Decoded:
+        ticks = list(self.extract(self.message_class.FromString(bytes(frame))))
+        if len(ticks) == 1:
+            return MarketEvent(*ticks[0], time.time_ns() if ts_ns is None else ts_ns)
+        return MarketEventBatch.from_ticks(ticks, ts_ns) if ticks else None
+
+
+def _load_object(path: str) -> Any:
+    module, _, attr = path.partition(":")
+    return getattr(importlib.import_module(module), attr)
+
+
+def parse_instruments(value: str) -> Dict[int, str]:
+    """Parses `token:TICKER,token:TICKER` into a token map."""
+    instruments = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        token, _, ticker = item.partition(":")
+        instruments[int(token)] = ticker.strip()
+    return instruments
+
+
+def decoder_from_config(config: ConfigLoader) -> FeedDecoder:
+    """Builds the decoder selected by `[Feed] format` (json, binary or protobuf)."""
+    kind = config.get("Feed", "format", fallback="json").lower()
+    if kind == "json":
+        return JsonDecoder()
+    if kind == "binary":
+        return BinaryDecoder(parse_instruments(config.get("Feed", "instruments", fallback="")))
+    if kind == "protobuf":
+        message_class = _load_object(config.get("Feed", "protobuf_message"))
+        extract = config.get("Feed", "protobuf_extract", fallback="")
+        return ProtobufDecoder(message_class, _load_object(extract)) if extract else ProtobufDecoder(message_class)
+    raise ValueError(f"Unknown feed format: {kind}")
+
+
+def merge_batches(decoded: List[Union[MarketEvent, MarketEventBatch]]) -> Union[MarketEvent, MarketEventBatch]:
+    """Concatenates frames received together into one batch (stamped with the last frame's time)."""
+    if len(decoded) == 1:
+        return decoded[0]
+    batches = [
+        MarketEventBatch.from_ticks([(item.ticker, item.price, item.volume)], item.ts_ns)
+        if isinstance(item, MarketEvent) else item
+        for item in decoded
+    ]
+    index: Dict[str, int] = {}
+    ids = []
+    for batch in batches:
+        remap = np.fromiter((index.setdefault(s, len(index)) for s in batch.symbols), dtype=np.int32,
+                            count=len(batch.symbols))
+        ids.append(remap[batch.ticker_ids])
+    return MarketEventBatch(
+        symbols=tuple(index),
+        ticker_ids=np.concatenate(ids),
+        prices=np.concatenate([b.prices for b in batches]),
+        volumes=np.concatenate([b.volumes for b in batches]),
+        ts_ns=batches[-1].ts_ns,
+    )
@@ -0,0 +1,179 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .api_client import APIClient
+from .parquet_archive import ParquetArchive
+
+logger = logging.getLogger(__name__)
+
+DateRange = Tuple[date, date]
+
+
+def bars_from_response(data: Any, timezone: str = "Asia/Kolkata"):
+    """
+    Normalizes a historical-data response (list of records or dict of
+    columns) to an OHLCV DataFrame with a UTC DatetimeIndex. Naive
+    timestamps are taken to be exchange local time.
+    """
+    import pandas as pd
+
+    df = pd.DataFrame(data)
+    if df.empty:
+        return pd.DataFrame(columns=["open", "high", "low", "close", "volume"],
+                            index=pd.DatetimeIndex([], tz="UTC"))
+    df.columns = [str(col).lower() for col in df.columns]
+    time_col = next((col for col in ("timestamp", "datetime", "date", "time") if col in df.columns), None)
+    if time_col is None:
+        raise ValueError(f"No timestamp column in historical data (columns: {list(df.columns)}).")
+    index = pd.to_datetime(df.pop(time_col))
+    index = index.dt.tz_localize(timezone) if index.dt.tz is None else index
+    df.index = pd.DatetimeIndex(index.dt.tz_convert("UTC"))
+    for col in ("open", "high", "low", "close", "volume"):
+        df[col] = pd.to_numeric(df[col])
+    return df.sort_index()
+
+
+_INTERVAL_UNITS = (("second", 1), ("minute", 60), ("hour", 3600), ("day", 86400), ("week", 604800),
+                   ("s", 1), ("m", 60), ("h", 3600), ("d", 86400))
+
+
+def interval_ns(interval: str) -> int:
+    """Length of an interval such as `1minute`, `30minute`, `1day` or the short `5m` in nanoseconds."""
+    for unit, seconds in _INTERVAL_UNITS:
+        if interval.endswith(unit):
+            return int(interval[:-len(unit)] or 1) * seconds * 1_000_000_000
+    raise ValueError(f"Unknown interval: {interval}")
+
+
+def _as_date(value: Union[str, date]) -> date:
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+def subtract_ranges(wanted: DateRange, covered: List[DateRange]) -> List[DateRange]:
+    """Returns the parts of the inclusive `wanted` range not in `covered` (sorted, merged)."""
+    start, end = wanted
+    gaps = []
+    for covered_start, covered_end in covered:
+        if covered_end < start:
+            continue
+        if covered_start > end:
+            break
+        if covered_start > start:
+            gaps.append((start, covered_start - timedelta(days=1)))
+        start = max(start, covered_end + timedelta(days=1))
+        if start > end:
+            return gaps
+    if start <= end:
+        gaps.append((start, end))
+    return gaps
+
+
+def merge_ranges(ranges: List[DateRange]) -> List[DateRange]:
+    """Sorts inclusive date ranges and merges overlapping or adjacent ones."""
+    merged: List[DateRange] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class HistoricalDataCache:
+    """
+    Range-aware cache in front of `APIClient.aget_historical_data`.
+    Bars are stored in the Parquet archive (bars_<interval>) and a small
+    JSON index records, per ticker and interval, which exchange days are
+    already held. A request only downloads the missing gaps. Today is
+    never marked as held, because its bars are still forming, so a daily
+    refresh costs one request per ticker for the days since the last run.
+    """
+
+    def __init__(self, api_client: APIClient, archive: ParquetArchive, index_path: Optional[Union[str, Path]] = None):
+        self.api_client = api_client
+        self.archive = archive
+        self.index_path = Path(index_path) if index_path else archive.root / "_coverage.json"
+        self.requests = 0
+        # Archive calls run on worker threads; one at a time, so concurrent
+        # requests never read a partition while it is being compacted
+        self._archive_lock = threading.Lock()
+        self._coverage: Dict[str, List[DateRange]] = self._load()
+
+    def _load(self) -> Dict[str, List[DateRange]]:
+        if not self.index_path.exists():
+            return {}
+        with open(self.index_path) as f:
+            raw = json.load(f)
+        return {key: [(date.fromisoformat(a), date.fromisoformat(b)) for a, b in ranges]
+                for key, ranges in raw.items()}
+
+    def _save(self) -> None:
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_name(f"_{self.index_path.name}.tmp")
+        with open(tmp, "w") as f:
+            json.dump({key: [[a.isoformat(), b.isoformat()] for a, b in ranges]
+                       for key, ranges in self._coverage.items()}, f, indent=1)
+        os.replace(tmp, self.index_path)
+
+    async def _in_thread(self, method, *args, **kwargs):
+        def call():
+            with self._archive_lock:
+                return method(*args, **kwargs)
+        return await asyncio.to_thread(call)
+
+    @staticmethod
+    def _key(ticker: str, interval: str) -> str:
+        return f"{ticker}|{interval}"
+
+    def covered(self, ticker: str, interval: str) -> List[DateRange]:
+        return list(self._coverage.get(self._key(ticker, interval), []))
+
+    def missing(self, ticker: str, interval: str, from_date: Union[str, date], to_date: Union[str, date]) -> List[DateRange]:
+        """Date ranges in [from_date, to_date] that would be downloaded."""
+        return subtract_ranges((_as_date(from_date), _as_date(to_date)), self.covered(ticker, interval))
+
+    async def get(self, ticker: str, interval: str, from_date: Union[str, date], to_date: Union[str, date]):
+        """
+        Returns bars for the inclusive exchange-date range as a DataFrame
+        indexed by UTC timestamp, downloading only the days not yet held.
+        """
+        from_date, to_date = _as_date(from_date), _as_date(to_date)
+        today = date.fromisoformat(self.archive.today())
+        key = self._key(ticker, interval)
+
+        fetched: List[DateRange] = []
+        written = False
+        for gap_start, gap_end in self.missing(ticker, interval, from_date, to_date):
+            data = await self.api_client.aget_historical_data(
+                ticker, interval, gap_start.isoformat(), gap_end.isoformat()
+            )
+            self.requests += 1
+            bars = bars_from_response(data)
+            if len(bars):
+                # Parquet reads and writes block, so they run off the event loop
+                await self._in_thread(self.archive.write_bars, interval, bars, ticker=ticker)
+                written = True
+            logger.info(f"Fetched {len(bars)} {interval} bars for {ticker} {gap_start}..{gap_end}")
+            if gap_start < today:
+                fetched.append((gap_start, min(gap_end, today - timedelta(days=1))))
+
+        if fetched:
+            self._coverage[key] = merge_ranges(self.covered(ticker, interval) + fetched)
+            self._save()
+        if written:
+            # Merge the new part files; refetched bars replace older copies
+            await self._in_thread(self.archive.compact, f"bars_{interval}", ticker=ticker)
+        if not (self.archive.root / f"bars_{interval}").exists():
+            return bars_from_response([])
+
+        return await self._in_thread(
+            self.archive.read_bars, ticker, interval,
+            self.archive.day_start_ns(from_date.isoformat()),
+            self.archive.day_start_ns((to_date + timedelta(days=1)).isoformat()),
+        )
@@ -0,0 +1,243 @@
+import asyncio
+import logging
+import math
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Union
+
+import numpy as np
+
+from ..core.config_loader import ConfigLoader
+from ..core.event_types import MarketEvent, MarketEventBatch
+
+logger = logging.getLogger(__name__)
+
+# NSE cash session, 09:15-15:30 IST
+SESSION_SECONDS = 375 * 60
+TRADING_DAYS = 252
+
+DEFAULT_TICKERS = {"NIFTY": 18000.0, "BANKNIFTY": 42000.0, "RELIANCE": 2500.0, "TCS": 3500.0, "INFY": 1500.0}
+
+
+@dataclass(frozen=True)
+class Phase:
+    """
+    A stretch of simulated time [start, end) in seconds since the simulator
+    started, with multipliers on the tick rate and volatility, an extra
+    log drift per second, and a one-off per-ticker gap (std of the log
+    return) applied when the phase begins. A halted phase emits no ticks.
+    """
+    start: float
+    end: float
+    rate: float = 1.0
+    volatility: float = 1.0
+    drift: float = 0.0
+    gap: float = 0.0
+    halted: bool = False
+
+
+def market_open(burst_seconds: float = 60.0, burst_rate: float = 8.0, gap: float = 0.01) -> List[Phase]:
+    """Opening auction gap followed by a burst of activity that fades over `burst_seconds`."""
+    third = burst_seconds / 3
+    return [
+        Phase(0, third, rate=burst_rate, volatility=4.0, gap=gap),
+        Phase(third, 2 * third, rate=burst_rate / 2, volatility=2.5),
+        Phase(2 * third, burst_seconds, rate=burst_rate / 4, volatility=1.5),
+    ]
+
+
+def circuit_breaker(trigger_after: float = 30.0, crash_seconds: float = 20.0, move: float = -0.10,
+                    halt_seconds: float = 45.0, burst_rate: float = 5.0) -> List[Phase]:
+    """A fast `move` (e.g. -10%) on heavy volume, a trading halt, then a reopening burst."""
+    crash_end = trigger_after + crash_seconds
+    halt_end = crash_end + halt_seconds
+    return [
+        Phase(trigger_after, crash_end, rate=burst_rate, volatility=3.0, drift=math.log1p(move) / crash_seconds),
+        Phase(crash_end, halt_end, halted=True),
+        Phase(halt_end, halt_end + 30.0, rate=burst_rate, volatility=2.0, gap=0.005),
+    ]
+
+
+SCENARIOS = {
+    "none": lambda: [],
+    "open": market_open,
+    "circuit_breaker": circuit_breaker,
+}
+
+
+def intraday_profile(session_seconds: float) -> float:
+    """U-shaped activity multiplier over the session (busy open and close, quiet midday), mean ~1."""
+    t = (session_seconds % SESSION_SECONDS) / SESSION_SECONDS
+    return 0.82 + 1.6 * math.exp(-t / 0.06) + 1.1 * math.exp(-(1.0 - t) / 0.08)
+
+
+class MarketSimulator:
+    """
+    Synthetic tick feed for load testing without a broker connection.
+    Prices follow geometric Brownian motion with Poisson jumps, advanced
+    in fixed steps of `step_ms`; each step draws a Poisson number of ticks
+    at `rate` ticks/s, scaled by the intraday volume profile and the
+    active scenario phase, and spread across tickers with Zipf-like
+    activity weights. Everything is drawn from one seeded generator and
+    only simulated time is used, so a given seed always produces the
+    same sequence of events however fast it is consumed.
+    """
+
+    def __init__(
+        self,
+        tickers: Optional[Mapping[str, float]] = None,
+        rate: float = 10.0,
+        volatility: float = 0.2,
+        drift: float = 0.0,
+        jumps_per_day: float = 0.5,
+        jump_std: float = 0.02,
+        mean_volume: float = 100.0,
+        tick_size: float = 0.05,
+        step_ms: float = 10.0,
+        scenario: Union[str, List[Phase]] = "none",
+        session_offset: float = 0.0,
+        profile: bool = True,
+        speed: float = 1.0,
+        seed: Optional[int] = None,
+        start_ns: Optional[int] = None,
+    ):
+        self.tickers = dict(tickers or DEFAULT_TICKERS)
+        self.symbols = tuple(self.tickers)
+        self.rate = rate
+        self.mean_volume = mean_volume
+        self.tick_size = tick_size
+        self.dt = step_ms / 1000.0
+        self.phases = SCENARIOS[scenario]() if isinstance(scenario, str) else list(scenario)
+        self.session_offset = session_offset
+        self.profile = profile
+        self.speed = speed
+        self.seed = seed
+        self.start_ns = time.time_ns() if start_ns is None else start_ns
+        self.rng = np.random.default_rng(seed)
+
+        # Annualised parameters to per-second of trading time
+        year = TRADING_DAYS * SESSION_SECONDS
+        self.sigma = volatility / math.sqrt(year)
+        self.mu = drift / year
+        self.jump_rate = jumps_per_day / SESSION_SECONDS
+        self.jump_std = jump_std
+
+        weights = 1.0 / np.arange(1, len(self.symbols) + 1) ** 0.8
+        self.weights = weights / weights.sum()
+        self.log_prices = np.log(np.fromiter(self.tickers.values(), dtype=np.float64, count=len(self.tickers)))
+        self.steps = 0
+        self.ticks = 0
+        self.max_lag = 0.0
+        self._started_phases = set()
+
+    @classmethod
+    def from_config(cls, config: ConfigLoader) -> "MarketSimulator":
+        """Builds a simulator from the [Simulator] section of main_config.ini."""
+        def get(key, fallback):
+            return config.get("Simulator", key, fallback=fallback)
+
+        tickers = {}
+        for item in filter(None, (part.strip() for part in get("tickers", "").split(","))):
+            ticker, _, price = item.partition(":")
+            tickers[ticker.strip()] = float(price or 1000.0)
+        tickers = tickers or dict(DEFAULT_TICKERS)
+        seed = get("seed", "")
+        extra = int(get("extra_symbols", 0))
+        if extra:
+            prices = np.random.default_rng(int(seed) if seed else None).lognormal(math.log(1000.0), 1.0, extra)
+            tickers.update({f"SYM{i:04d}": round(float(p), 2) for i, p in enumerate(prices)})
+
+        return cls(
+            tickers,
+            rate=float(get("rate", 10)),
+            volatility=float(get("volatility", 0.2)),
+            drift=float(get("drift", 0.0)),
+            jumps_per_day=float(get("jumps_per_day", 0.5)),
+            jump_std=float(get("jump_std", 0.02)),
+            mean_volume=float(get("mean_volume", 100)),
+            tick_size=float(get("tick_size", 0.05)),
+            step_ms=float(get("step_ms", 10)),
+            scenario=get("scenario", "none"),
+            session_offset=float(get("session_offset_minutes", 0)) * 60,
+            profile=get("volume_profile", "true").lower() == "true",
+            speed=float(get("speed", 1.0)),
+            seed=int(seed) if seed else None,
+        )
+
+    @property
+    def elapsed(self) -> float:
+        """Simulated seconds since the start."""
+        return self.steps * self.dt
+
+    def _phase(self, t: float) -> Optional[Phase]:
+        for index, phase in enumerate(self.phases):
+            if phase.start <= t < phase.end:
+                if index not in self._started_phases:
+                    self._started_phases.add(index)
+                    if phase.gap:
+                        self.log_prices += self.rng.normal(0.0, phase.gap, len(self.log_prices))
+                return phase
+        return None
+
+    def step(self) -> Union[MarketEvent, MarketEventBatch, None]:
+        """Advances simulated time by one step and returns its ticks, if any."""
+        t = self.elapsed
+        self.steps += 1
+        phase = self._phase(t)
+        if phase is not None and phase.halted:
+            return None
+
+        rng, dt, n_tickers = self.rng, self.dt, len(self.log_prices)
+        rate_mult = intraday_profile(self.session_offset + t) if self.profile else 1.0
+        sigma = self.sigma * (phase.volatility if phase else 1.0)
+        drift = (self.mu - 0.5 * sigma * sigma + (phase.drift if phase else 0.0)) * dt
+        self.log_prices += drift + sigma * math.sqrt(dt) * rng.standard_normal(n_tickers)
+        jumped = rng.random(n_tickers) < self.jump_rate * dt
+        if jumped.any():
+            self.log_prices[jumped] += rng.normal(0.0, self.jump_std, int(jumped.sum()))
+
+        count = rng.poisson(self.rate * rate_mult * (phase.rate if phase else 1.0) * dt)
+        if count == 0:
+            return None
+        ids = rng.choice(n_tickers, count, p=self.weights)
+        prices = np.round(np.exp(self.log_prices[ids]) / self.tick_size) * self.tick_size
+        volumes = np.maximum(1, rng.lognormal(math.log(self.mean_volume * rate_mult), 1.0, count)).astype(np.int64)
+        ts_ns = self.start_ns + int(t * 1e9)
+        self.ticks += count
+        if count == 1:
+            return MarketEvent(self.symbols[ids[0]], round(float(prices[0]), 2), int(volumes[0]), ts_ns)
+        present, ticker_ids = np.unique(ids, return_inverse=True)
+        return MarketEventBatch(
+            symbols=tuple(self.symbols[i] for i in present.tolist()),
+            ticker_ids=ticker_ids.astype(np.int32),
+            prices=prices.round(2),
+            volumes=volumes,
+            ts_ns=ts_ns,
+        )
+
+    async def run(self, bus, duration: Optional[float] = None) -> None:
+        """
+        Publishes steps onto `bus`, paced to `speed` times real time
+        (`speed=0` runs as fast as the consumers allow). Stops after
+        `duration` simulated seconds, or runs until cancelled.
+        """
+        logger.info(f"Market simulator: {len(self.symbols)} tickers at {self.rate:g} ticks/s "
+                    f"(seed={self.seed}, phases={len(self.phases)}, speed={self.speed:g}x)")
+        started = time.monotonic()
+        while duration is None or self.elapsed < duration:
+            event = self.step()
+            if event is not None:
+                await bus.put(event)
+            delay = started + self.elapsed / self.speed - time.monotonic() if self.speed > 0 else 0.0
+            if delay < 0:
+                self.max_lag = max(self.max_lag, -delay)
+            # Always yield so consumers get to run even when we are behind
+            await asyncio.sleep(max(delay, 0.0))
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "simulated_seconds": self.elapsed,
+            "ticks": self.ticks,
+            "ticks_per_simulated_second": self.ticks / self.elapsed if self.elapsed else 0.0,
+            "max_lag_ms": self.max_lag * 1000.0,
+        }
@@ -0,0 +1,209 @@
+import logging
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from ..core.event_types import DepthEvent
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DEPTH = 20
+
+
+class BookSide:
+    """
+    One side of a book: up to `depth` levels in preallocated arrays, best
+    level first. Levels are kept sorted on `keys` (the price, negated for
+    bids) so a price is found with one `searchsorted`; inserting or
+    removing a level shifts the levels behind it. Total size and notional
+    are kept as running sums, so depth-weighted figures need no scan.
+    """
+
+    def __init__(self, depth: int, is_bid: bool):
+        self.depth = depth
+        self.sign = -1.0 if is_bid else 1.0
+        self.keys = np.zeros(depth, dtype=np.float64)
+        self.prices = np.zeros(depth, dtype=np.float64)
+        self.sizes = np.zeros(depth, dtype=np.int64)
+        self.count = 0
+        self.total_size = 0
+        self.total_notional = 0.0
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def best(self) -> Optional[float]:
+        return float(self.prices[0]) if self.count else None
+
+    def set(self, price: float, size: int) -> None:
+        """Sets the size at `price`; a size of 0 removes the level."""
+        count = self.count
+        key = self.sign * price
+        index = int(self.keys[:count].searchsorted(key))
+        if index < count and self.keys[index] == key:
+            old = int(self.sizes[index])
+            if size:
+                self.sizes[index] = size
+                self.total_size += size - old
+                self.total_notional += (size - old) * price
+            else:
+                for array in (self.keys, self.prices, self.sizes):
+                    array[index:count - 1] = array[index + 1:count]
+                self.count = count - 1
+                self.total_size -= old
+                self.total_notional -= old * price
+            return
+        if not size or index >= self.depth:
+            return
+        if count == self.depth:
+            # Full: the worst level falls off the end
+            count -= 1
+            self.total_size -= int(self.sizes[count])
+            self.total_notional -= int(self.sizes[count]) * float(self.prices[count])
+        for array in (self.keys, self.prices, self.sizes):
+            array[index + 1:count + 1] = array[index:count]
+        self.keys[index] = key
+        self.prices[index] = price
+        self.sizes[index] = size
+        self.count = count + 1
+        self.total_size += size
+        self.total_notional += size * price
+
+    def replace(self, levels: Iterable[Tuple[float, int]]) -> None:
+        """Replaces the side with `levels`, in any order; zero sizes are ignored."""
+        # Snapshots are a few dozen levels: sorting them in Python and
+        # assigning once is cheaper than building intermediate arrays
+        sign = self.sign
+        ordered = sorted((sign * price, price, size) for price, size in levels if size)[:self.depth]
+        count = len(ordered)
+        if count:
+            keys, prices, sizes = zip(*ordered)
+            self.keys[:count] = keys
+            self.prices[:count] = prices
+            self.sizes[:count] = sizes
+            self.total_size = int(sum(sizes))
+            self.total_notional = float(sum(price * size for price, size in zip(prices, sizes)))
+        else:
+            self.total_size = 0
+            self.total_notional = 0.0
+        self.count = count
+
+    def vwap(self, levels: Optional[int] = None) -> Optional[float]:
+        """Size-weighted average price over the best `levels` levels (all by default)."""
+        if levels is None:
+            return self.total_notional / self.total_size if self.total_size else None
+        n = min(levels, self.count)
+        size = int(self.sizes[:n].sum())
+        return float(self.prices[:n] @ self.sizes[:n]) / size if size else None
+
+    def size(self, levels: Optional[int] = None) -> int:
+        return self.total_size if levels is None else int(self.sizes[:min(levels, self.count)].sum())
+
+
+class OrderBook:
+    """
+    L2 order book for one ticker, holding up to `depth` levels per side.
+    Best bid/ask, spread, mid, depth-weighted mid and imbalance over the
+    whole book are O(1). With `levels` they cover only the best levels.
+    Updates better than the worst kept level push that level out. Worse
+    updates are ignored until levels free up.
+    """
+
+    def __init__(self, ticker: str, depth: int = DEFAULT_DEPTH):
+        self.ticker = ticker
+        self.depth = depth
+        self.bids = BookSide(depth, is_bid=True)
+        self.asks = BookSide(depth, is_bid=False)
+        self.ts_ns = 0
+        self.updates = 0
+
+    def apply(self, event: DepthEvent) -> None:
+        if event.snapshot:
+            self.bids.replace(event.bids)
+            self.asks.replace(event.asks)
+        else:
+            for price, size in event.bids:
+                self.bids.set(price, size)
+            for price, size in event.asks:
+                self.asks.set(price, size)
+        self.ts_ns = event.ts_ns
+        self.updates += 1
+
+    @property
+    def best_bid(self) -> Optional[float]:
+        return self.bids.best
+
+    @property
+    def best_ask(self) -> Optional[float]:
+        return self.asks.best
+
+    @property
+    def spread(self) -> Optional[float]:
+        if not (self.bids.count and self.asks.count):
+            return None
+        return float(self.asks.prices[0] - self.bids.prices[0])
+
+    @property
+    def mid(self) -> Optional[float]:
+        if not (self.bids.count and self.asks.count):
+            return None
+        return float(self.asks.prices[0] + self.bids.prices[0]) / 2
+
+    def weighted_mid(self, levels: Optional[int] = None) -> Optional[float]:
+        """
+        Depth-weighted mid: each side's VWAP weighted by the size on the
+        other side, so it leans towards the thinner side (with levels=1
+        this is the microprice).
+        """
+        bid, ask = self.bids.vwap(levels), self.asks.vwap(levels)
+        if bid is None or ask is None:
+            return None
+        bid_size, ask_size = self.bids.size(levels), self.asks.size(levels)
+        return (bid * ask_size + ask * bid_size) / (bid_size + ask_size)
+
+    def imbalance(self, levels: Optional[int] = None) -> float:
+        """(bid size - ask size) / total size, in [-1, 1]; 0 for an empty book."""
+        bid_size, ask_size = self.bids.size(levels), self.asks.size(levels)
+        total = bid_size + ask_size
+        return (bid_size - ask_size) / total if total else 0.0
+
+    def fill_price(self, action: str, quantity: int) -> Optional[float]:
+        """
+        Average price for taking `quantity` from the book now (BUY walks
+        the asks, SELL the bids), or None if the book is not that deep.
+        """
+        side = self.asks if action == "BUY" else self.bids
+        sizes = side.sizes[:side.count]
+        filled = np.minimum(sizes, np.maximum(quantity - (np.cumsum(sizes) - sizes), 0))
+        if filled.sum() < quantity:
+            return None
+        return float(side.prices[:side.count] @ filled) / quantity
+
+    def snapshot(self) -> Dict[str, object]:
+        return {
+            "ticker": self.ticker,
+            "bids": list(zip(self.bids.prices[:self.bids.count].tolist(), self.bids.sizes[:self.bids.count].tolist())),
+            "asks": list(zip(self.asks.prices[:self.asks.count].tolist(), self.asks.sizes[:self.asks.count].tolist())),
+        }
+
+
+class OrderBooks:
+    """Order books by ticker, created on the first DepthEvent for a ticker."""
+
+    def __init__(self, depth: int = DEFAULT_DEPTH):
+        self.depth = depth
+        self.books: Dict[str, OrderBook] = {}
+
+    def __len__(self) -> int:
+        return len(self.books)
+
+    def get(self, ticker: str) -> Optional[OrderBook]:
+        return self.books.get(ticker)
+
+    def on_event(self, event: DepthEvent) -> OrderBook:
+        book = self.books.get(event.ticker)
+        if book is None:
+            book = self.books[event.ticker] = OrderBook(event.ticker, self.depth)
+        book.apply(event)
+        return book
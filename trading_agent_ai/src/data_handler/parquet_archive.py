@@ -0,0 +1,265 @@
+import itertools
+import logging
+import time
+import uuid
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+from ..core.config_loader import ConfigLoader
+from ..core.database import TimeLike, to_ns
+
+logger = logging.getLogger(__name__)
+
+_DAY_NS = 86400 * 1_000_000_000
+
+TICK_COLUMNS = ("ticker", "ts", "price", "volume")
+BAR_COLUMNS = ("ticker", "ts", "open", "high", "low", "close", "volume")
+
+
+# Part file names: write time, then a per-process id and sequence number,
+# so names never collide and sort in write order within a process
+_WRITER_ID = uuid.uuid4().hex[:12]
+_PART_SEQUENCE = itertools.count()
+
+
+def _part_name() -> str:
+    return f"part-{time.time_ns():020d}-{_WRITER_ID}-{next(_PART_SEQUENCE):08d}.parquet"
+
+
+class ParquetArchive:
+    """
+    Columnar archive of ticks and bars, one Parquet dataset per kind
+    ('ticks', 'bars_1m', ...) laid out as
+
+        <root>/<dataset>/ticker=<TICKER>/date=<YYYY-MM-DD>/part-<ns>-<writer>-<seq>.parquet
+
+    Every write adds a new part file sorted by `ts`; `compact()` merges a
+    partition's parts into one. Reads prune whole partitions by ticker and
+    date, skip row groups by their `ts` statistics and only decode the
+    requested columns. Dates follow the exchange calendar day
+    (`day_offset_minutes` east of UTC).
+    """
+
+    def __init__(self, root: Union[str, Path], day_offset_minutes: int = 330, compression: str = "zstd",
+                 row_group_size: int = 128 * 1024):
+        self.root = Path(root)
+        self.day_offset_ns = day_offset_minutes * 60 * 1_000_000_000
+        self.compression = compression
+        self.row_group_size = row_group_size
+
+    @classmethod
+    def from_config(cls, config: ConfigLoader) -> "ParquetArchive":
+        return cls(
+            config.get("Archive", "root", fallback="local_database/archive"),
+            day_offset_minutes=int(config.get("Database", "bar_day_offset_minutes", fallback=330)),
+            compression=config.get("Archive", "compression", fallback="zstd"),
+        )
+
+    def _date(self, ts_ns: int) -> str:
+        import numpy as np
+
+        return str(np.datetime64((ts_ns + self.day_offset_ns) // _DAY_NS, "D"))
+
+    def day_start_ns(self, date: str) -> int:
+        """Epoch ns of exchange midnight starting the given YYYY-MM-DD."""
+        import numpy as np
+
+        return int(np.datetime64(date, "D").astype("int64")) * _DAY_NS - self.day_offset_ns
+
+    def _partition_dir(self, dataset: str, ticker: str, date: str) -> Path:
+        return self.root / dataset / f"ticker={ticker}" / f"date={date}"
+
+    # --- Writing ---
+
+    def write(self, dataset: str, data) -> int:
+        """
+        Appends rows to a dataset. `data` is a pyarrow Table, a DataFrame or
+        a dict of columns, with a string 'ticker' column and an int64 epoch-ns
+        'ts' column. Returns the number of rows written.
+        """
+        import numpy as np
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = data if isinstance(data, pa.Table) else (
+            pa.Table.from_pandas(data, preserve_index=False) if hasattr(data, "to_parquet")
+            else pa.table(data)
+        )
+        if table.num_rows == 0:
+            return 0
+        table = table.sort_by([("ticker", "ascending"), ("ts", "ascending")])
+
+        tickers = table.column("ticker").to_numpy(zero_copy_only=False)
+        days = (table.column("ts").to_numpy() + self.day_offset_ns) // _DAY_NS
+        boundaries = np.flatnonzero((tickers[1:] != tickers[:-1]) | (days[1:] != days[:-1])) + 1
+        starts = np.concatenate(([0], boundaries))
+        ends = np.concatenate((boundaries, [table.num_rows]))
+
+        payload = table.drop_columns(["ticker"])
+        basename = _part_name()
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            date = str(np.datetime64(int(days[start]), "D"))
+            directory = self._partition_dir(dataset, str(tickers[start]), date)
+            directory.mkdir(parents=True, exist_ok=True)
+            pq.write_table(
+                payload.slice(start, end - start), directory / basename,
+                compression=self.compression, row_group_size=self.row_group_size
+            )
+        logger.debug(f"Archived {table.num_rows} rows into {len(starts)} partitions of {dataset}.")
+        return table.num_rows
+
+    def write_ticks(self, ticks: Sequence[Tuple[str, int, float, int]]) -> int:
+        """Appends (ticker, ts_ns, price, volume) ticks to the 'ticks' dataset."""
+        import pyarrow as pa
+
+        if not ticks:
+            return 0
+        tickers, ts, prices, volumes = zip(*ticks)
+        return self.write("ticks", pa.table({
+            "ticker": pa.array(tickers, pa.string()),
+            "ts": pa.array(ts, pa.int64()),
+            "price": pa.array(prices, pa.float64()),
+            "volume": pa.array(volumes, pa.int64()),
+        }))
+
+    def write_bars(self, interval: str, frame, ticker: Optional[str] = None) -> int:
+        """
+        Appends OHLCV bars to 'bars_<interval>'. `frame` is a DataFrame with
+        open/high/low/close/volume columns and either a DatetimeIndex or a
+        'ts' column (epoch ns); `ticker` fills in a missing ticker column.
+        """
+        import pandas as pd
+
+        frame = frame.copy()
+        if "ts" not in frame.columns:
+            index = pd.DatetimeIndex(frame.index)
+            if index.tz is None:
+                index = index.tz_localize("UTC")
+            frame["ts"] = index.as_unit("ns").asi8
+        if "ticker" not in frame.columns:
+            if ticker is None:
+                raise ValueError("Bars need a 'ticker' column or the ticker argument.")
+            frame["ticker"] = ticker
+        frame = frame[list(BAR_COLUMNS)].astype({"ts": "int64", "volume": "int64"})
+        return self.write(f"bars_{interval}", frame)
+
+    # --- Reading ---
+
+    def partitions(self, dataset: str, ticker: Optional[str] = None) -> List[Tuple[str, str]]:
+        """Lists the (ticker, date) partitions of a dataset, optionally for one ticker."""
+        return sorted(
+            (path.parent.name.split("=", 1)[1], path.name.split("=", 1)[1])
+            for path in (self.root / dataset).glob(f"ticker={ticker or '*'}/date=*")
+        )
+
+    def _dataset(self, dataset: str, memory_map: bool):
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        import pyarrow.fs as pafs
+
+        partitioning = ds.partitioning(pa.schema([("ticker", pa.string()), ("date", pa.string())]), flavor="hive")
+        return ds.dataset(
+            str(self.root / dataset), format="parquet", partitioning=partitioning,
+            filesystem=pafs.LocalFileSystem(use_mmap=memory_map)
+        )
+
+    def read(self, dataset: str, tickers: Optional[Iterable[str]] = None, start: Optional[TimeLike] = None,
+             end: Optional[TimeLike] = None, columns: Optional[Sequence[str]] = None,
+             memory_map: bool = True, as_frame: bool = True):
+        """
+        Reads rows with start <= ts < end for the given tickers, sorted by
+        ticker and ts. Ticker and date filters prune partitions before any
+        file is opened; the ts filter skips row groups by their statistics.
+        Returns a DataFrame, or a pyarrow Table with as_frame=False.
+        """
+        import pyarrow.dataset as ds
+
+        if not (self.root / dataset).exists():
+            raise FileNotFoundError(f"No archived dataset '{dataset}' under {self.root}.")
+
+        condition = None
+
+        def add(expression):
+            nonlocal condition
+            condition = expression if condition is None else condition & expression
+
+        if tickers is not None:
+            tickers = [tickers] if isinstance(tickers, str) else list(tickers)
+            add(ds.field("ticker").isin(tickers))
+        if start is not None:
+            start_ns = to_ns(start)
+            add(ds.field("date") >= self._date(start_ns))
+            add(ds.field("ts") >= start_ns)
+        if end is not None:
+            end_ns = to_ns(end)
+            add(ds.field("date") <= self._date(end_ns - 1))
+            add(ds.field("ts") < end_ns)
+
+        wanted = None
+        if columns is not None:
+            wanted = list(dict.fromkeys(["ticker", "ts", *columns]))
+        table = self._dataset(dataset, memory_map).to_table(columns=wanted, filter=condition)
+        if wanted is None:
+            table = table.select(["ticker", *(name for name in table.column_names if name not in ("ticker", "date"))])
+        table = table.sort_by([("ticker", "ascending"), ("ts", "ascending")])
+        if columns is not None:
+            table = table.select(list(columns))
+        return table.to_pandas() if as_frame else table
+
+    def read_bars(self, ticker: str, interval: str, start: Optional[TimeLike] = None,
+                  end: Optional[TimeLike] = None, columns: Optional[Sequence[str]] = None):
+        """Bars for one ticker as a DataFrame indexed by UTC timestamp, like Database.get_bars."""
+        import pandas as pd
+
+        columns = list(columns or BAR_COLUMNS[2:])
+        frame = self.read(f"bars_{interval}", [ticker], start, end, columns=["ts", *columns])
+        index = pd.DatetimeIndex(pd.to_datetime(frame.pop("ts"), unit="ns", utc=True), name="timestamp")
+        return frame.set_index(index)
+
+    # --- Maintenance ---
+
+    def compact(self, dataset: str, before_date: Optional[str] = None, ticker: Optional[str] = None) -> int:
+        """
+        Merges every partition that has more than one part file into a
+        single file sorted by ts, optionally only dates before `before_date`
+        (so today's partition keeps taking appends). In bar datasets a bar
+        written again (e.g. a re-downloaded range) replaces the older copy.
+        `ticker` limits compaction to one ticker's partitions. Returns the
+        number of partitions compacted.
+        """
+        import numpy as np
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        compacted = 0
+        for partition_ticker, date in self.partitions(dataset, ticker):
+            if before_date is not None and date >= before_date:
+                continue
+            directory = self._partition_dir(dataset, partition_ticker, date)
+            parts = sorted(directory.glob("part-*.parquet"))
+            if len(parts) < 2:
+                continue
+            # Part names sort in write order, and a stable sort keeps that
+            # order among equal timestamps
+            table = pa.concat_tables(pq.read_table(part) for part in parts)
+            ts = table.column("ts").to_numpy()
+            order = np.argsort(ts, kind="stable")
+            if dataset != "ticks":
+                ordered = ts[order]
+                order = order[np.append(ordered[1:] != ordered[:-1], True)]
+            table = table.take(order)
+            target = directory / _part_name()
+            # Dataset discovery skips '_'-prefixed files, so a crash mid-write
+            # never exposes a partial file to readers
+            tmp = directory / f"_{target.name}.tmp"
+            pq.write_table(table, tmp, compression=self.compression, row_group_size=self.row_group_size)
+            tmp.rename(target)
+            for part in parts:
+                part.unlink()
+            compacted += 1
+        if compacted:
+            logger.info(f"Compacted {compacted} partitions of {dataset}.")
+        return compacted
+
+    def today(self) -> str:
+        return self._date(time.time_ns())
@@ -0,0 +1,198 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Iterable, Optional, Sequence, Tuple
+
+from ..core.config_loader import ConfigLoader
+from ..core.metrics import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+# Highest priority first
+LANES = ("order", "status", "account", "historical")
+
+
+class TokenBucket:
+    """`limit` requests per `period` seconds: refills continuously, holding at most `limit` tokens."""
+
+    def __init__(self, limit: int, period: float):
+        self.limit = limit
+        self.period = period
+        self.rate = limit / period
+        self.tokens = float(limit)
+        self.updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(float(self.limit), self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, needed: float) -> float:
+        """Seconds until `needed` tokens are available (0 if they already are)."""
+        return max(0.0, (needed - self.tokens) / self.rate)
+
+
+class _Ticket:
+    __slots__ = ("loop", "future", "enqueued_ns", "granted")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.future = loop.create_future()
+        self.enqueued_ns = time.monotonic_ns()
+        # Set once a token has been taken for this ticket
+        self.granted = False
+
+
+class RequestScheduler:
+    """
+    Spaces all broker REST requests to stay within the broker's rate limits
+    (e.g. 10 per second and 250 per minute), whatever the caller. A
+    request needs one token from every bucket. When none is free it waits
+    in its lane's queue instead of being rejected. The highest-priority
+    waiting lane always goes first (order > status > account > historical).
+    The last `order_reserve` tokens of every bucket are held back for the
+    order lane, so a bulk backfill cannot hold up a live order.
+
+    Waiters are woken on their own event loop, so the async API and the
+    sync API's background loop can share one scheduler. Queue wait per
+    lane is recorded in `wait`.
+    """
+
+    def __init__(self, limits: Iterable[Tuple[int, float]] = ((10, 1.0), (250, 60.0)), order_reserve: int = 2,
+                 lanes: Sequence[str] = LANES):
+        self.buckets = [TokenBucket(limit, period) for limit, period in limits if limit > 0]
+        self.lanes = tuple(lanes)
+        # Tokens each lane must leave in every bucket
+        self.reserve = {lane: 0 if index == 0 else order_reserve for index, lane in enumerate(self.lanes)}
+        self.queues: Dict[str, Deque[_Ticket]] = {lane: deque() for lane in self.lanes}
+        self.wait = {lane: LatencyHistogram() for lane in self.lanes}
+        self.granted = {lane: 0 for lane in self.lanes}
+        self._lock = threading.Lock()
+        self._wake_at: Optional[float] = None
+
+    @classmethod
+    def from_config(cls, config: ConfigLoader) -> "RequestScheduler":
+        return cls(
+            limits=(
+                (int(config.get("API", "requests_per_second", fallback=10)), 1.0),
+                (int(config.get("API", "requests_per_minute", fallback=250)), 60.0),
+            ),
+            order_reserve=int(config.get("API", "order_reserve", fallback=2)),
+        )
+
+    def _delay(self, lane: str) -> float:
+        needed = 1.0 + self.reserve[lane]
+        return max((bucket.delay(needed) for bucket in self.buckets), default=0.0)
+
+    def _take(self) -> None:
+        for bucket in self.buckets:
+            bucket.tokens -= 1.0
+
+    def _give_back(self) -> None:
+        for bucket in self.buckets:
+            bucket.tokens = min(float(bucket.limit), bucket.tokens + 1.0)
+
+    def _record(self, lane: str, waited_ns: int) -> None:
+        self.wait[lane].record(waited_ns)
+        self.granted[lane] += 1
+
+    async def acquire(self, lane: str) -> None:
+        """Waits until a request in `lane` may be sent."""
+        if lane not in self.queues:
+            raise ValueError(f"Unknown request lane '{lane}'; expected one of {list(self.lanes)}.")
+        with self._lock:
+            now = time.monotonic()
+            for bucket in self.buckets:
+                bucket.refill(now)
+            # Queued requests were there first; only an idle scheduler grants immediately
+            if not any(self.queues.values()) and self._delay(lane) == 0.0:
+                self._take()
+                self._record(lane, 0)
+                return
+            ticket = _Ticket(asyncio.get_running_loop())
+            self.queues[lane].append(ticket)
+            self._pump_locked(now)
+        try:
+            await ticket.future
+        except asyncio.CancelledError:
+            with self._lock:
+                # Cancelled between the grant and the wake-up: the request is
+                # never sent, so its token goes to the next waiter
+                if ticket.granted:
+                    self._give_back()
+                    self.granted[lane] -= 1
+                    self._pump_locked(time.monotonic())
+            raise
+
+    def _pump(self) -> None:
+        with self._lock:
+            self._wake_at = None
+            self._pump_locked(time.monotonic())
+
+    def _pump_locked(self, now: float) -> None:
+        """Grants queued tickets while tokens last, then schedules the next check."""
+        for bucket in self.buckets:
+            bucket.refill(now)
+        while True:
+            lane = next((lane for lane in self.lanes if self._head(lane) is not None), None)
+            if lane is None:
+                return
+            delay = self._delay(lane)
+            if delay > 0.0:
+                break
+            ticket = self.queues[lane].popleft()
+            try:
+                ticket.loop.call_soon_threadsafe(_grant, ticket.future)
+            except RuntimeError:  # the caller's loop has been closed
+                continue
+            ticket.granted = True
+            self._take()
+            self._record(lane, time.monotonic_ns() - ticket.enqueued_ns)
+        wake_at = now + delay
+        # A wake-up that is overdue was lost with its loop
+        if self._wake_at is None or wake_at < self._wake_at or now > self._wake_at + 1.0:
+            self._wake_at = wake_at if self._arm(lane, delay) else None
+
+    def _arm(self, lane: str, delay: float) -> bool:
+        """Schedules the next check on a waiting caller's loop, starting with `lane`'s first."""
+        for queue in (self.queues[lane], *self.queues.values()):
+            while queue:
+                try:
+                    queue[0].loop.call_soon_threadsafe(self._schedule, delay)
+                    return True
+                except RuntimeError:
+                    # Closed loop: nothing can await this ticket any more
+                    queue.popleft()
+        return False
+
+    def _schedule(self, delay: float) -> None:
+        asyncio.get_running_loop().call_later(delay, self._pump)
+
+    def _head(self, lane: str) -> Optional[_Ticket]:
+        queue = self.queues[lane]
+        # Drop requests whose caller gave up
+        while queue and queue[0].future.done():
+            queue.popleft()
+        return queue[0] if queue else None
+
+    def stats(self) -> Dict[str, Dict[str, object]]:
+        return {
+            lane: {
+                "queued": len(self.queues[lane]),
+                "requests": self.granted[lane],
+                "wait_ms": self.wait[lane].summary(1e6),
+            }
+            for lane in self.lanes
+        }
+
+    def log_stats(self) -> None:
+        for lane, stats in self.stats().items():
+            wait = stats["wait_ms"]
+            logger.info(f"[api] {lane}: requests={stats['requests']} queued={stats['queued']} "
+                        f"wait p50/p99/max={wait['p50']}/{wait['p99']}/{wait['max']}ms")
+
+
+def _grant(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
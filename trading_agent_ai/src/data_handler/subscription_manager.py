@@ -0,0 +1,159 @@
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from ..core.config_loader import ConfigLoader
+from ..core.event_bus import event_bus
+from .websocket_manager import WebsocketManager
+
+logger = logging.getLogger(__name__)
+
+
+class SubscriptionManager:
+    """
+    Shards a watchlist across up to `max_connections` websockets, each
+    holding at most `max_instruments_per_connection` instruments (brokers
+    cap both). New instruments go to the least loaded connection with
+    room, so a dropped connection affects as few instruments as possible.
+    Existing instruments never move, so a watchlist change only sends
+    (un)subscribe requests for the difference. Every connection publishes
+    onto the same bus and reconnects on its own, without touching the
+    others. Instruments that fit nowhere wait in `pending` until a slot
+    frees up. With an `api_client`, each connection backfills the bars it
+    missed while reconnecting.
+    """
+
+    def __init__(self, config: ConfigLoader, bus=event_bus,
+                 manager_factory: Callable[..., WebsocketManager] = WebsocketManager, api_client=None):
+        self.config = config
+        self.bus = bus
+        self.api_client = api_client
+        self.manager_factory = manager_factory
+        self.max_connections = int(config.get("Feed", "max_connections", fallback=1))
+        self.max_per_connection = int(config.get("Feed", "max_instruments_per_connection", fallback=1000))
+        self.stats_log_interval = float(config.get("Feed", "stats_log_interval_seconds", fallback=60))
+        self.shards: List[WebsocketManager] = []
+        self.assignment: Dict[str, WebsocketManager] = {}
+        self.load: Dict[WebsocketManager, int] = {}
+        self.pending: List[str] = []
+        self.running = False
+        self._tasks: Dict[WebsocketManager, asyncio.Task] = {}
+        self._monitor_task: Optional[asyncio.Task] = None
+        self._last_sample: Dict[WebsocketManager, tuple] = {}
+
+    @property
+    def watchlist(self) -> List[str]:
+        return list(self.assignment) + self.pending
+
+    def _new_shard(self) -> WebsocketManager:
+        index = len(self.shards)
+        shard = self.manager_factory(self.config, name=f"feed-{index}", bus=self.bus, mock_feed=index == 0,
+                                     api_client=self.api_client)
+        self.shards.append(shard)
+        self.load[shard] = 0
+        if self.running:
+            self._start(shard)
+        return shard
+
+    def _shard_with_room(self) -> Optional[WebsocketManager]:
+        if len(self.shards) < self.max_connections and all(self.load.values()):
+            return self._new_shard()
+        open_shards = [s for s in self.shards if self.load[s] < self.max_per_connection]
+        return min(open_shards, key=self.load.__getitem__) if open_shards else None
+
+    async def set_watchlist(self, tickers: Iterable[str]) -> None:
+        """Subscribes and unsubscribes so that exactly `tickers` are streamed."""
+        wanted = list(dict.fromkeys(tickers))
+        wanted_set = set(wanted)
+        await self.remove([t for t in self.watchlist if t not in wanted_set])
+        await self.add(wanted)
+
+    async def add(self, tickers: Iterable[str]) -> None:
+        new = [t for t in dict.fromkeys(list(self.pending) + list(tickers)) if t not in self.assignment]
+        self.pending = []
+        by_shard: Dict[WebsocketManager, List[str]] = {}
+        for ticker in new:
+            shard = self._shard_with_room()
+            if shard is None:
+                self.pending.append(ticker)
+                continue
+            self.assignment[ticker] = shard
+            self.load[shard] += 1
+            by_shard.setdefault(shard, []).append(ticker)
+        for shard, shard_tickers in by_shard.items():
+            await shard.subscribe(shard_tickers)
+        if self.pending:
+            logger.warning(f"{len(self.pending)} instruments exceed the feed capacity "
+                           f"({self.max_connections} x {self.max_per_connection}) and are not streamed")
+
+    async def remove(self, tickers: Iterable[str]) -> None:
+        removed = set(tickers)
+        self.pending = [t for t in self.pending if t not in removed]
+        by_shard: Dict[WebsocketManager, List[str]] = {}
+        for ticker in removed:
+            shard = self.assignment.pop(ticker, None)
+            if shard is not None:
+                self.load[shard] -= 1
+                by_shard.setdefault(shard, []).append(ticker)
+        for shard, shard_tickers in by_shard.items():
+            await shard.unsubscribe(shard_tickers)
+        if by_shard and self.pending:
+            await self.add([])
+
+    def _start(self, shard: WebsocketManager) -> None:
+        self._tasks[shard] = asyncio.create_task(shard.run())
+
+    async def start(self, watchlist: Iterable[str] = ()) -> None:
+        """Opens the connections; with an empty watchlist one unsubscribed connection is opened."""
+        await self.set_watchlist(watchlist)
+        if not self.shards:
+            self._new_shard()
+        self.running = True
+        for shard in self.shards:
+            self._start(shard)
+        if self.stats_log_interval > 0:
+            self._monitor_task = asyncio.create_task(self._monitor())
+
+    async def stop(self) -> None:
+        self.running = False
+        if self._monitor_task:
+            self._monitor_task.cancel()
+        for shard in self.shards:
+            await shard.close()
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+
+    def is_connected(self) -> bool:
+        return any(shard.connected or shard.mock_mode for shard in self.shards)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-connection counters plus tick throughput since the previous call."""
+        now = time.monotonic()
+        stats = {}
+        for shard in self.shards:
+            snapshot = shard.stats()
+            last_time, last_ticks = self._last_sample.get(shard, (None, 0))
+            elapsed = now - last_time if last_time is not None else 0.0
+            snapshot["ticks_per_second"] = round((shard.ticks - last_ticks) / elapsed, 1) if elapsed else 0.0
+            self._last_sample[shard] = (now, shard.ticks)
+            stats[shard.name] = snapshot
+        return stats
+
+    def log_stats(self) -> None:
+        for name, stats in self.stats().items():
+            lag, recovery = stats["lag_us"], stats["recovery_ms"]
+            logger.info(
+                f"[feed] {name}: connected={stats['connected']} instruments={stats['instruments']} "
+                f"ticks/s={stats['ticks_per_second']} reconnects={stats['reconnects']} "
+                f"decode_errors={stats['decode_errors']} lag p50/p99/max={lag['p50']}/{lag['p99']}/{lag['max']}us "
+                f"recovery p50/max={recovery['p50']}/{recovery['max']}ms backfilled_bars={stats['backfilled_bars']} "
+                f"backfill_errors={stats['backfill_errors']}"
+            )
+
+    async def _monitor(self) -> None:
+        self.stats()
+        while True:
+            await asyncio.sleep(self.stats_log_interval)
+            self.log_stats()
@@ -0,0 +1,134 @@
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+from ..core.config_loader import ConfigLoader
+from ..core.database import Database
+from ..core.event_bus import event_bus
+from ..core.event_types import MarketEvent, MarketEventBatch
+from .parquet_archive import ParquetArchive
+
+logger = logging.getLogger(__name__)
+
+
+class TickRecorder:
+    """
+    Records every market tick into the Database tick/bar store.
+    Ticks are buffered and handed to `Database.save_ticks` in batches, so
+    bar roll-ups happen once per batch. The subscription is lossless: the
+    recorder wants every tick, not just the latest one per ticker.
+    With an `archive`, ticks are also appended to the Parquet archive in
+    larger, less frequent batches, and finished days are compacted.
+    """
+
+    def __init__(self, db: Database, bus=event_bus, batch_size: int = 1000, flush_interval: float = 1.0,
+                 retention_days: Optional[Dict[str, float]] = None, retention_interval: float = 3600.0,
+                 archive: Optional[ParquetArchive] = None, archive_interval: float = 60.0):
+        self.db = db
+        self.bus = bus
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retention_days = retention_days or {}
+        self.retention_interval = retention_interval
+        self.archive = archive
+        self.archive_interval = archive_interval
+        self.recorded = 0
+        self.subscription = None
+        self._buffer: List[Tuple[str, int, float, int]] = []
+        self._archive_buffer: List[Tuple[str, int, float, int]] = []
+        self._tasks: List[asyncio.Task] = []
+
+    @classmethod
+    def from_config(cls, config: ConfigLoader, db: Database, bus=event_bus) -> "TickRecorder":
+        retention = {
+            "ticks": float(config.get("Database", "tick_retention_days", fallback=7)),
+            "1s": float(config.get("Database", "bar_1s_retention_days", fallback=30)),
+            "1m": float(config.get("Database", "bar_1m_retention_days", fallback=365)),
+        }
+        archive = None
+        if config.get("Archive", "enabled", fallback="false").lower() == "true":
+            archive = ParquetArchive.from_config(config)
+        return cls(
+            db, bus,
+            batch_size=int(config.get("Database", "tick_batch_size", fallback=1000)),
+            retention_days=retention,
+            archive=archive,
+            archive_interval=float(config.get("Archive", "flush_interval_seconds", fallback=60)),
+        )
+
+    def on_event(self, event) -> None:
+        if isinstance(event, MarketEventBatch):
+            symbols = event.symbols
+            ts_ns = event.ts_ns
+            for ticker_id, price, volume in zip(event.ticker_ids.tolist(), event.prices.tolist(),
+                                                event.volumes.tolist()):
+                self._buffer.append((symbols[ticker_id], ts_ns, price, volume))
+        else:
+            self._buffer.append((event.ticker, event.ts_ns, event.price, event.volume))
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._buffer:
+            self.db.save_ticks(self._buffer)
+            self.recorded += len(self._buffer)
+            if self.archive is not None:
+                self._archive_buffer.extend(self._buffer)
+            self._buffer = []
+
+    def _take_archive_buffer(self) -> List[Tuple[str, int, float, int]]:
+        rows, self._archive_buffer = self._archive_buffer, []
+        return rows
+
+    def start(self) -> None:
+        self.subscription = self.bus.subscribe("tick_recorder", (MarketEvent, MarketEventBatch))
+        self._tasks = [asyncio.create_task(self._record()), asyncio.create_task(self._maintain())]
+        if self.archive is not None:
+            self._tasks.append(asyncio.create_task(self._archive()))
+        logger.info("Tick recorder started.")
+
+    async def _record(self) -> None:
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                event = await asyncio.wait_for(self.subscription.get(), max(0.0, deadline - time.monotonic()))
+            except asyncio.TimeoutError:
+                event = None
+            if event is not None:
+                try:
+                    self.on_event(event)
+                finally:
+                    self.subscription.task_done()
+            if time.monotonic() >= deadline:
+                self.flush()
+                deadline = time.monotonic() + self.flush_interval
+
+    async def _archive(self) -> None:
+        # Parquet encoding runs off the event loop; fewer, larger part files
+        # keep the archive cheap to scan
+        while True:
+            await asyncio.sleep(self.archive_interval)
+            rows = self._take_archive_buffer()
+            if rows:
+                await asyncio.to_thread(self.archive.write_ticks, rows)
+
+    async def _maintain(self) -> None:
+        while True:
+            if self.retention_days:
+                self.db.apply_retention(self.retention_days)
+            if self.archive is not None:
+                await asyncio.to_thread(self.archive.compact, "ticks", self.archive.today())
+            await asyncio.sleep(self.retention_interval)
+
+    def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        if self.subscription is not None:
+            self.bus.unsubscribe(self.subscription)
+            self.subscription = None
+        self.flush()
+        if self.archive is not None:
+            self.archive.write_ticks(self._take_archive_buffer())
+        logger.info(f"Tick recorder stopped after {self.recorded} ticks.")
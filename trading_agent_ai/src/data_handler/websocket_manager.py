@@ -1,22 +1,77 @@
 import asyncio
-import websockets
 import json
+import websockets
+import websockets.exceptions
 import logging
 import random
-from datetime import datetime
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Union
 
 from ..core.config_loader import ConfigLoader
 from ..core.event_bus import event_bus
-from ..core.event_types import MarketEvent
+from ..core.event_types import BarEvent, DepthEvent, MarketEvent, MarketEventBatch
+from ..core.metrics import LatencyHistogram
+from .feed_decoders import Decoded, FeedDecoder, decoder_from_config, merge_batches
+from .historical_cache import bars_from_response, interval_ns
+from .market_simulator import MarketSimulator
 
 logger = logging.getLogger(__name__)
 
 class WebsocketManager:
-    def __init__(self, config: ConfigLoader):
+    """
+    One market-data websocket. `run()` connects, (re)sends the instrument
+    subscriptions and publishes decoded ticks onto the bus. When the
+    connection drops it reconnects with capped exponential backoff and
+    full jitter, resubscribes, and (given an `api_client`) publishes the
+    bars missed during the outage as synthetic BarEvents, in time order,
+    before reading live frames again. A failed first connect is retried
+    the same way; only with [Broker] demo_mode does the connection fall
+    back to the market simulator instead. Throughput, decode errors, feed lag
+    (receive time minus the frame's exchange timestamp), recovery time and
+    backfilled bars are tracked per connection; see `stats()`.
+    """
+
+    def __init__(self, config: ConfigLoader, decoder: Optional[FeedDecoder] = None, name: str = "feed",
+                 bus=event_bus, mock_feed: bool = True, api_client=None):
         self.config = config
+        self.name = name
+        self.bus = bus
         self.websocket_url = self.config.get("Broker", "websocket_url")
         self.websocket = None
         self.mock_mode = False
+        # Only in demo mode does a failed first connect fall back to the simulator
+        self.demo_mode = self.config.get("Broker", "demo_mode", fallback="false").lower() == "true"
+        # Only one connection should run the simulator when several share a feed
+        self.mock_feed = mock_feed
+        self.simulator = None
+        self.subscribed: Set[str] = set()
+        self.reconnect_delay = float(self.config.get("Feed", "reconnect_delay_seconds", fallback=1.0))
+        self.reconnect_max_delay = float(self.config.get("Feed", "reconnect_max_delay_seconds", fallback=30.0))
+        self.api_client = api_client
+        self.backfill_enabled = self.config.get("Feed", "backfill", fallback="true").lower() == "true"
+        self.backfill_interval = self.config.get("Feed", "backfill_interval", fallback="1minute")
+        self.backfill_concurrency = int(self.config.get("Feed", "backfill_concurrency", fallback=4))
+        self.day_offset = timedelta(minutes=int(self.config.get("Database", "bar_day_offset_minutes", fallback=330)))
+        self.decoder = decoder or decoder_from_config(config)
+        # Frames arriving within the linger window are published as one batch
+        self.batch_linger = int(self.config.get("Feed", "batch_linger_ms", fallback=0)) / 1000.0
+        self.batch_max_ticks = int(self.config.get("Feed", "batch_max_ticks", fallback=5000))
+        self.frames = 0
+        self.ticks = 0
+        self.depth_updates = 0
+        self.decode_errors = 0
+        self.reconnects = 0
+        self.lag = LatencyHistogram()
+        self.recovery = LatencyHistogram()
+        self.backfilled_bars = 0
+        self.backfill_errors = 0
+        self.last_frame_ns = 0
+        self._closing = False
+
+    @property
+    def connected(self) -> bool:
+        return self.websocket is not None
 
     async def connect(self):
         try:
@@ -25,10 +80,86 @@ class WebsocketManager:
             # You might need to send an authentication message here
             # depending on the broker's API
         except Exception as e:
-            logger.warning(f"Failed to connect to WebSocket: {e}")
-            logger.info("Switching to mock mode for testing/development")
-            self.mock_mode = True
-            # Don't raise exception, continue in mock mode
+            logger.warning(f"[{self.name}] Failed to connect to WebSocket: {e}")
+            if self.demo_mode:
+                logger.info("Switching to mock mode for testing/development")
+                self.mock_mode = True
+            # Don't raise: run() retries with backoff outside demo mode
+
+    def subscription_message(self, action: str, tickers: Iterable[str]) -> Any:
+        """Broker-specific (un)subscribe request; `action` is "subscribe" or "unsubscribe"."""
+        return json.dumps({"type": action, "tickers": sorted(tickers)})
+
+    async def subscribe(self, tickers: Iterable[str]) -> None:
+        tickers = set(tickers) - self.subscribed
+        self.subscribed |= tickers
+        await self._send_subscription("subscribe", tickers)
+
+    async def unsubscribe(self, tickers: Iterable[str]) -> None:
+        tickers = set(tickers) & self.subscribed
+        self.subscribed -= tickers
+        await self._send_subscription("unsubscribe", tickers)
+
+    async def _send_subscription(self, action: str, tickers: Set[str]) -> None:
+        # Sent again on every reconnect, so a send that fails here is not lost
+        if not tickers or self.websocket is None:
+            return
+        try:
+            await self.websocket.send(self.subscription_message(action, tickers))
+            logger.debug(f"[{self.name}] {action} {len(tickers)} instruments")
+        except websockets.exceptions.ConnectionClosed:
+            logger.warning(f"[{self.name}] connection closed while sending {action}")
+
+    def decode(self, frame) -> Decoded:
+        """Decodes one frame; a malformed frame is logged and skipped."""
+        self.frames += 1
+        received_ns = time.time_ns()
+        self.last_frame_ns = received_ns
+        try:
+            batch = self.decoder.decode(frame, received_ns)
+        except Exception as e:
+            self.decode_errors += 1
+            logger.warning(f"Failed to decode {self.decoder.name} frame: {e!r}")
+            return None
+        if batch is not None:
+            if isinstance(batch, DepthEvent):
+                self.depth_updates += 1
+            else:
+                self.ticks += len(batch) if isinstance(batch, MarketEventBatch) else 1
+            if batch.ts_ns != received_ns:
+                self.lag.record(received_ns - batch.ts_ns)
+        return batch
+
+    async def _linger(self, batch: Decoded) -> List[Union[MarketEvent, MarketEventBatch, DepthEvent]]:
+        """
+        Keeps receiving until the linger window closes or the batch is full.
+        A depth frame ends the window, so it is published after the ticks
+        that arrived before it.
+        """
+        batches: List[Union[MarketEvent, MarketEventBatch]] = []
+        size = 0
+        if batch is not None:
+            batches.append(batch)
+            size = len(batch) if isinstance(batch, MarketEventBatch) else 1
+        deadline = time.monotonic() + self.batch_linger
+        depth = None
+        while size < self.batch_max_ticks:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                frame = await asyncio.wait_for(self.websocket.recv(), remaining)
+            except asyncio.TimeoutError:
+                break
+            batch = self.decode(frame)
+            if isinstance(batch, DepthEvent):
+                depth = batch
+                break
+            if batch is not None:
+                batches.append(batch)
+                size += len(batch) if isinstance(batch, MarketEventBatch) else 1
+        events = [merge_batches(batches)] if batches else []
+        return events + [depth] if depth is not None else events
 
     async def listen(self):
         if self.mock_mode:
@@ -41,59 +172,136 @@ class WebsocketManager:
 
         try:
             while True:
-                message = await self.websocket.recv()
-                data = json.loads(message)
-                # Process the data and create a MarketEvent
-                # This part is highly dependent on the broker's data format
-                # Example for a hypothetical format:
-                if data.get('type') == 'tick':
-                    market_event = MarketEvent(
-                        timestamp=datetime.now(),
-                        ticker=data['ticker'],
-                        price=data['price'],
-                        volume=data['volume']
-                    )
-                    await event_bus.put(market_event)
-                    logger.debug(f"Published MarketEvent: {market_event}")
+                batch = self.decode(await self.websocket.recv())
+                if self.batch_linger > 0 and not isinstance(batch, DepthEvent):
+                    for event in await self._linger(batch):
+                        await self.bus.put(event)
+                elif batch is not None:
+                    await self.bus.put(batch)
         except websockets.exceptions.ConnectionClosed:
-            logger.warning("WebSocket connection closed.")
+            logger.warning(f"[{self.name}] WebSocket connection closed.")
         except Exception as e:
-            logger.error(f"An error occurred in WebSocket listener: {e}")
+            logger.error(f"[{self.name}] An error occurred in WebSocket listener: {e}")
+        finally:
+            # Close before dropping the reference: after an error the socket
+            # (and its keepalive task) is still open and run() reconnects
+            websocket, self.websocket = self.websocket, None
+            try:
+                await websocket.close()
+            except Exception as e:
+                logger.debug(f"[{self.name}] Error closing WebSocket: {e!r}")
 
-    async def _mock_listen(self):
-        """Generate mock market data for testing purposes."""
-        logger.info("Starting mock market data generation")
-        tickers = ["NIFTY", "BANKNIFTY", "RELIANCE", "TCS", "INFY"]
-        
+    async def run(self):
+        """Connects, subscribes and listens until `close()`, recovering from dropped connections."""
+        self._closing = False
+        await self.connect()
+        if self.mock_mode:
+            if self.mock_feed:
+                await self._mock_listen()
+            return
+        if not self.connected and not await self._reconnect():
+            return
+        await self._send_subscription("subscribe", self.subscribed)
         while True:
+            await self.listen()
+            if self._closing:
+                return
+            gap_start_ns = self.last_frame_ns or time.time_ns()
+            dropped_ns = time.monotonic_ns()
+            if not await self._reconnect():
+                return
+            await self._send_subscription("subscribe", self.subscribed)
+            # Live frames queue up in the socket meanwhile, so the bars go out first
+            bars = await self.backfill(gap_start_ns, time.time_ns())
+            elapsed_ns = time.monotonic_ns() - dropped_ns
+            self.recovery.record(elapsed_ns)
+            logger.info(f"[{self.name}] Recovered in {elapsed_ns / 1e6:.0f} ms, backfilled {bars} bars")
+
+    async def _reconnect(self) -> bool:
+        attempt = 0
+        while not self._closing:
+            await asyncio.sleep(random.uniform(0, min(self.reconnect_max_delay, self.reconnect_delay * 2 ** attempt)))
             try:
-                # Generate mock market data
-                ticker = random.choice(tickers)
-                base_price = {"NIFTY": 18000, "BANKNIFTY": 42000, "RELIANCE": 2500, "TCS": 3500, "INFY": 1500}
-                price_change = random.uniform(-50, 50)
-                price = base_price.get(ticker, 1000) + price_change
-                volume = random.randint(1000, 10000)
-                
-                market_event = MarketEvent(
-                    timestamp=datetime.now(),
-                    ticker=ticker,
-                    price=round(price, 2),
-                    volume=volume
-                )
-                
-                await event_bus.put(market_event)
-                logger.debug(f"Published Mock MarketEvent: {market_event}")
-                
-                # Wait 5 seconds between mock data points
-                await asyncio.sleep(5)
-                
+                self.websocket = await websockets.connect(self.websocket_url)
             except Exception as e:
-                logger.error(f"Error in mock data generation: {e}")
-                await asyncio.sleep(1)
+                attempt += 1
+                logger.warning(f"[{self.name}] Reconnect attempt {attempt} failed: {e}")
+                continue
+            self.reconnects += 1
+            logger.info(f"[{self.name}] Reconnected to {self.websocket_url}")
+            return True
+        return False
+
+    def _exchange_date(self, ts_ns: int) -> str:
+        return (datetime.fromtimestamp(ts_ns / 1e9, timezone.utc) + self.day_offset).date().isoformat()
+
+    async def backfill(self, start_ns: int, end_ns: int) -> int:
+        """
+        Fetches `backfill_interval` bars for every subscribed ticker and
+        publishes the completed ones that overlap [start_ns, end_ns) as
+        synthetic BarEvents, ordered by bar start. Returns the bar count.
+        """
+        if not (self.backfill_enabled and self.api_client is not None and self.subscribed):
+            return 0
+        step_ns = interval_ns(self.backfill_interval)
+        from_date, to_date = self._exchange_date(start_ns), self._exchange_date(end_ns)
+        limit = asyncio.Semaphore(self.backfill_concurrency)
+
+        async def fetch(ticker: str) -> List[BarEvent]:
+            async with limit:
+                try:
+                    data = await self.api_client.aget_historical_data(ticker, self.backfill_interval, from_date, to_date)
+                except Exception as e:
+                    self.backfill_errors += 1
+                    logger.warning(f"[{self.name}] Backfill for {ticker} failed: {e!r}")
+                    return []
+            bars = bars_from_response(data)
+            starts = bars.index.as_unit("ns").asi8
+            keep = (starts + step_ns > start_ns) & (starts + step_ns <= end_ns)
+            return [
+                BarEvent(ticker, self.backfill_interval, int(ts), float(o), float(h), float(l), float(c), int(v),
+                         synthetic=True)
+                for ts, o, h, l, c, v in zip(starts[keep], bars["open"].to_numpy()[keep],
+                                             bars["high"].to_numpy()[keep], bars["low"].to_numpy()[keep],
+                                             bars["close"].to_numpy()[keep], bars["volume"].to_numpy()[keep])
+            ]
+
+        results = await asyncio.gather(*(fetch(ticker) for ticker in sorted(self.subscribed)))
+        events = sorted((bar for bars in results for bar in bars), key=lambda bar: bar.ts_ns)
+        for event in events:
+            await self.bus.put(event)
+        self.backfilled_bars += len(events)
+        return len(events)
+
+    async def _mock_listen(self):
+        """Publishes a synthetic feed from the market simulator (see [Simulator])."""
+        logger.info("Starting mock market data generation")
+        self.simulator = MarketSimulator.from_config(self.config)
+        try:
+            await self.simulator.run(self.bus)
+        finally:
+            logger.info(f"Market simulator stopped: {self.simulator.stats()}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters and feed lag (microseconds) for this connection."""
+        return {
+            "connected": self.connected,
+            "instruments": len(self.subscribed),
+            "frames": self.frames,
+            "ticks": self.ticks,
+            "depth_updates": self.depth_updates,
+            "decode_errors": self.decode_errors,
+            "reconnects": self.reconnects,
+            "lag_us": self.lag.summary(1000.0),
+            "recovery_ms": self.recovery.summary(1e6),
+            "backfilled_bars": self.backfilled_bars,
+            "backfill_errors": self.backfill_errors,
+        }
 
     async def close(self):
+        self._closing = True
         if self.websocket:
             await self.websocket.close()
-            logger.info("WebSocket connection closed.")
+            logger.info(f"[{self.name}] WebSocket connection closed.")
         elif self.mock_mode:
             logger.info("Mock mode stopped.")
@@ -30,7 +30,7 @@ class BrokerExecutor:
                 # In a real scenario, you would get a fresh auth token here
                 # self.compliance.get_auth_token()
 
-                response = self.api_client.place_order(order_details)
+                response = await self.api_client.aplace_order(order_details)
                 
                 if response and response.get('order_id'):
                     order_id = response['order_id']
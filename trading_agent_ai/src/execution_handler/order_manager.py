@@ -22,7 +22,7 @@ class OrderManager:
     async def _poll_order_status(self, order_id: str):
         while True:
             try:
-                status_response = self.api_client.get_order_status(order_id)
+                status_response = await self.api_client.aget_order_status(order_id)
                 
                 if status_response and status_response.get('status') == 'FILLED':
                     logger.info(f"Order {order_id} is FILLED.")
@@ -1,32 +1,39 @@
 import asyncio
 import sys
-import qasync
-from PyQt6.QtWidgets import QApplication
 
 from .core.config_loader import ConfigLoader
 from .core.logger import setup_logging
 from .core.database import Database
 from .core.event_bus import event_bus
 from .data_handler.broker_connector import BrokerConnector
-from .news_handler.rss_fetcher import RSSFetcher
 from .strategy_handler.main_fuser import MainFuser
 from .portfolio_manager.portfolio import Portfolio
 from .portfolio_manager.risk_manager import RiskManager
 from .portfolio_manager.pnl_tracker import PnLTracker
 from .execution_handler.broker_executor import BrokerExecutor
-from .ui.main_overlay import MainOverlay
-from .ui.ui_manager import UIManager
-from .core.event_types import MarketEvent, NewsEvent, VisionEvent, SignalEvent, OrderRequestEvent, FillEvent
+from .core.event_types import MarketEvent, MarketEventBatch, NewsEvent, VisionEvent, SignalEvent, OrderRequestEvent, FillEvent
+
+# Qt and the news stack are imported in main() only when enabled in
+# main_config.ini ([UI] / [News] enabled).
+
+
+def _enabled(config: ConfigLoader, section: str) -> bool:
+    return config.get(section, "enabled", fallback="true").lower() == "true"
+
 
 async def main():
     # 1. Initialization
     config = ConfigLoader()
     setup_logging()
+    event_bus.configure(config)
     
     # 2. Module Setup
     broker_connector = BrokerConnector(config)
-    news_fetcher = RSSFetcher(config)
-    strategy_fuser = MainFuser()
+    news_fetcher = None
+    if _enabled(config, "News"):
+        from .news_handler.rss_fetcher import RSSFetcher
+        news_fetcher = RSSFetcher(config)
+    strategy_fuser = MainFuser(config)
     
     portfolio = Portfolio()
     risk_manager = RiskManager(portfolio)
@@ -36,30 +43,46 @@ async def main():
 
     # 3. Start Core Services
     await broker_connector.start()
-    news_fetcher.start()
+    if news_fetcher:
+        news_fetcher.start()
     strategy_fuser.start()
     portfolio.start()
+    event_bus.start_monitor()
 
     # 4. Event Loop for dispatching events
-    async def event_dispatcher():
+    # MainFuser and UIManager own their subscriptions; this dispatcher only
+    # serves the components that are driven from here. Only market data may
+    # be conflated or shed; signals, orders and fills are never dropped.
+    subscriptions = (
+        event_bus.subscribe("dispatcher", (SignalEvent, OrderRequestEvent, FillEvent)),
+        event_bus.subscribe("dispatcher_market", (MarketEvent, MarketEventBatch), conflate=True),
+    )
+
+    async def event_dispatcher(subscription):
         while True:
-            event = await event_bus.get()
-            if isinstance(event, (MarketEvent, NewsEvent, VisionEvent)):
-                await strategy_fuser._process_signals()
+            event = await subscription.get()
+            if isinstance(event, MarketEvent):
+                await pnl_tracker.on_market_data(event)
             elif isinstance(event, SignalEvent):
                 await risk_manager.on_signal(event)
             elif isinstance(event, OrderRequestEvent):
                 await broker_executor.on_order_request(event)
             elif isinstance(event, FillEvent):
                 portfolio.on_fill(event)
-            elif isinstance(event, MarketEvent):
-                await pnl_tracker.on_market_data(event)
-            event_bus.task_done()
+            subscription.task_done()
+
+    # Start the dispatchers
+    dispatcher_task = asyncio.gather(*(event_dispatcher(subscription) for subscription in subscriptions))
 
-    # Start the dispatcher
-    dispatcher_task = asyncio.create_task(event_dispatcher())
+    if not _enabled(config, "UI"):
+        await dispatcher_task
+        return
 
     # 5. UI Setup
+    from PyQt6.QtWidgets import QApplication
+    from .ui.main_overlay import MainOverlay
+    from .ui.ui_manager import UIManager
+
     # Ensure QApplication is created
     QApplication.instance() or QApplication(sys.argv)
     
@@ -77,6 +100,13 @@ async def main():
 
 if __name__ == "__main__":
     try:
+        if not _enabled(ConfigLoader(), "UI"):
+            asyncio.run(main())
+            sys.exit(0)
+
+        import qasync
+        from PyQt6.QtWidgets import QApplication
+
         app = QApplication(sys.argv)
         loop = qasync.QEventLoop(app)
         asyncio.set_event_loop(loop)
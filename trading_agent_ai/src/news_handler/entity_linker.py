@@ -0,0 +1,127 @@
+import json
+import logging
+import re
+import unicodedata
+from collections import deque
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from ..core.config_loader import ConfigLoader
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"[A-Za-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Words of `text` with accents dropped and punctuation as separators, so "L&T's" is ["L", "T", "s"]."""
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+    return _TOKEN.findall(text)
+
+
+class EntityLinker:
+    """
+    Tags text with the instruments it mentions. `aliases` maps each ticker
+    to its company names and short forms; the ticker itself is always an
+    alias. Aliases written in capitals ("RIL", "ITC", "IDEA") only match
+    in capitals, so an acronym that is also a word is not linked from
+    ordinary prose; other aliases match in any case.
+
+    The aliases are compiled into one Aho-Corasick automaton over words,
+    so `link` reads each word of a headline once however many aliases
+    there are. A match inside a longer one ("Reliance" in "Reliance
+    Power") is dropped in favour of the longer.
+    """
+
+    def __init__(self, aliases: Mapping[str, Iterable[str]]):
+        # Automaton over lower-cased words: transitions, failure links, and
+        # per state the aliases ending there as (length, ticker, exact words)
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.out: List[Tuple[Tuple[int, str, Optional[Tuple[str, ...]]], ...]] = [()]
+        self.tickers = tuple(aliases)
+        self.alias_count = 0
+        for ticker, names in aliases.items():
+            for name in {ticker, *names}:
+                self._add(name, ticker)
+        self._link_failures()
+
+    @classmethod
+    def from_file(cls, path: str) -> "EntityLinker":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    @classmethod
+    def from_config(cls, config: ConfigLoader) -> "EntityLinker":
+        path = config.get_main_config("News", "aliases_path", fallback="")
+        if not path:
+            return cls({})
+        try:
+            linker = cls.from_file(path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load instrument aliases from {path}: {e!r}; headlines will not be linked")
+            return cls({})
+        logger.info(f"Loaded {linker.alias_count} aliases for {len(linker.tickers)} instruments from {path}.")
+        return linker
+
+    def _add(self, name: str, ticker: str) -> None:
+        words = tokenize(name)
+        if not words:
+            return
+        state = 0
+        for word in words:
+            word = word.lower()
+            next_state = self.goto[state].get(word)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][word] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append(())
+            state = next_state
+        exact = tuple(words) if name.isupper() else None
+        self.out[state] += ((len(words), ticker, exact),)
+        self.alias_count += 1
+
+    def _link_failures(self) -> None:
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and word not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(word, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                # A state also ends every alias its failure state ends
+                self.out[next_state] += self.out[self.fail[next_state]]
+
+    def matches(self, text: str) -> List[Tuple[int, int, str]]:
+        """(first word, end word, ticker) of every alias in `text`, including overlapping ones."""
+        words = tokenize(text)
+        if not words:
+            return []
+        goto, fail, out = self.goto, self.fail, self.out
+        found = []
+        state = 0
+        for end, word in enumerate(" ".join(words).lower().split(" "), 1):
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+            for length, ticker, exact in out[state]:
+                if exact is None or tuple(words[end - length:end]) == exact:
+                    found.append((end - length, end, ticker))
+        return found
+
+    def link(self, text: str) -> Tuple[str, ...]:
+        """Tickers mentioned in `text`, in order of first mention."""
+        tickers: Dict[str, None] = {}
+        covered_to = 0
+        # Longest first among matches starting at the same word
+        for start, end, ticker in sorted(self.matches(text), key=lambda match: (match[0], -match[1])):
+            if end <= covered_to:
+                continue
+            covered_to = end
+            tickers[ticker] = None
+        return tuple(tickers)
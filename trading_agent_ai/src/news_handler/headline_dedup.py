@@ -0,0 +1,151 @@
+import hashlib
+import logging
+import math
+import os
+import re
+import threading
+import time
+import unicodedata
+from typing import Optional
+
+import numpy as np
+
+from ..core.config_loader import ConfigLoader
+
+logger = logging.getLogger(__name__)
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+# Keys inserted per item: its normalized title and its GUID
+KEYS_PER_ITEM = 2
+
+
+def normalize_title(title: str) -> str:
+    """Case-, accent- and punctuation-insensitive form of a headline."""
+    text = unicodedata.normalize("NFKD", title).encode("ascii", "ignore").decode()
+    return _NON_WORD.sub(" ", text.lower()).strip()
+
+
+class HeadlineDedup:
+    """
+    Remembers which headlines were already published, for `window_seconds`.
+    Each item is keyed on its normalized title and its GUID (or link); it
+    counts as seen if either key was added before, which catches both
+    re-posted stories under a new link and edited titles.
+
+    Keys go into a ring of `generations` Bloom filters, each covering
+    window / generations of time and sized for `capacity` items (two keys
+    each) at `fp_rate`. The oldest generation is cleared as a new one starts, so
+    memory is fixed however long the process runs. A false positive
+    drops one new headline; a lookup tests both keys against every
+    generation, so with all of them full that is at most about
+    2 * generations * fp_rate of new headlines. With a `path` the
+    filters are saved there (`save()`) and reloaded on start, so a restart
+    does not republish the feed backlog.
+    """
+
+    def __init__(self, path: Optional[str] = None, window_seconds: float = 7 * 86400, generations: int = 7,
+                 capacity: int = 20000, fp_rate: float = 1e-6):
+        self.path = path
+        self.generations = generations
+        self.generation_seconds = window_seconds / generations
+        keys = capacity * KEYS_PER_ITEM
+        self.bits = int(math.ceil(-keys * math.log(fp_rate) / math.log(2) ** 2 / 8)) * 8
+        self.hashes = max(1, round(self.bits / keys * math.log(2)))
+        self.filters = np.zeros((generations, self.bits // 8), dtype=np.uint8)
+        # Start time of each generation; NaN for one not in use
+        self.starts = np.full(generations, np.nan)
+        self.current = 0
+        self.added = 0
+        self.dirty = False
+        # save() runs on a worker thread during a fetch cycle and again on
+        # shutdown; both write the same temporary file
+        self._save_lock = threading.Lock()
+        if path and os.path.exists(path):
+            self._load()
+
+    @classmethod
+    def from_config(cls, config: ConfigLoader) -> "HeadlineDedup":
+        return cls(
+            path=config.get_main_config("News", "dedup_path", fallback="") or None,
+            window_seconds=float(config.get_main_config("News", "dedup_window_days", fallback=7)) * 86400,
+            capacity=int(config.get_main_config("News", "dedup_capacity", fallback=20000)),
+        )
+
+    def _positions(self, key: str) -> np.ndarray:
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1, h2 = np.frombuffer(digest, dtype=np.uint64)
+        # Kirsch-Mitzenmacher double hashing: k positions from two hashes
+        return (h1 + np.arange(self.hashes, dtype=np.uint64) * (h2 | np.uint64(1))) % np.uint64(self.bits)
+
+    def _rotate(self, now: float) -> None:
+        start = self.starts[self.current]
+        if now - start < self.generation_seconds:
+            return
+        if not np.isnan(start):
+            self.current = (self.current + 1) % self.generations
+            self.filters[self.current] = 0
+        self.starts[self.current] = now
+        # After a long pause more than one generation may have run out
+        expired = now - self.starts >= self.generations * self.generation_seconds
+        self.filters[expired] = 0
+        self.starts[expired] = np.nan
+        self.dirty = True
+
+    def _contains(self, positions: np.ndarray) -> bool:
+        bytes_, masks = positions >> np.uint64(3), np.left_shift(1, positions & np.uint64(7)).astype(np.uint8)
+        return bool(((self.filters[:, bytes_] & masks) != 0).all(axis=1).any())
+
+    def _keys(self, title: str, guid: Optional[str]):
+        keys = ["t:" + normalize_title(title)]
+        if guid:
+            keys.append("g:" + guid.strip())
+        return keys
+
+    def seen(self, title: str, guid: Optional[str] = None, now: Optional[float] = None) -> bool:
+        self._rotate(time.time() if now is None else now)
+        return any(self._contains(self._positions(key)) for key in self._keys(title, guid))
+
+    def add(self, title: str, guid: Optional[str] = None, now: Optional[float] = None) -> None:
+        self._rotate(time.time() if now is None else now)
+        current = self.filters[self.current]
+        for key in self._keys(title, guid):
+            positions = self._positions(key)
+            np.bitwise_or.at(current, positions >> np.uint64(3),
+                             np.left_shift(1, positions & np.uint64(7)).astype(np.uint8))
+        self.added += 1
+        self.dirty = True
+
+    def check_and_add(self, title: str, guid: Optional[str] = None, now: Optional[float] = None) -> bool:
+        """True if the item is new (and records it), False if it was already seen."""
+        if self.seen(title, guid, now):
+            return False
+        self.add(title, guid, now)
+        return True
+
+    def save(self) -> None:
+        """
+        Writes the filters to `path` atomically, if anything changed since
+        the last save. Safe to call from several threads at once.
+        """
+        with self._save_lock:
+            if not self.path or not self.dirty:
+                return
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.savez(f, filters=self.filters, starts=self.starts, current=self.current, hashes=self.hashes)
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+
+    def _load(self) -> None:
+        try:
+            with np.load(self.path) as saved:
+                if saved["filters"].shape != self.filters.shape or int(saved["hashes"]) != self.hashes:
+                    logger.warning(f"Headline index {self.path} was built with other settings; starting afresh")
+                    return
+                self.filters[:] = saved["filters"]
+                self.starts[:] = saved["starts"]
+                self.current = int(saved["current"])
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Could not load headline index {self.path}: {e!r}; starting afresh")
@@ -1,58 +1,167 @@
 import asyncio
 import feedparser
+import httpx
 import logging
+import time
 from datetime import datetime
+from typing import Dict, Optional, Tuple
 
 from ..core.config_loader import ConfigLoader
 from ..core.event_bus import event_bus
 from ..core.event_types import NewsEvent
-from ..core.sentiment import SentimentAnalyzer
+from ..core.sentiment import SentimentService
 from .feed_manager import FeedManager
+from .entity_linker import EntityLinker
+from .headline_dedup import HeadlineDedup, normalize_title
 
 logger = logging.getLogger(__name__)
 
 class RSSFetcher:
-    def __init__(self, config: ConfigLoader):
+    """
+    Polls the configured RSS feeds and publishes a NewsEvent per new headline.
+    All feeds are fetched concurrently, each given at most `feed_timeout`
+    seconds in all, so a slow or trickling feed is skipped until the next
+    cycle instead of holding up the others. Each feed's
+    ETag/Last-Modified is sent back on the next poll, so an unchanged feed
+    costs a 304 and no parsing. feedparser runs in a worker thread, which
+    keeps the event loop free for ticks. Already published items are
+    recognised by a persistent, time-windowed HeadlineDedup. The cycle's
+    new headlines are scored as one batch by the SentimentService, and
+    each is tagged with the tickers it mentions by the EntityLinker.
+    """
+
+    def __init__(self, config: ConfigLoader, bus=event_bus, transport: Optional[httpx.AsyncBaseTransport] = None):
         self.config = config
+        self.bus = bus
         self.feed_manager = FeedManager(config)
-        self.sentiment_analyzer = SentimentAnalyzer()
+        self.sentiment = SentimentService.from_config(config)
         self.fetch_interval = int(self.config.get_main_config("General", "news_fetch_interval_seconds", fallback=300))
-        self.seen_headlines = set()
+        self.feed_timeout = float(self.config.get_main_config("News", "feed_timeout_seconds", fallback=10))
+        self.dedup = HeadlineDedup.from_config(config)
+        self.linker = EntityLinker.from_config(config)
         self.fetch_task = None
+        self._transport = transport
+        # Conditional GET validators from each feed's last published 200 response
+        self.validators: Dict[str, Dict[str, str]] = {}
+        self.stats = {"fetched": 0, "not_modified": 0, "errors": 0, "timeouts": 0, "duplicates": 0}
 
     def start(self):
         logger.info("Starting RSS Fetcher...")
         self.fetch_task = asyncio.create_task(self._fetch_loop())
         logger.info(f"RSS Fetcher started. Fetching every {self.fetch_interval} seconds.")
-        
+
     def stop(self):
         logger.info("Stopping RSS Fetcher...")
         if self.fetch_task:
             self.fetch_task.cancel()
-        logger.info("RSS Fetcher stopped.")
+        # Waits for a save the cancelled cycle may still be running on a thread
+        self.dedup.save()
+        self.sentiment.close()
+        logger.info(f"RSS Fetcher stopped. Sentiment cache: {self.sentiment.stats()}")
+
+    def _client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            timeout=self.feed_timeout,
+            follow_redirects=True,
+            headers={"User-Agent": "TradingAgentAI/1.0 (+feedparser)"},
+            transport=self._transport,
+        )
 
     async def _fetch_loop(self):
-        while True:
-            await self._fetch_all_feeds()
-            await asyncio.sleep(self.fetch_interval)
+        async with self._client() as client:
+            while True:
+                try:
+                    await self._fetch_all_feeds(client)
+                except Exception:
+                    logger.exception("News fetch cycle failed; retrying next cycle")
+                await asyncio.sleep(self.fetch_interval)
+
+    async def _fetch_feed(self, client: httpx.AsyncClient,
+                          feed_url: str) -> Optional[Tuple[feedparser.FeedParserDict, Dict[str, str]]]:
+        """
+        Returns the parsed feed and the response's validators, or None when
+        it is unchanged since the last poll. The validators are stored once
+        the feed's headlines are published, so a failed cycle refetches.
+        """
+        validators = self.validators.get(feed_url, {})
+        headers = {}
+        if "etag" in validators:
+            headers["If-None-Match"] = validators["etag"]
+        if "last_modified" in validators:
+            headers["If-Modified-Since"] = validators["last_modified"]
+        response = await client.get(feed_url, headers=headers)
+        if response.status_code == 304:
+            self.stats["not_modified"] += 1
+            return None
+        response.raise_for_status()
+        validators = {
+            key: response.headers[header]
+            for key, header in (("etag", "ETag"), ("last_modified", "Last-Modified"))
+            if header in response.headers
+        }
+        self.stats["fetched"] += 1
+        parsed_feed = await asyncio.to_thread(
+            feedparser.parse, response.content, response_headers=dict(response.headers)
+        )
+        return parsed_feed, validators
+
+    async def _fetch_all_feeds(self, client: Optional[httpx.AsyncClient] = None):
+        if client is None:
+            async with self._client() as client:
+                return await self._fetch_all_feeds(client)
 
-    async def _fetch_all_feeds(self):
         feeds = self.feed_manager.get_feeds()
-        for feed_url in feeds:
-            try:
-                parsed_feed = feedparser.parse(feed_url)
-                for entry in parsed_feed.entries:
-                    if entry.title not in self.seen_headlines:
-                        self.seen_headlines.add(entry.title)
-                        sentiment_score = self.sentiment_analyzer.get_sentiment(entry.title)
-                        
-                        news_event = NewsEvent(
-                            timestamp=datetime.now(),
-                            headline=entry.title,
-                            source=parsed_feed.feed.title,
-                            sentiment=sentiment_score
-                        )
-                        await event_bus.put(news_event)
-                        logger.debug(f"Published NewsEvent: {news_event.headline}")
-            except Exception as e:
-                logger.error(f"Error fetching or parsing feed {feed_url}: {e}")
+        started = time.monotonic()
+        # httpx's timeout bounds each connect/read/write step, not the whole
+        # fetch, so a server trickling bytes could otherwise hold up the cycle
+        results = await asyncio.gather(
+            *(asyncio.wait_for(self._fetch_feed(client, feed_url), self.feed_timeout) for feed_url in feeds),
+            return_exceptions=True
+        )
+        new_items = []
+        fetched_validators = {}
+        # Titles and GUIDs collected this cycle: a headline is only recorded
+        # in the dedup filter once it has been published
+        collected = set()
+        for feed_url, result in zip(feeds, results):
+            if isinstance(result, asyncio.TimeoutError):
+                self.stats["timeouts"] += 1
+                logger.warning(f"Feed {feed_url} took longer than {self.feed_timeout}s; skipped this cycle")
+                continue
+            if isinstance(result, BaseException):
+                self.stats["errors"] += 1
+                logger.error(f"Error fetching or parsing feed {feed_url}: {result!r}")
+                continue
+            if result is None:
+                continue
+            parsed_feed, fetched_validators[feed_url] = result
+            source = parsed_feed.feed.get("title", feed_url)
+            for entry in parsed_feed.entries:
+                title = entry.get("title")
+                if not title:
+                    continue
+                guid = entry.get("id") or entry.get("link")
+                keys = [("title", normalize_title(title))]
+                if guid:
+                    keys.append(("guid", guid.strip()))
+                if self.dedup.seen(title, guid) or not collected.isdisjoint(keys):
+                    self.stats["duplicates"] += 1
+                    continue
+                collected.update(keys)
+                new_items.append((title, guid, source))
+
+        scores = await self.sentiment.ascore_many([title for title, _, _ in new_items])
+        for (title, guid, source), sentiment_score in zip(new_items, scores):
+            news_event = NewsEvent(
+                timestamp=datetime.now(),
+                headline=title,
+                source=source,
+                sentiment=sentiment_score,
+                tickers=self.linker.link(title)
+            )
+            await self.bus.put(news_event)
+            self.dedup.add(title, guid)
+            logger.debug(f"Published NewsEvent: {news_event.headline}")
+        self.validators.update(fetched_validators)
+        await asyncio.to_thread(self.dedup.save)
+        logger.debug(f"News cycle: {len(feeds)} feeds in {time.monotonic() - started:.2f}s ({self.stats})")
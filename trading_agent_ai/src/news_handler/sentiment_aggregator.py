@@ -0,0 +1,118 @@
+import math
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from ..core.config_loader import ConfigLoader
+from ..core.event_types import NewsEvent
+
+
+@dataclass(frozen=True, slots=True)
+class SentimentSnapshot:
+    """
+    Sentiment of one stream at a point in time. `mean` and `dispersion`
+    (standard deviation) are over the headlines weighted by age; `weight`
+    is their decayed total, `count` the number of headlines ever seen.
+    `score` is the mean shrunk towards 0 by the aggregator's prior weight,
+    so it fades as the news ages and one headline moves it only so far.
+    """
+    mean: float
+    dispersion: float
+    weight: float
+    count: int
+    score: float
+
+
+class DecayedSentiment:
+    """
+    Exponentially time-decayed mean and variance of one stream of scores
+    (West's weighted update). Every headline's weight halves each
+    `half_life` seconds. Updates are O(1) and decay is applied lazily, so
+    reading at a later time needs no update.
+    """
+
+    __slots__ = ("rate", "weight", "mean", "m2", "updated", "count")
+
+    def __init__(self, half_life: float):
+        self.rate = math.log(2) / half_life
+        self.weight = 0.0
+        self.mean = 0.0
+        # Decayed sum of squared deviations from the mean
+        self.m2 = 0.0
+        self.updated = 0.0
+        self.count = 0
+
+    def add(self, score: float, at: float) -> None:
+        if at >= self.updated:
+            decay = math.exp(-self.rate * (at - self.updated))
+            self.weight *= decay
+            self.m2 *= decay
+            self.updated = at
+            weight = 1.0
+        else:
+            # Older than the latest headline (e.g. a late feed): it enters already decayed
+            weight = math.exp(-self.rate * (self.updated - at))
+        previous_weight = self.weight
+        self.weight += weight
+        delta = score - self.mean
+        self.mean += delta * weight / self.weight
+        self.m2 += previous_weight * weight / self.weight * delta * delta
+        self.count += 1
+
+    def weight_at(self, now: float) -> float:
+        return self.weight * math.exp(-self.rate * max(0.0, now - self.updated))
+
+    def snapshot(self, now: float, prior_weight: float) -> SentimentSnapshot:
+        weight = self.weight_at(now)
+        dispersion = math.sqrt(max(0.0, self.m2 / self.weight)) if self.weight else 0.0
+        score = self.mean * weight / (weight + prior_weight) if weight + prior_weight else 0.0
+        return SentimentSnapshot(self.mean, dispersion, weight, self.count, score)
+
+
+class SentimentAggregator:
+    """
+    Rolling news sentiment per ticker and market-wide. Each NewsEvent
+    updates the tickers it mentions, or the market-wide stream when it
+    mentions none. Memory grows with the number of tickers, never with
+    the number of headlines.
+    """
+
+    def __init__(self, half_life_seconds: float = 3600.0, prior_weight: float = 1.0, min_weight: float = 0.05):
+        self.half_life = half_life_seconds
+        self.prior_weight = prior_weight
+        # Below this decayed weight a ticker's own news is treated as gone
+        self.min_weight = min_weight
+        self.tickers: Dict[str, DecayedSentiment] = {}
+        self.market = DecayedSentiment(half_life_seconds)
+
+    @classmethod
+    def from_config(cls, config: ConfigLoader) -> "SentimentAggregator":
+        return cls(
+            half_life_seconds=float(config.get("News", "sentiment_half_life_seconds", fallback=3600)),
+            prior_weight=float(config.get("News", "sentiment_prior_weight", fallback=1.0)),
+            min_weight=float(config.get("News", "sentiment_min_weight", fallback=0.05)),
+        )
+
+    def on_event(self, event: NewsEvent) -> None:
+        at = event.timestamp.timestamp()
+        if not event.tickers:
+            self.market.add(event.sentiment, at)
+            return
+        for ticker in event.tickers:
+            state = self.tickers.get(ticker)
+            if state is None:
+                state = self.tickers[ticker] = DecayedSentiment(self.half_life)
+            state.add(event.sentiment, at)
+
+    def snapshot(self, ticker: Optional[str] = None, now: Optional[float] = None) -> Optional[SentimentSnapshot]:
+        """
+        Sentiment for `ticker` from its own news, else market-wide; None
+        if there has been no news at all. Without a ticker, market-wide.
+        """
+        now = time.time() if now is None else now
+        state = self.tickers.get(ticker) if ticker else None
+        if state is None or state.weight_at(now) < self.min_weight:
+            state = self.market
+        if not state.count:
+            return None
+        return state.snapshot(now, self.prior_weight)
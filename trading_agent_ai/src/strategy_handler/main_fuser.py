@@ -1,57 +1,101 @@
 import asyncio
 import logging
 from datetime import datetime
+from typing import Optional
 
+from ..core.config_loader import ConfigLoader
 from ..core.event_bus import event_bus
-from ..core.event_types import MarketEvent, NewsEvent, VisionEvent
+from ..core.event_types import DepthEvent, MarketEvent, MarketEventBatch, NewsEvent, VisionEvent
+from ..data_handler.order_book import OrderBooks
+from ..news_handler.sentiment_aggregator import SentimentAggregator
 from .strategies.multi_fusion import MultiFusionStrategy
 from .signal_generator import SignalGenerator
 
 logger = logging.getLogger(__name__)
 
 class MainFuser:
-    def __init__(self):
+    def __init__(self, config: Optional[ConfigLoader] = None):
         self.strategy = MultiFusionStrategy()
         self.signal_generator = SignalGenerator()
         self.market_state = {}
+        # Latest news per ticker it mentions, and the latest market-wide headline
         self.news_state = {}
+        self.market_news = None
+        self.sentiment = SentimentAggregator.from_config(config) if config else SentimentAggregator()
         self.vision_state = {}
+        self.order_books = OrderBooks()
+        self.subscription = None
+        self.news_subscription = None
+        self.depth_subscription = None
 
     def start(self):
         logger.info("Starting Main Fuser...")
-        self.listen_task = asyncio.create_task(self._listen_for_events())
+        # Only ticks may be conflated or shed under load: news and vision
+        # events are rare and each one matters, so they get a lossless queue
+        self.subscription = event_bus.subscribe("main_fuser", (MarketEvent, MarketEventBatch), conflate=True)
+        self.news_subscription = event_bus.subscribe("main_fuser_news", (NewsEvent, VisionEvent))
+        # Depth updates are incremental, so the books need every one of them:
+        # a separate lossless subscription keeps them out of the conflating queue
+        self.depth_subscription = event_bus.subscribe("order_books", (DepthEvent,))
+        self.listen_task = asyncio.create_task(self._listen_for_events(self.subscription))
+        self.news_task = asyncio.create_task(self._listen_for_events(self.news_subscription))
+        self.depth_task = asyncio.create_task(self._listen_for_depth())
         logger.info("Main Fuser started.")
 
-    async def _listen_for_events(self):
+    async def _listen_for_events(self, subscription):
         while True:
-            event = await event_bus.get()
+            event = await subscription.get()
+            tickers = None
             if isinstance(event, MarketEvent):
                 self.market_state[event.ticker] = event
             elif isinstance(event, NewsEvent):
-                # Simple logic: assume news affects all tickers for now
-                self.news_state['latest'] = event
+                self.sentiment.on_event(event)
+                if event.tickers:
+                    # Only the instruments the headline mentions are affected
+                    for ticker in event.tickers:
+                        self.news_state[ticker] = event
+                    tickers = event.tickers
+                else:
+                    self.market_news = event
             elif isinstance(event, VisionEvent):
                 self.vision_state[event.ticker] = event
             
             # After any new event, try to generate a signal
-            await self._process_signals()
-            event_bus.task_done()
+            await self._process_signals(tickers)
+            subscription.task_done()
 
-    async def _process_signals(self):
+    async def _listen_for_depth(self):
+        # Books only feed the next signal evaluation; depth updates are too
+        # frequent to evaluate signals on each one
+        while True:
+            event = await self.depth_subscription.get()
+            try:
+                self.order_books.on_event(event)
+            except Exception as e:
+                logger.error(f"Failed to apply depth update for {event.ticker}: {e!r}")
+            finally:
+                self.depth_subscription.task_done()
+
+    async def _process_signals(self, tickers=None):
         # This is a simplified logic. A real system would have a more
         # sophisticated way to decide which tickers to process.
-        all_tickers = set(self.market_state.keys()) | set(self.vision_state.keys())
+        if tickers is None:
+            tickers = set(self.market_state.keys()) | set(self.vision_state.keys())
         
-        for ticker in all_tickers:
+        for ticker in tickers:
             market_data = self.market_state.get(ticker)
-            news_data = self.news_state.get('latest')
+            # A ticker's own news, else the latest market-wide headline
+            news_data = self.news_state.get(ticker) or self.market_news
             vision_data = self.vision_state.get(ticker)
 
             # We need at least market data to proceed
             if not market_data:
                 continue
 
-            signal = self.strategy.calculate_signal(market_data, news_data, vision_data)
+            signal = self.strategy.calculate_signal(
+                market_data, news_data, vision_data, order_book=self.order_books.get(ticker),
+                sentiment=self.sentiment.snapshot(ticker)
+            )
             
             if signal and signal != 'HOLD':
                 await self.signal_generator.generate_signal(
@@ -1,18 +1,27 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 from ...core.event_types import MarketEvent, NewsEvent, VisionEvent
 
+if TYPE_CHECKING:
+    from ...data_handler.order_book import OrderBook
+    from ...news_handler.sentiment_aggregator import SentimentSnapshot
+
 class BaseStrategy(ABC):
     @abstractmethod
     def calculate_signal(
         self, 
         market_data: MarketEvent, 
         news_data: Optional[NewsEvent], 
-        vision_data: Optional[VisionEvent]
+        vision_data: Optional[VisionEvent],
+        order_book: Optional["OrderBook"] = None,
+        sentiment: Optional["SentimentSnapshot"] = None
     ) -> str:
         """
         Calculates a trading signal based on the input data.
+        `order_book` is the ticker's L2 book when the feed carries depth.
+        `sentiment` is the ticker's time-decayed news sentiment, which
+        supersedes the single latest headline in `news_data` when given.
         Returns 'BUY', 'SELL', or 'HOLD'.
         """
         pass
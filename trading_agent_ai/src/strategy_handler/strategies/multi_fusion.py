@@ -1,14 +1,29 @@
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 from .base_strategy import BaseStrategy
 from ...core.event_types import MarketEvent, NewsEvent, VisionEvent
 
+if TYPE_CHECKING:
+    from ...data_handler.order_book import OrderBook
+    from ...news_handler.sentiment_aggregator import SentimentSnapshot
+
 class MultiFusionStrategy(BaseStrategy):
+    def __init__(self, imbalance_threshold: float = 0.3, imbalance_levels: Optional[int] = 5,
+                 max_dispersion: float = 0.5):
+        # Book imbalance over the best `imbalance_levels` levels beyond
+        # +/- imbalance_threshold counts as a vote, like vision and news
+        self.imbalance_threshold = imbalance_threshold
+        self.imbalance_levels = imbalance_levels
+        # Rolling sentiment only votes while the headlines broadly agree
+        self.max_dispersion = max_dispersion
+
     def calculate_signal(
         self, 
         market_data: MarketEvent, 
         news_data: Optional[NewsEvent], 
-        vision_data: Optional[VisionEvent]
+        vision_data: Optional[VisionEvent],
+        order_book: Optional["OrderBook"] = None,
+        sentiment: Optional["SentimentSnapshot"] = None
     ) -> str:
         """
         Fuses signals from vision, news, and predictive models.
@@ -19,6 +34,7 @@ class MultiFusionStrategy(BaseStrategy):
 
         vision_signal = 0
         news_signal = 0
+        book_signal = 0
 
         if vision_data:
             if 'bullish' in vision_data.pattern.lower():
@@ -26,17 +42,30 @@ class MultiFusionStrategy(BaseStrategy):
             elif 'bearish' in vision_data.pattern.lower():
                 vision_signal = -1
         
-        if news_data:
+        if sentiment is not None:
+            if sentiment.dispersion <= self.max_dispersion:
+                if sentiment.score > 0.2:
+                    news_signal = 1
+                elif sentiment.score < -0.2:
+                    news_signal = -1
+        elif news_data:
             if news_data.sentiment > 0.2:
                 news_signal = 1
             elif news_data.sentiment < -0.2:
                 news_signal = -1
 
+        if order_book is not None:
+            imbalance = order_book.imbalance(self.imbalance_levels)
+            if imbalance > self.imbalance_threshold:
+                book_signal = 1
+            elif imbalance < -self.imbalance_threshold:
+                book_signal = -1
+
         # Simple fusion logic:
         # If vision and news agree, generate a signal.
         # This is a placeholder for the more complex logic described in the blueprint.
         
-        total_signal = vision_signal + news_signal
+        total_signal = vision_signal + news_signal + book_signal
 
         if total_signal >= 2: # Strong agreement
             return 'BUY'
@@ -44,9 +73,9 @@ class MultiFusionStrategy(BaseStrategy):
             return 'SELL'
         
         # Example of a weaker signal
-        if vision_signal == 1 and news_signal >= 0:
+        if vision_signal == 1 and news_signal >= 0 and book_signal >= 0:
             return 'BUY'
-        if vision_signal == -1 and news_signal <= 0:
+        if vision_signal == -1 and news_signal <= 0 and book_signal <= 0:
             return 'SELL'
 
         return 'HOLD'
@@ -4,7 +4,7 @@ from datetime import datetime
 from typing import Dict, Any
 
 from ..core.event_bus import event_bus
-from ..core.event_types import MarketEvent, NewsEvent, SignalEvent
+from ..core.event_types import MarketEvent, MarketEventBatch, NewsEvent, SignalEvent
 from .main_overlay import MainOverlay
 
 class UIManager(QObject):
@@ -57,7 +57,7 @@ class UIManager(QObject):
 
     def add_signal(self, event: SignalEvent):
         """Add a new trading signal to UI."""
-        message = f"Signal: {event.action} {event.ticker} at {event.price:.2f}"
+        message = f"Signal: {event.signal} {event.ticker} ({event.confidence:.2f})"
         self.new_signal.emit(message)
 
     def update_portfolio(self, positions: Dict[str, float]):
@@ -79,9 +79,18 @@ class UIManager(QObject):
         Listens on the main event bus for events relevant to the UI.
         This method should be called as a background task.
         """
+        # Only ticks may be conflated or shed under load: signals and news
+        # are rare and each one is shown, so they get a lossless queue
+        subscriptions = (
+            event_bus.subscribe("ui", (MarketEvent, MarketEventBatch), conflate=True),
+            event_bus.subscribe("ui_events", (SignalEvent, NewsEvent)),
+        )
+        await asyncio.gather(*(self._listen(subscription) for subscription in subscriptions))
+
+    async def _listen(self, subscription):
         while True:
             try:
-                event = await event_bus.get()
+                event = await subscription.get()
                 
                 if isinstance(event, MarketEvent):
                     self.update_market_data(event)
@@ -91,7 +100,7 @@ class UIManager(QObject):
                     message = f"News: {event.headline[:50]}..."
                     self.new_alert.emit(message, "NEWS")
                 
-                event_bus.task_done()
+                subscription.task_done()
                 
             except Exception as e:
                 print(f"Error in UI event listener: {e}")
@@ -1,7 +1,6 @@
 import asyncio
 import logging
 from datetime import datetime
-from ultralytics import YOLO
 
 from ..core.event_bus import event_bus
 from ..core.event_types import VisionEvent
@@ -13,6 +12,9 @@ logger = logging.getLogger(__name__)
 class Perception:
     def __init__(self, config: ConfigLoader):
         self.config = config
+        # ultralytics pulls in torch; only pay for it when vision is used
+        from ultralytics import YOLO
+
         model_path = self.config.get("Vision", "yolo_model_path")
         self.model = YOLO(model_path)
         self.screen_region = {
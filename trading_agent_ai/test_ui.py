@@ -77,7 +77,6 @@ class UITester:
         
         # Create mock market event
         market_event = MarketEvent(
-            timestamp=datetime.now(),
             ticker=ticker,
             price=round(price, 2),
             volume=volume
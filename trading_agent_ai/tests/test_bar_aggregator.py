@@ -0,0 +1,102 @@
+import unittest
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path for testing
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from src.core.event_types import BarEvent, MarketEvent, MarketEventBatch
+from src.data_handler.bar_aggregator import BarAggregator, BarRing
+
+SECOND = 10**9
+MINUTE = 60 * SECOND
+# 2024-01-02 09:15:00 IST
+OPEN_NS = 1704167100 * SECOND
+
+def _ohlcv(bars):
+    return [(int(b["ts_ns"]), float(b["open"]), float(b["high"]), float(b["low"]), float(b["close"]),
+             int(b["volume"])) for b in bars]
+
+class TestBarAggregator(unittest.TestCase):
+    def test_ticks_build_bars_and_close_on_next_bucket(self):
+        """Each interval keeps O/H/L/C/V and publishes the bar once the next bucket trades."""
+        aggregator = BarAggregator(intervals=("1m", "5m"), allowed_lateness_ms=0)
+        closed = []
+        for offset, price, volume in ((5, 100.0, 10), (20, 103.0, 5), (40, 99.0, 7), (59, 101.0, 1), (61, 102.0, 2)):
+            closed += aggregator.on_event(MarketEvent("TCS", price, volume, OPEN_NS + offset * SECOND))
+
+        self.assertEqual([(b.interval, b.ts_ns, b.open, b.high, b.low, b.close, b.volume) for b in closed],
+                         [("1m", OPEN_NS, 100.0, 103.0, 99.0, 101.0, 23)])
+        self.assertEqual(aggregator.forming("TCS", "5m").volume, 25)
+
+        # A tick for the closed minute is dropped there but still counts for the 5 minute bar
+        aggregator.on_event(MarketEvent("TCS", 150.0, 3, OPEN_NS + 30 * SECOND))
+        self.assertEqual(aggregator.late, 1)
+        self.assertEqual(aggregator.forming("TCS", "5m").high, 150.0)
+        self.assertEqual(_ohlcv(aggregator.bars("TCS", "1m")), [(OPEN_NS, 100.0, 103.0, 99.0, 101.0, 23)])
+
+    def test_batches_match_single_ticks(self):
+        """Reducing a batch per ticker gives the same bars as feeding its ticks one by one."""
+        rng = np.random.default_rng(1)
+        batches = [
+            MarketEventBatch.from_ticks(
+                [(f"SYM{i}", float(p), int(v)) for i, p, v in zip(rng.integers(0, 5, 40), rng.uniform(90, 110, 40),
+                                                                rng.integers(1, 100, 40))],
+                ts_ns=OPEN_NS + step * 700_000_000,
+            )
+            for step in range(300)
+        ]
+        by_batch, by_tick = BarAggregator(), BarAggregator()
+        batch_bars, tick_bars = [], []
+        for batch in batches:
+            batch_bars += by_batch.on_event(batch)
+            for tick in batch:
+                tick_bars += by_tick.on_event(tick)
+
+        # Bars closing together may come out in a different order
+        key = lambda bar: (bar.ts_ns, bar.interval, bar.ticker)
+        self.assertEqual(sorted(batch_bars, key=key), sorted(tick_bars, key=key))
+        self.assertGreater(len(batch_bars), 0)
+
+    def test_idle_ticker_closes_with_the_watermark(self):
+        """A ticker that stops trading still closes its bar once other tickers move past it."""
+        aggregator = BarAggregator(intervals=("1s",), allowed_lateness_ms=200)
+        aggregator.on_event(MarketEvent("ILLIQUID", 10.0, 1, OPEN_NS))
+        self.assertEqual(aggregator.on_event(MarketEvent("NIFTY", 18000.0, 1, OPEN_NS + SECOND + 100_000_000)), [])
+        closed = aggregator.on_event(MarketEvent("NIFTY", 18001.0, 1, OPEN_NS + SECOND + 300_000_000))
+        self.assertEqual([(b.ticker, b.ts_ns) for b in closed], [("ILLIQUID", OPEN_NS)])
+
+    def test_ring_windows_are_views(self):
+        """Windows are contiguous views over the latest bars, also after wrapping around."""
+        ring = BarRing(3)
+        for i in range(5):
+            ring.append(i, i, i, i, i, i)
+        window = ring.window()
+        self.assertEqual(window["ts_ns"].tolist(), [2, 3, 4])
+        self.assertEqual(ring.window(2)["close"].tolist(), [3.0, 4.0])
+        self.assertTrue(np.shares_memory(window, ring._data))
+
+    def test_backfill_fills_gap_without_double_counting(self):
+        """Synthetic bars replace the partial bar and fill the gap; coarser bars only take the missing part."""
+        aggregator = BarAggregator(intervals=("1m", "5m"), allowed_lateness_ms=0)
+        closed = aggregator.on_event(MarketEvent("TCS", 100.0, 10, OPEN_NS + 10 * SECOND))
+        closed += aggregator.on_event(MarketEvent("TCS", 101.0, 10, OPEN_NS + MINUTE + 10 * SECOND))
+        # Feed drops at 09:16:10 and comes back at 09:19:05
+        backfill = [BarEvent("TCS", "1minute", OPEN_NS + m * MINUTE, 101.0 + m, 105.0 + m, 99.0, 102.0 + m, 100,
+                             synthetic=True) for m in (1, 2, 3)]
+        for bar in backfill:
+            closed += aggregator.on_event(bar)
+        # Our own republished bars come back on the bus and are ignored
+        self.assertEqual([aggregator.on_event(bar) for bar in closed], [[]] * len(closed))
+
+        self.assertEqual([(b.ts_ns - OPEN_NS) // MINUTE for b in closed], [0, 1, 2, 3])
+        self.assertEqual([b.synthetic for b in closed], [False, True, True, True])
+        self.assertEqual(aggregator.bars("TCS", "1m")["volume"].tolist(), [10, 100, 100, 100])
+        five = aggregator.forming("TCS", "5m")
+        self.assertEqual((five.volume, five.high, five.close, five.synthetic), (220, 108.0, 105.0, True))
+        self.assertEqual(aggregator.backfilled, 3)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,382 @@
+import asyncio
+import time
+import unittest
+from unittest.mock import Mock, AsyncMock, patch
+import sys
+import tempfile
+import threading
+from datetime import date, timedelta
+from email.utils import formatdate
+from pathlib import Path
+
+import httpx
+
+# Add src to path for testing
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from src.data_handler.api_client import APIClient
+from src.data_handler.feed_decoders import BinaryDecoder, JsonDecoder
+from src.data_handler.subscription_manager import SubscriptionManager
+from src.data_handler.websocket_manager import WebsocketManager
+from src.core.event_bus import EventBus
+from src.core.event_types import BarEvent, DepthEvent
+from src.data_handler.order_book import OrderBook
+from src.data_handler.request_scheduler import RequestScheduler
+from src.data_handler.historical_cache import HistoricalDataCache, subtract_ranges
+from src.data_handler.parquet_archive import ParquetArchive
+
+def _config(**overrides):
+    settings = {"rest_url": "https://broker.test", "retry_backoff_ms": "0", "retry_max_backoff_ms": "0"}
+    settings.update(overrides)
+    config = Mock()
+    config.get.side_effect = lambda section, key, fallback=None: settings.get(key, fallback)
+    config.get_main_config.side_effect = config.get.side_effect
+    return config
+
+class TestAPIClient(unittest.IsolatedAsyncioTestCase):
+    async def test_retries_transient_status_then_succeeds(self):
+        """A GET that hits 503 is retried and returns the eventual response."""
+        statuses = [503, 503, 200]
+
+        def handler(request):
+            return httpx.Response(statuses.pop(0), json={"status": "FILLED"})
+
+        client = APIClient(_config(), transport=httpx.MockTransport(handler))
+        self.assertEqual(await client.aget_order_status("A1"), {"status": "FILLED"})
+        self.assertEqual(statuses, [])
+        await client.aclose()
+
+    async def test_retry_after_is_waited_out(self):
+        """A 429's Retry-After (seconds or HTTP date) is a floor on the backoff, beyond retry_max_backoff_ms."""
+        retry_at = formatdate(time.time() + 2, usegmt=True)
+        responses = [httpx.Response(429, headers={"Retry-After": "1"}),
+                     httpx.Response(429, headers={"Retry-After": retry_at}),
+                     httpx.Response(200, json={"balance": 1})]
+        client = APIClient(_config(), transport=httpx.MockTransport(lambda request: responses.pop(0)))
+        with patch("src.data_handler.api_client.asyncio.sleep", new_callable=AsyncMock) as sleep:
+            self.assertEqual(await client.aget_account_balance(), {"balance": 1})
+        delays = [call.args[0] for call in sleep.call_args_list]
+        self.assertEqual(delays[0], 1.0)
+        self.assertGreater(delays[1], 0.9)
+        await client.aclose()
+
+    async def test_retry_after_beyond_the_cap_fails(self):
+        client = APIClient(_config(retry_after_max_seconds="5"), transport=httpx.MockTransport(
+            lambda request: httpx.Response(429, headers={"Retry-After": "120"})
+        ))
+        with self.assertRaises(httpx.HTTPStatusError):
+            await client.aget_account_balance()
+        await client.aclose()
+
+    async def test_order_not_retried_after_it_was_sent(self):
+        """A POST that fails after being sent is not resubmitted."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            raise httpx.ReadTimeout("no response", request=request)
+
+        client = APIClient(_config(), transport=httpx.MockTransport(handler))
+        with self.assertRaises(httpx.ReadTimeout):
+            await client.aplace_order({"ticker": "TCS"})
+        self.assertEqual(len(calls), 1)
+        await client.aclose()
+
+    async def test_order_retried_when_connect_fails(self):
+        """A POST that never reached the broker is safe to retry."""
+        attempts = []
+
+        def handler(request):
+            attempts.append(request)
+            if len(attempts) == 1:
+                raise httpx.ConnectError("refused", request=request)
+            return httpx.Response(200, json={"order_id": "X1"})
+
+        client = APIClient(_config(), transport=httpx.MockTransport(handler))
+        self.assertEqual(await client.aplace_order({"ticker": "TCS"}), {"order_id": "X1"})
+        self.assertEqual(len(attempts), 2)
+        await client.aclose()
+
+    def test_sync_wrapper_uses_background_loop(self):
+        """The sync API returns the same result as the async one."""
+        client = APIClient(_config(), transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, json={"balance": 1000, "path": request.url.path})
+        ))
+        try:
+            self.assertEqual(client.get_account_balance(), {"balance": 1000, "path": "/user/balance"})
+        finally:
+            client.close()
+
+class TestRequestScheduler(unittest.IsolatedAsyncioTestCase):
+    async def test_orders_jump_a_backfill_within_the_limit(self):
+        """Queued historical pulls respect the limit and leave the reserved slot to an order."""
+        scheduler = RequestScheduler(limits=((4, 0.2),), order_reserve=1)
+        granted = []
+
+        async def request(lane, i):
+            await scheduler.acquire(lane)
+            granted.append((lane, i))
+
+        started = asyncio.get_running_loop().time()
+        backfill = [asyncio.create_task(request("historical", i)) for i in range(8)]
+        await asyncio.sleep(0.01)
+        await asyncio.wait_for(request("order", 0), 0.05)
+        await asyncio.gather(*backfill)
+
+        self.assertEqual(granted.index(("order", 0)), 3)
+        # 3 immediately, then one slot per 50ms once the reserve has refilled
+        self.assertGreaterEqual(asyncio.get_running_loop().time() - started, 0.25)
+        stats = scheduler.stats()
+        self.assertEqual((stats["historical"]["requests"], stats["order"]["requests"]), (8, 1))
+        self.assertGreater(stats["historical"]["wait_ms"]["max"], 50)
+
+    async def test_cancelled_after_grant_returns_the_token(self):
+        scheduler = RequestScheduler(limits=((1, 60.0),), order_reserve=0)
+        await scheduler.acquire("account")
+        waiter = asyncio.create_task(scheduler.acquire("account"))
+        await asyncio.sleep(0)
+        scheduler.buckets[0].tokens = 1.0
+        scheduler._pump()
+        # Cancelled before the grant reaches the caller
+        waiter.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiter
+        self.assertAlmostEqual(scheduler.buckets[0].tokens, 1.0, places=2)
+        self.assertEqual(scheduler.granted["account"], 1)
+        await asyncio.wait_for(scheduler.acquire("account"), 0.1)
+
+    async def test_waiter_from_a_closed_loop_does_not_stall_others(self):
+        from src.data_handler.request_scheduler import _Ticket
+
+        scheduler = RequestScheduler(limits=((1, 0.1),), order_reserve=0)
+        await scheduler.acquire("account")
+        closed_loop = asyncio.new_event_loop()
+        scheduler.queues["order"].append(_Ticket(closed_loop))
+        closed_loop.close()
+
+        await asyncio.wait_for(scheduler.acquire("historical"), 1.0)
+        self.assertEqual(scheduler.granted["order"], 0)
+
+class TestFeedDecoders(unittest.TestCase):
+    def test_json_frame_with_many_instruments(self):
+        """A multi-instrument JSON frame decodes to one batch; other messages are ignored."""
+        decoder = JsonDecoder()
+        batch = decoder.decode(b'{"type": "ticks", "data": [{"ticker": "TCS", "price": 1.5, "volume": 10},'
+                               b' {"ticker": "INFY", "price": 2.5, "volume": 20}]}', ts_ns=7)
+        self.assertEqual([(e.ticker, e.price, e.volume, e.ts_ns) for e in batch],
+                         [("TCS", 1.5, 10, 7), ("INFY", 2.5, 20, 7)])
+        self.assertIsNone(decoder.decode('{"type": "heartbeat"}'))
+
+        depth = decoder.decode('{"type": "depth", "ticker": "TCS", "bids": [[3500.0, 10]], "asks": [], "ts": 9}')
+        self.assertEqual(depth, DepthEvent("TCS", ((3500.0, 10),), (), 9))
+
+    def test_binary_round_trip_drops_unknown_tokens(self):
+        """Packed frames decode to the same ticks; tokens without a ticker are skipped."""
+        decoder = BinaryDecoder({256265: "NIFTY", 2953217: "TCS"})
+        frame = decoder.encode([("TCS", 3500.5, 10), ("NIFTY", 18000.0, 5), ("TCS", 3501.0, 20)], ts_ns=123)
+        unknown = BinaryDecoder({99: "X"}).encode([("X", 1.0, 1)])[BinaryDecoder.HEADER.size:]
+        frame = BinaryDecoder.HEADER.pack(4, 123) + frame[BinaryDecoder.HEADER.size:] + unknown
+
+        batch = decoder.decode(frame)
+        self.assertEqual(batch.ts_ns, 123)
+        self.assertEqual([(e.ticker, e.price, e.volume) for e in batch],
+                         [("TCS", 3500.5, 10), ("NIFTY", 18000.0, 5), ("TCS", 3501.0, 20)])
+
+class TestOrderBook(unittest.TestCase):
+    def test_incremental_updates_keep_levels_sorted(self):
+        """Inserts, changes and removals keep both sides best-first with O(1) aggregates in sync."""
+        book = OrderBook("TCS", depth=3)
+        book.apply(DepthEvent("TCS", bids=((100.0, 5), (100.2, 1), (99.8, 4)), asks=((100.4, 2), (100.6, 6))))
+        book.apply(DepthEvent("TCS", bids=((100.2, 0), (100.1, 3)), asks=((100.4, 8),)))
+        # A better bid on a full side pushes out the worst one; a worse one is ignored
+        book.apply(DepthEvent("TCS", bids=((100.15, 2), (99.0, 9))))
+
+        self.assertEqual(book.snapshot()["bids"], [(100.15, 2), (100.1, 3), (100.0, 5)])
+        self.assertEqual((book.best_bid, book.best_ask), (100.15, 100.4))
+        self.assertAlmostEqual(book.spread, 0.25)
+        self.assertEqual(book.bids.total_size, 10)
+        self.assertAlmostEqual(book.imbalance(), (10 - 14) / 24)
+        self.assertAlmostEqual(book.imbalance(levels=1), (2 - 8) / 10)
+        self.assertAlmostEqual(book.weighted_mid(levels=1), (100.15 * 8 + 100.4 * 2) / 10)
+
+    def test_snapshot_and_fill_price(self):
+        """A snapshot replaces the side; fill prices walk the book and need enough depth."""
+        book = OrderBook("TCS")
+        book.apply(DepthEvent("TCS", asks=((101.0, 10), (100.5, 5)), snapshot=True))
+        self.assertEqual(book.snapshot()["asks"], [(100.5, 5), (101.0, 10)])
+        self.assertAlmostEqual(book.fill_price("BUY", 10), (100.5 * 5 + 101.0 * 5) / 10)
+        self.assertIsNone(book.fill_price("BUY", 16))
+        self.assertIsNone(book.weighted_mid())
+
+class _FakeFeed:
+    def __init__(self, config, name, bus, mock_feed, api_client=None):
+        self.name = name
+        self.subscribed = set()
+
+    async def subscribe(self, tickers):
+        self.subscribed |= set(tickers)
+
+    async def unsubscribe(self, tickers):
+        self.subscribed -= set(tickers)
+
+class TestSubscriptionManager(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.manager = SubscriptionManager(
+            _config(max_connections="3", max_instruments_per_connection="2"), manager_factory=_FakeFeed
+        )
+
+    def _layout(self):
+        return [sorted(shard.subscribed) for shard in self.manager.shards]
+
+    async def test_watchlist_sharded_within_caps(self):
+        """Instruments spread over new connections up to the caps; the rest wait."""
+        await self.manager.set_watchlist(["A", "B", "C", "D", "E", "F", "G"])
+        self.assertEqual(self._layout(), [["A", "D"], ["B", "E"], ["C", "F"]])
+        self.assertEqual(self.manager.pending, ["G"])
+
+    async def test_changes_only_touch_the_difference(self):
+        """Kept instruments stay on their connection; freed slots are reused."""
+        await self.manager.set_watchlist(["A", "B", "C", "D", "E", "F", "G"])
+        await self.manager.set_watchlist(["A", "C", "D", "E", "F", "G", "H"])
+        self.assertEqual(self._layout(), [["A", "D"], ["E", "G"], ["C", "F"]])
+        self.assertEqual(self.manager.pending, ["H"])
+
+class TestFeedBackfill(unittest.IsolatedAsyncioTestCase):
+    async def test_backfill_publishes_missed_bars_in_order(self):
+        """Only completed bars inside the outage are published, oldest first, as synthetic bars."""
+        async def bars(ticker, interval, from_date, to_date):
+            offset = {"TCS": 0, "INFY": 1}[ticker]
+            return [{"date": f"2024-01-02T09:{minute:02d}:00", "open": 1 + offset, "high": 2, "low": 0.5,
+                     "close": 1.5, "volume": 10} for minute in range(15, 21)]
+
+        api = Mock()
+        api.aget_historical_data = AsyncMock(side_effect=bars)
+        bus = EventBus()
+        subscription = bus.subscribe("bars", (BarEvent,))
+        feed = WebsocketManager(_config(), bus=bus, api_client=api)
+        feed.subscribed = {"TCS", "INFY"}
+
+        # Outage from 09:16:30 to 09:19:10 IST: the 09:16, 09:17 and 09:18 bars completed in between
+        minute = 60 * 10**9
+        start_ns = 1704167100 * 10**9 + minute + minute // 2
+        count = await feed.backfill(start_ns, start_ns + 2 * minute + 40 * 10**9)
+
+        published = [subscription.get_nowait() for _ in range(subscription.qsize())]
+        self.assertEqual(count, 6)
+        self.assertEqual([(bar.ts_ns - 1704167100 * 10**9) // minute for bar in published], [1, 1, 2, 2, 3, 3])
+        self.assertTrue(all(bar.synthetic and bar.interval == "1minute" for bar in published))
+        self.assertEqual(api.aget_historical_data.await_args.args[1:], ("1minute", "2024-01-02", "2024-01-02"))
+        self.assertEqual(feed.stats()["backfilled_bars"], 6)
+
+    async def test_listener_error_closes_the_socket(self):
+        """A socket dropped after an unexpected error is closed, not leaked into the reconnect."""
+        feed = WebsocketManager(_config(), bus=EventBus())
+        websocket = Mock()
+        websocket.recv = AsyncMock(side_effect=RuntimeError("bad frame"))
+        websocket.close = AsyncMock()
+        feed.websocket = websocket
+
+        await feed.listen()
+
+        websocket.close.assert_awaited_once()
+        self.assertIsNone(feed.websocket)
+
+    async def test_failed_first_connect_is_retried(self):
+        """Outside demo mode a feed that can't connect at start-up backs off and retries, not simulates."""
+        feed = WebsocketManager(_config(reconnect_delay_seconds="0", demo_mode="false"), bus=EventBus())
+        feed.subscribed = {"TCS"}
+        websocket = Mock()
+        websocket.send = AsyncMock()
+        websocket.close = AsyncMock()
+
+        async def recv():
+            feed._closing = True
+            raise RuntimeError("stop")
+
+        websocket.recv = recv
+        connect = AsyncMock(side_effect=[OSError("refused"), OSError("refused"), websocket])
+        with patch("src.data_handler.websocket_manager.websockets.connect", connect):
+            await asyncio.wait_for(feed.run(), 5)
+
+        self.assertEqual(connect.await_count, 3)
+        self.assertFalse(feed.mock_mode)
+        websocket.send.assert_awaited_once()
+
+    async def test_failed_first_connect_simulates_in_demo_mode(self):
+        feed = WebsocketManager(_config(demo_mode="true"), bus=EventBus(), mock_feed=False)
+        with patch("src.data_handler.websocket_manager.websockets.connect", AsyncMock(side_effect=OSError("refused"))):
+            await asyncio.wait_for(feed.run(), 5)
+        self.assertTrue(feed.mock_mode)
+
+class TestHistoricalDataCache(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.archive = ParquetArchive(self.tmp_dir.name)
+        self.api = Mock()
+        self.api.aget_historical_data = AsyncMock(side_effect=self._bars)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    @staticmethod
+    async def _bars(ticker, interval, from_date, to_date):
+        start, end = date.fromisoformat(from_date), date.fromisoformat(to_date)
+        days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+        return [{"date": f"{day}T09:15:00", "open": 1, "high": 2, "low": 0.5, "close": 1.5, "volume": 10}
+                for day in days]
+
+    def test_subtract_ranges(self):
+        """Only the days outside the covered ranges are left."""
+        d = date.fromisoformat
+        covered = [(d("2024-01-03"), d("2024-01-05")), (d("2024-01-08"), d("2024-01-09"))]
+        self.assertEqual(
+            subtract_ranges((d("2024-01-01"), d("2024-01-10")), covered),
+            [(d("2024-01-01"), d("2024-01-02")), (d("2024-01-06"), d("2024-01-07")), (d("2024-01-10"), d("2024-01-10"))]
+        )
+
+    async def test_second_request_only_fetches_gap(self):
+        """A widened range downloads only the new days and serves the rest from disk."""
+        cache = HistoricalDataCache(self.api, self.archive)
+        first = await cache.get("TCS", "1day", "2024-01-01", "2024-01-10")
+        self.assertEqual(len(first), 10)
+
+        # A fresh instance reloads the coverage index from disk
+        cache = HistoricalDataCache(self.api, self.archive)
+        second = await cache.get("TCS", "1day", "2024-01-05", "2024-01-15")
+        self.assertEqual(len(second), 11)
+        self.assertEqual(self.api.aget_historical_data.await_args_list[-1].args,
+                         ("TCS", "1day", "2024-01-11", "2024-01-15"))
+        self.assertEqual(self.api.aget_historical_data.await_count, 2)
+
+    async def test_today_is_refetched_without_duplicates(self):
+        """Today's forming bars are fetched again on every call and replace the old copy."""
+        today = date.fromisoformat(self.archive.today())
+        cache = HistoricalDataCache(self.api, self.archive)
+        await cache.get("TCS", "1day", today - timedelta(days=2), today)
+        bars = await cache.get("TCS", "1day", today - timedelta(days=2), today)
+
+        self.assertEqual(len(bars), 3)
+        self.assertEqual(self.api.aget_historical_data.await_args_list[-1].args[2:],
+                         (today.isoformat(), today.isoformat()))
+
+    async def test_archive_io_runs_off_the_event_loop(self):
+        """Parquet reads and writes happen on worker threads, and concurrent requests still see whole partitions."""
+        threads = set()
+        for name in ("write_bars", "compact", "read_bars"):
+            method = getattr(self.archive, name)
+
+            def traced(*args, _method=method, **kwargs):
+                threads.add(threading.current_thread())
+                return _method(*args, **kwargs)
+
+            setattr(self.archive, name, traced)
+        cache = HistoricalDataCache(self.api, self.archive)
+        results = await asyncio.gather(
+            *(cache.get(ticker, "1day", "2024-01-01", "2024-01-10") for ticker in ("TCS", "INFY", "TCS"))
+        )
+
+        self.assertEqual([len(bars) for bars in results], [10, 10, 10])
+        self.assertNotIn(threading.main_thread(), threads)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import unittest
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+# Add src to path for testing
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from src.core.database import Database
+
+class TestDatabase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db = Database(None, db_path=os.path.join(self.tmp_dir.name, "app_data.db"))
+
+    def tearDown(self):
+        self.db.close()
+        self.tmp_dir.cleanup()
+
+    def _trade(self, order_id):
+        return {'ticker': 'TCS', 'action': 'BUY', 'quantity': 10, 'price': 3500.0, 'order_id': order_id}
+
+    async def test_trade_is_durable_after_await(self):
+        """Awaiting a saved trade waits for its commit."""
+        await asyncio.wrap_future(self.db.save_trade(self._trade("A1")))
+
+        history = self.db.get_trade_history()
+        self.assertEqual(len(history), 1)
+        self.assertEqual(history[0][6], "A1")
+
+    async def test_barrier_flushes_batched_rows(self):
+        """A barrier commits every row queued before it."""
+        for i in range(50):
+            self.db.save_signal({'ticker': 'INFY', 'signal': 'BUY', 'confidence': 0.5, 'reason': str(i)})
+        await self.db.barrier()
+
+        count = self.db.conn.execute("SELECT COUNT(*) FROM signals").fetchone()[0]
+        self.assertEqual(count, 50)
+
+    async def test_writer_crash_fails_pending_writes(self):
+        """If the writer thread dies, awaiting writes and barriers fail instead of hanging."""
+        with patch.object(Database, "_flush", side_effect=RuntimeError("disk on fire")):
+            trade = self.db.save_trade(self._trade("A1"))
+            with self.assertRaises(RuntimeError):
+                await asyncio.wait_for(self.db.barrier(), 2.0)
+            with self.assertRaises(RuntimeError):
+                await asyncio.wait_for(asyncio.wrap_future(trade), 2.0)
+        self.db._writer.join(2.0)
+        self.assertFalse(self.db._writer.is_alive())
+        with self.assertRaises(RuntimeError):
+            await asyncio.wait_for(asyncio.wrap_future(self.db.save_trade(self._trade("A2"))), 2.0)
+
+    async def test_bad_row_does_not_lose_batch(self):
+        """A duplicate order id fails alone; the rest of the batch is written."""
+        first = self.db.save_trade(self._trade("dup"))
+        second = self.db.save_trade(self._trade("dup"))
+        third = self.db.save_trade(self._trade("B2"))
+
+        await asyncio.wrap_future(third)
+        self.assertIsNone(first.result())
+        self.assertIsNotNone(second.exception())
+        self.assertEqual(len(self.db.get_trade_history()), 2)
+
+    def test_close_drains_pending_writes(self):
+        """Closing the database commits everything still queued."""
+        path = self.db.db_path
+        self.db.save_signal({'ticker': 'SBIN', 'signal': 'SELL', 'confidence': 0.7, 'reason': 'test'})
+        self.db.close()
+
+        self.db = Database(None, db_path=str(path))
+        count = self.db.conn.execute("SELECT COUNT(*) FROM signals").fetchone()[0]
+        self.assertEqual(count, 1)
+
+    async def test_ticks_roll_up_into_bars(self):
+        """Ticks saved in separate batches merge into one OHLCV bar per bucket."""
+        base = 1_700_000_040 * 1_000_000_000  # aligned to a minute
+        self.db.save_ticks([("TCS", base, 100.0, 5), ("TCS", base + 10**8, 105.0, 3)])
+        self.db.save_ticks([("TCS", base + 2 * 10**9, 98.0, 2), ("INFY", base, 50.0, 1)])
+        await self.db.barrier()
+
+        bars = self.db.get_bars("TCS", "1m", base, base + 60 * 10**9, as_frame=False)
+        self.assertEqual(bars["ts"].tolist(), [base])
+        self.assertEqual(
+            [bars[k][0] for k in ("open", "high", "low", "close", "volume")], [100.0, 105.0, 98.0, 98.0, 10]
+        )
+        seconds = self.db.get_bars("TCS", "1s", base, base + 60 * 10**9, as_frame=False)
+        self.assertEqual(seconds["close"].tolist(), [105.0, 98.0])
+
+    async def test_downsample_matches_ingest_rollup(self):
+        """Rebuilding minute bars from ticks gives the same bars as the live roll-up."""
+        base = 1_700_000_040 * 1_000_000_000
+        ticks = [("SBIN", base + i * 7 * 10**9, 600.0 + (i * 37) % 11, i + 1) for i in range(20)]
+        self.db.save_ticks(ticks)
+        await self.db.barrier()
+        live = self.db.conn.execute("SELECT * FROM bars_1m ORDER BY ts").fetchall()
+
+        self.db.conn.execute("DELETE FROM bars_1m")
+        self.db.conn.commit()
+        self.db.downsample("ticks", "1m", base, base + 3600 * 10**9)
+        await self.db.barrier()
+        self.assertEqual(self.db.conn.execute("SELECT * FROM bars_1m ORDER BY ts").fetchall(), live)
+
+    async def test_retention_prunes_old_ticks(self):
+        """Ticks older than the retention window are deleted; bars are not."""
+        old = 1_000_000_000 * 1_000_000_000
+        self.db.save_ticks([("TCS", old, 100.0, 1)])
+        self.db.apply_retention({"ticks": 7})
+        await self.db.barrier()
+
+        self.assertEqual(self.db.conn.execute("SELECT COUNT(*) FROM ticks").fetchone()[0], 0)
+        self.assertEqual(self.db.conn.execute("SELECT COUNT(*) FROM bars_1d").fetchone()[0], 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+import unittest
+import asyncio
+import sys
+from pathlib import Path
+from datetime import datetime
+
+# Add src to path for testing
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from src.core.event_bus import EventBus
+from src.core.metrics import LatencyHistogram
+from src.core.event_types import MarketEvent, MarketEventBatch, NewsEvent, FillEvent
+
+class TestEventBus(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.bus = EventBus(default_maxsize=10)
+
+    def _market_event(self, ticker="TCS", price=3500.0):
+        return MarketEvent(ticker=ticker, price=price, volume=100)
+
+    async def test_fan_out_to_all_subscribers(self):
+        """Every matching subscriber receives the event."""
+        fuser = self.bus.subscribe("fuser", (MarketEvent,))
+        ui = self.bus.subscribe("ui", (MarketEvent,))
+
+        event = self._market_event()
+        await self.bus.put(event)
+
+        self.assertIs(await fuser.get(), event)
+        self.assertIs(await ui.get(), event)
+
+    async def test_subscribe_by_event_type(self):
+        """Subscribers only receive the event types they asked for."""
+        news = self.bus.subscribe("news", (NewsEvent,))
+        everything = self.bus.subscribe("journal")
+
+        await self.bus.put(self._market_event())
+
+        self.assertEqual(news.qsize(), 0)
+        self.assertEqual(everything.qsize(), 1)
+
+    async def test_unsubscribe_stops_delivery(self):
+        """Closed subscriptions no longer receive events."""
+        subscription = self.bus.subscribe("fills", (FillEvent,))
+        subscription.close()
+
+        self.assertEqual(self.bus.subscribers_for(FillEvent), ())
+
+    async def test_full_queue_applies_backpressure(self):
+        """Publishing to a full subscriber waits until it is drained."""
+        subscription = self.bus.subscribe("slow", (MarketEvent,), maxsize=1)
+        await self.bus.put(self._market_event(price=1.0))
+
+        publish = asyncio.create_task(self.bus.put(self._market_event(price=2.0)))
+        await asyncio.sleep(0)
+        self.assertFalse(publish.done())
+
+        self.assertEqual((await subscription.get()).price, 1.0)
+        await publish
+        self.assertEqual((await subscription.get()).price, 2.0)
+
+class TestConflatingQueue(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.bus = EventBus(high_water_mark=3)
+
+    def _market_event(self, ticker, price, volume=100):
+        return MarketEvent(ticker=ticker, price=price, volume=volume)
+
+    def _fill_event(self, order_id):
+        return FillEvent(timestamp=datetime.now(), ticker="TCS", action="BUY",
+                         quantity=1, price=3500.0, order_id=order_id)
+
+    async def test_keeps_latest_tick_per_ticker(self):
+        """Only the newest tick per ticker is delivered, in first-arrival order."""
+        subscription = self.bus.subscribe("ui", (MarketEvent,), conflate=True)
+        for price in (1.0, 2.0, 3.0):
+            await self.bus.put(self._market_event("TCS", price))
+        await self.bus.put(self._market_event("INFY", 10.0))
+
+        self.assertEqual(subscription.qsize(), 2)
+        self.assertEqual(subscription.coalesced, 2)
+        self.assertEqual((await subscription.get()).price, 3.0)
+        self.assertEqual((await subscription.get()).ticker, "INFY")
+
+    async def test_merge_volume(self):
+        """Conflated ticks can accumulate their volume."""
+        self.bus.merge_volume = True
+        subscription = self.bus.subscribe("bars", (MarketEvent,), conflate=True)
+        await self.bus.put(self._market_event("TCS", 1.0, volume=100))
+        await self.bus.put(self._market_event("TCS", 2.0, volume=50))
+
+        event = await subscription.get()
+        self.assertEqual((event.price, event.volume), (2.0, 150))
+
+    async def test_batch_expanded_to_latest_ticks(self):
+        """A conflating subscriber receives a batch as the newest tick per ticker."""
+        subscription = self.bus.subscribe("ui", (MarketEvent, MarketEventBatch), conflate=True)
+        await self.bus.put(MarketEventBatch.from_ticks([("TCS", 1.0, 1), ("INFY", 5.0, 1), ("TCS", 2.0, 1)]))
+
+        delivered = [subscription.get_nowait() for _ in range(subscription.qsize())]
+        self.assertEqual([(e.ticker, e.price) for e in delivered], [("TCS", 2.0), ("INFY", 5.0)])
+
+    async def test_high_water_mark_never_drops_fills(self):
+        """Above the high-water mark only non-critical events are dropped."""
+        subscription = self.bus.subscribe("dispatcher", conflate=True)
+        await self.bus.put(self._fill_event("1"))
+        for ticker in ("A", "B", "C", "D"):
+            await self.bus.put(self._market_event(ticker, 1.0))
+        await self.bus.put(self._fill_event("2"))
+
+        self.assertEqual(subscription.qsize(), 3)
+        self.assertEqual(subscription.dropped, 3)
+        delivered = [subscription.get_nowait() for _ in range(3)]
+        self.assertEqual([getattr(e, "order_id", e.ticker) for e in delivered], ["1", "D", "2"])
+
+class TestBusInstrumentation(unittest.IsolatedAsyncioTestCase):
+    async def test_get_stats_records_wait_and_handler_time(self):
+        """Wait and handler time are tracked per consumer and event type."""
+        bus = EventBus()
+        subscription = bus.subscribe("fuser", (MarketEvent,))
+        await bus.put(MarketEvent(ticker="TCS", price=1.0, volume=1))
+
+        await subscription.get()
+        subscription.task_done()
+        subscription.sample_depth()
+
+        stats = bus.get_stats()["fuser"]
+        self.assertEqual(stats["depth"], 0)
+        self.assertEqual(stats["wait_us"]["MarketEvent"]["count"], 1)
+        self.assertEqual(stats["handler_us"]["MarketEvent"]["count"], 1)
+
+    def test_histogram_percentiles(self):
+        """Percentiles stay within the histogram's relative error."""
+        histogram = LatencyHistogram()
+        for value in range(1, 10001):
+            histogram.record(value)
+
+        self.assertEqual(histogram.count, 10000)
+        self.assertEqual(histogram.max, 10000)
+        self.assertAlmostEqual(histogram.percentile(50), 5000, delta=5000 * 0.02)
+        self.assertAlmostEqual(histogram.percentile(99), 9900, delta=9900 * 0.02)
+
+if __name__ == "__main__":
+    unittest.main()
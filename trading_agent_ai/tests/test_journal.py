@@ -0,0 +1,70 @@
+import unittest
+import os
+import sys
+import tempfile
+from pathlib import Path
+from datetime import datetime
+
+# Add src to path for testing
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from src.core.event_bus import EventBus
+from src.core.event_types import BarEvent, MarketEvent, FillEvent, NewsEvent, PnLUpdateEvent
+from src.core.journal import CODECS, JournalWriter, JournalReader, JournalReplayer, decode_event
+
+class TestEventJournal(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "session.journal")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _write(self, events):
+        writer = JournalWriter(self.path, chunk_size=256)
+        for enqueued_ns, event in events:
+            writer.append(enqueued_ns, event)
+        writer.close()
+        return writer
+
+    def test_round_trip(self):
+        """Events read back equal to what was written, across file growth."""
+        fill = FillEvent(timestamp=datetime(2024, 1, 2, 9, 15, 0, 123456), ticker="TCS",
+                         action="BUY", quantity=10, price=3500.5, order_id="A1")
+        bar = BarEvent("TCS", "1minute", 1704166500 * 10**9, 3500.0, 3510.0, 3495.5, 3502.0, 1200, synthetic=True)
+        news = NewsEvent(datetime(2024, 1, 2, 9, 16), "TCS, Infosys rally", "Mint", 0.6, tickers=("TCS", "INFY"))
+        ticks = [(i, MarketEvent("INFY", 1500.0 + i, i)) for i in range(50)]
+        self._write(ticks + [(99, fill), (100, bar), (101, news)])
+
+        with JournalReader(self.path) as reader:
+            records = list(reader)
+
+        self.assertEqual(records, ticks + [(99, fill), (100, bar), (101, news)])
+
+    def test_news_records_without_tickers_still_decode(self):
+        """NewsEvents journaled before tickers were added read back as market-wide news."""
+        news = NewsEvent(datetime(2024, 1, 2, 9, 16), "RBI holds rates", "Mint", 0.1)
+        self.assertEqual(decode_event(2, memoryview(CODECS[2].encode(news))), news)
+
+    def test_unsupported_events_are_skipped(self):
+        """Event types without a codec are counted, not written."""
+        writer = self._write([(1, PnLUpdateEvent(timestamp=datetime.now(), pnl=0.0, portfolio_value=1.0))])
+
+        self.assertEqual(writer.skipped, 1)
+        with JournalReader(self.path) as reader:
+            self.assertEqual(list(reader), [])
+
+    async def test_replay_publishes_in_order(self):
+        """Replay re-publishes recorded input events onto the bus."""
+        self._write([(i, MarketEvent("TCS", float(i), 1)) for i in range(5)])
+        bus = EventBus()
+        received = []
+        bus.add_tap(lambda item: received.append(item[1].price))
+
+        published = await JournalReplayer(self.path, bus).run()
+
+        self.assertEqual(published, 5)
+        self.assertEqual(received, [0.0, 1.0, 2.0, 3.0, 4.0])
+
+if __name__ == "__main__":
+    unittest.main()
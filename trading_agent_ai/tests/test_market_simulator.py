@@ -0,0 +1,64 @@
+import unittest
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path for testing
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from src.core.event_bus import EventBus
+from src.core.event_types import MarketEvent, MarketEventBatch
+from src.data_handler.market_simulator import MarketSimulator, circuit_breaker
+
+def _ticks(event):
+    if event is None:
+        return []
+    events = event if isinstance(event, MarketEventBatch) else [event]
+    return [(e.ticker, e.price, e.volume, e.ts_ns) for e in events]
+
+class TestMarketSimulator(unittest.IsolatedAsyncioTestCase):
+    def test_same_seed_same_ticks(self):
+        """A seed fully determines the generated feed."""
+        runs = []
+        for _ in range(2):
+            simulator = MarketSimulator(rate=500, seed=42, start_ns=0)
+            runs.append([tick for _ in range(200) for tick in _ticks(simulator.step())])
+        self.assertEqual(runs[0], runs[1])
+        self.assertNotEqual(runs[0], [tick for _ in range(200)
+                                      for tick in _ticks(MarketSimulator(rate=500, seed=7, start_ns=0).step())])
+
+    def test_rate_is_reached(self):
+        """Tick counts track the target rate, including at 100k ticks/s."""
+        for rate in (50, 100000):
+            simulator = MarketSimulator(rate=rate, seed=1, profile=False)
+            for _ in range(500):
+                simulator.step()
+            self.assertAlmostEqual(simulator.stats()["ticks_per_simulated_second"] / rate, 1.0, delta=0.1)
+
+    def test_circuit_breaker_crashes_then_halts(self):
+        """The circuit breaker scenario drops prices by the configured move and then stops ticking."""
+        simulator = MarketSimulator({"NIFTY": 18000.0}, rate=1000, volatility=0.0, jumps_per_day=0,
+                                    profile=False, seed=3,
+                                    scenario=circuit_breaker(trigger_after=1, crash_seconds=1, halt_seconds=1))
+        while simulator.elapsed < 2.0:
+            simulator.step()
+        self.assertAlmostEqual(np.exp(simulator.log_prices[0]) / 18000.0, 0.9, places=3)
+        self.assertEqual([simulator.step() for _ in range(50)], [None] * 50)
+
+    async def test_run_publishes_to_bus(self):
+        """Unpaced runs publish every generated tick onto the bus."""
+        bus = EventBus()
+        subscription = bus.subscribe("load", (MarketEvent, MarketEventBatch))
+        simulator = MarketSimulator(rate=2000, seed=5, speed=0)
+        await simulator.run(bus, duration=0.5)
+
+        published = 0
+        while subscription.qsize():
+            event = subscription.get_nowait()
+            published += len(event) if isinstance(event, MarketEventBatch) else 1
+        self.assertEqual(published, simulator.ticks)
+        self.assertGreater(published, 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,276 @@
+import asyncio
+import os
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime
+from unittest.mock import Mock, patch
+import sys
+from pathlib import Path
+
+import httpx
+import numpy as np
+
+# Add src to path for testing
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from src.core.event_bus import EventBus
+from src.core.event_types import NewsEvent
+from src.news_handler.entity_linker import EntityLinker
+from src.news_handler.headline_dedup import HeadlineDedup
+from src.news_handler.rss_fetcher import RSSFetcher
+from src.news_handler.sentiment_aggregator import SentimentAggregator
+
+FEEDS = ["https://a.test/rss", "https://b.test/rss", "https://c.test/rss"]
+
+def _rss(title, headline):
+    return (f'<?xml version="1.0"?><rss version="2.0"><channel><title>{title}</title>'
+            f'<item><title>{headline}</title></item></channel></rss>').encode()
+
+def _config(**overrides):
+    settings = {"rss_feeds": ",".join(FEEDS), "feed_timeout_seconds": "1"}
+    settings.update(overrides)
+    config = Mock()
+    config.get.side_effect = lambda section, key, fallback=None: settings.get(key, fallback)
+    config.get_main_config.side_effect = config.get.side_effect
+    return config
+
+class TestRSSFetcher(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.requests = []
+
+        async def handler(request):
+            self.requests.append(request)
+            await asyncio.sleep(0.2)
+            host = request.url.host
+            if request.headers.get("If-None-Match") == f'"{host}-1"':
+                return httpx.Response(304)
+            if host == "c.test":
+                return httpx.Response(503)
+            return httpx.Response(200, content=_rss(host, f"Headline from {host}"), headers={"ETag": f'"{host}-1"'})
+
+        self.bus = EventBus()
+        self.news = self.bus.subscribe("news", (NewsEvent,))
+        self.fetcher = RSSFetcher(_config(), bus=self.bus, transport=httpx.MockTransport(handler))
+
+    async def test_feeds_fetched_concurrently(self):
+        """A cycle takes one round trip, and a failing feed doesn't stop the others."""
+        started = asyncio.get_running_loop().time()
+        await self.fetcher._fetch_all_feeds()
+        self.assertLess(asyncio.get_running_loop().time() - started, 0.5)
+
+        headlines = sorted(self.news.get_nowait().headline for _ in range(self.news.qsize()))
+        self.assertEqual(headlines, ["Headline from a.test", "Headline from b.test"])
+        self.assertEqual(self.fetcher.stats, {"fetched": 2, "not_modified": 0, "errors": 1, "timeouts": 0,
+                                              "duplicates": 0})
+
+    async def test_unchanged_feeds_cost_a_304(self):
+        """The next poll sends the stored ETag and an unchanged feed is not parsed again."""
+        await self.fetcher._fetch_all_feeds()
+        await self.fetcher._fetch_all_feeds()
+
+        second = {request.url.host: request.headers.get("If-None-Match") for request in self.requests[3:]}
+        self.assertEqual(second, {"a.test": '"a.test-1"', "b.test": '"b.test-1"', "c.test": None})
+        self.assertEqual(self.fetcher.stats["not_modified"], 2)
+        self.assertEqual(self.news.qsize(), 2)
+
+    async def test_stalled_feed_is_skipped(self):
+        """A feed still sending after feed_timeout is dropped for the cycle; the others are published."""
+        async def handler(request):
+            if request.url.host == "c.test":
+                await asyncio.sleep(10)
+            host = request.url.host
+            return httpx.Response(200, content=_rss(host, f"Headline from {host}"))
+
+        fetcher = RSSFetcher(_config(feed_timeout_seconds="0.3"), bus=self.bus,
+                             transport=httpx.MockTransport(handler))
+        started = asyncio.get_running_loop().time()
+        await fetcher._fetch_all_feeds()
+        self.assertLess(asyncio.get_running_loop().time() - started, 1.0)
+
+        self.assertEqual(self.news.qsize(), 2)
+        self.assertEqual((fetcher.stats["timeouts"], fetcher.stats["errors"]), (1, 0))
+
+    async def test_unpublished_headlines_are_retried(self):
+        """A headline is only remembered once published, so a cycle that fails to publish is retried in full."""
+        put = self.bus.put
+
+        async def failing_put(event):
+            raise RuntimeError("bus closed")
+
+        self.bus.put = failing_put
+        with self.assertRaises(RuntimeError):
+            await self.fetcher._fetch_all_feeds()
+        self.bus.put = put
+        await self.fetcher._fetch_all_feeds()
+
+        headlines = sorted(self.news.get_nowait().headline for _ in range(self.news.qsize()))
+        self.assertEqual(headlines, ["Headline from a.test", "Headline from b.test"])
+        self.assertEqual((self.fetcher.stats["not_modified"], self.fetcher.stats["duplicates"]), (0, 0))
+
+    async def test_syndicated_headline_published_once_per_cycle(self):
+        async def handler(request):
+            return httpx.Response(200, content=_rss(request.url.host, "Sensex hits record high"))
+
+        fetcher = RSSFetcher(_config(), bus=self.bus, transport=httpx.MockTransport(handler))
+        await fetcher._fetch_all_feeds()
+        self.assertEqual(self.news.qsize(), 1)
+        self.assertEqual(fetcher.stats["duplicates"], 2)
+
+    async def test_failed_cycle_does_not_stop_fetching(self):
+        """An error after the feeds are fetched is logged and the next cycle still runs."""
+        fetcher = RSSFetcher(_config(news_fetch_interval_seconds="0"), bus=self.bus,
+                             transport=self.fetcher._transport)
+        scored = asyncio.Event()
+        calls = []
+
+        async def ascore_many(texts):
+            calls.append(texts)
+            if len(calls) == 1:
+                raise RuntimeError("scorer down")
+            scored.set()
+            return [0.0] * len(texts)
+
+        fetcher.sentiment.ascore_many = ascore_many
+        with self.assertLogs("src.news_handler.rss_fetcher", level="ERROR"):
+            fetcher.start()
+            try:
+                await asyncio.wait_for(scored.wait(), 5)
+            finally:
+                fetcher.fetch_task.cancel()
+        self.assertGreaterEqual(len(calls), 2)
+
+class TestHeadlineDedup(unittest.TestCase):
+    def test_title_or_guid_marks_a_repeat(self):
+        """Re-posts with a new link and edits under the same GUID are both caught."""
+        dedup = HeadlineDedup(capacity=1000)
+        self.assertTrue(dedup.check_and_add("Sensex jumps 500 points!", "https://a.test/1", now=0))
+        self.assertFalse(dedup.check_and_add("  SENSEX jumps 500 points ", "https://b.test/9", now=1))
+        self.assertFalse(dedup.check_and_add("Sensex jumps 520 points", "https://a.test/1", now=2))
+        self.assertTrue(dedup.check_and_add("Nifty slips", "https://a.test/2", now=3))
+
+    def test_items_expire_after_the_window(self):
+        """An item is forgotten once its generation falls out of the window, also after a long pause."""
+        dedup = HeadlineDedup(window_seconds=70, generations=7, capacity=1000)
+        dedup.add("Old story", now=0)
+        self.assertTrue(dedup.seen("Old story", now=60))
+        self.assertFalse(dedup.seen("Old story", now=75))
+        dedup.add("Another story", now=80)
+        self.assertFalse(dedup.seen("Another story", now=1000))
+
+    def test_restart_keeps_seen_items(self):
+        """Saved filters are reloaded, so a restart does not republish the backlog."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "seen.npz")
+            dedup = HeadlineDedup(path, capacity=1000)
+            dedup.add("Budget announced", "guid-1")
+            dedup.save()
+            self.assertTrue(HeadlineDedup(path, capacity=1000).seen("Budget announced"))
+            self.assertFalse(HeadlineDedup(path, capacity=2000).seen("Budget announced"))
+
+    def test_concurrent_saves_do_not_share_the_temp_file(self):
+        """A shutdown save waits for one still running on a worker thread."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "seen.npz")
+            dedup = HeadlineDedup(path, capacity=1000)
+            dedup.add("Budget announced", "guid-1")
+            savez = np.savez
+            writing = []
+            overlapped = []
+
+            def slow_savez(*args, **kwargs):
+                overlapped.append(bool(writing))
+                writing.append(True)
+                time.sleep(0.05)
+                savez(*args, **kwargs)
+                writing.pop()
+
+            with patch("src.news_handler.headline_dedup.np.savez", slow_savez):
+                threads = [threading.Thread(target=dedup.save) for _ in range(2)]
+                for thread in threads:
+                    thread.start()
+                dedup.add("Nifty slips", "guid-2")
+                dedup.save()
+                for thread in threads:
+                    thread.join()
+
+            self.assertNotIn(True, overlapped)
+            self.assertTrue(HeadlineDedup(path, capacity=1000).seen("Nifty slips"))
+
+class TestEntityLinker(unittest.TestCase):
+    def setUp(self):
+        self.linker = EntityLinker({
+            "RELIANCE": ["Reliance", "Reliance Industries", "RIL"],
+            "RPOWER": ["Reliance Power"],
+            "TCS": ["Tata Consultancy Services"],
+            "LT": ["Larsen & Toubro", "L&T"],
+            "IDEA": ["Vodafone Idea"],
+        })
+
+    def test_names_short_forms_and_symbols(self):
+        self.assertEqual(self.linker.link("RIL and Tata Consultancy Services gain; L&T's order book grows"),
+                         ("RELIANCE", "TCS", "LT"))
+        self.assertEqual(self.linker.link("Markets close flat"), ())
+
+    def test_longest_alias_wins(self):
+        self.assertEqual(self.linker.link("Reliance Power jumps while Reliance slips"), ("RPOWER", "RELIANCE"))
+
+    def test_capitalised_aliases_match_only_in_capitals(self):
+        self.assertEqual(self.linker.link("A new idea for lt bonds"), ())
+        self.assertEqual(self.linker.link("IDEA rallies as Vodafone Idea raises funds"), ("IDEA",))
+
+class TestSentimentAggregator(unittest.TestCase):
+    def _news(self, minute, sentiment, tickers=()):
+        return NewsEvent(datetime(2024, 1, 2, 9, minute), "headline", "news.test", sentiment, tickers=tickers)
+
+    def test_decayed_mean_and_dispersion(self):
+        aggregator = SentimentAggregator(half_life_seconds=600)
+        for sentiment in (0.6, 0.2):
+            aggregator.on_event(self._news(15, sentiment, ("TCS",)))
+        now = datetime(2024, 1, 2, 9, 15).timestamp()
+
+        snapshot = aggregator.snapshot("TCS", now)
+        self.assertAlmostEqual(snapshot.mean, 0.4)
+        self.assertAlmostEqual(snapshot.dispersion, 0.2)
+        self.assertAlmostEqual(snapshot.weight, 2.0)
+        self.assertAlmostEqual(snapshot.score, 0.4 * 2 / 3)
+
+        later = aggregator.snapshot("TCS", now + 600)
+        self.assertAlmostEqual(later.weight, 1.0)
+        self.assertAlmostEqual(later.mean, 0.4)
+        self.assertAlmostEqual(later.score, 0.2)
+        self.assertEqual(later.count, 2)
+
+    def test_newer_headlines_weigh_more(self):
+        aggregator = SentimentAggregator(half_life_seconds=600)
+        aggregator.on_event(self._news(20, 0.9, ("TCS",)))
+        # Arrives late: ten minutes older, so it counts half
+        aggregator.on_event(self._news(10, -0.6, ("TCS",)))
+        self.assertAlmostEqual(aggregator.snapshot("TCS", datetime(2024, 1, 2, 9, 20).timestamp()).mean, 0.4)
+
+    def test_tickers_fall_back_to_market_news(self):
+        aggregator = SentimentAggregator(half_life_seconds=600)
+        now = datetime(2024, 1, 2, 9, 15).timestamp()
+        self.assertIsNone(aggregator.snapshot("TCS", now))
+
+        aggregator.on_event(self._news(15, -0.5))
+        aggregator.on_event(self._news(15, 0.8, ("RELIANCE",)))
+        self.assertAlmostEqual(aggregator.snapshot("TCS", now).mean, -0.5)
+        self.assertAlmostEqual(aggregator.snapshot("RELIANCE", now).mean, 0.8)
+        # Once its own news has faded, a ticker follows the market again
+        self.assertEqual(aggregator.snapshot("RELIANCE", now + 6 * 3600).count, 1)
+        self.assertAlmostEqual(aggregator.snapshot("RELIANCE", now + 6 * 3600).mean, -0.5)
+
+    def test_tuned_from_config(self):
+        config = _config(sentiment_half_life_seconds="600", sentiment_prior_weight="2", sentiment_min_weight="0.5")
+        aggregator = SentimentAggregator.from_config(config)
+        self.assertEqual((aggregator.half_life, aggregator.prior_weight, aggregator.min_weight), (600.0, 2.0, 0.5))
+        aggregator.on_event(self._news(15, 0.6, ("TCS",)))
+        now = datetime(2024, 1, 2, 9, 25).timestamp()
+        self.assertAlmostEqual(aggregator.snapshot("TCS", now).score, 0.6 * 0.5 / 2.5)
+        # Defaults when the keys are missing
+        self.assertEqual(SentimentAggregator.from_config(_config()).half_life, 3600.0)
+
+if __name__ == "__main__":
+    unittest.main()
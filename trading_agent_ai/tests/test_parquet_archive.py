@@ -0,0 +1,64 @@
+import unittest
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+
+# Add src to path for testing
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from src.data_handler.parquet_archive import ParquetArchive
+
+BASE_NS = 1_700_000_000 * 1_000_000_000  # 2023-11-15 03:43:20 IST
+DAY_NS = 86400 * 1_000_000_000
+
+class TestParquetArchive(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.archive = ParquetArchive(self.tmp_dir.name)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_ticks_partitioned_by_ticker_and_date(self):
+        """Each ticker/day lands in its own hive partition."""
+        self.archive.write_ticks([("TCS", BASE_NS, 100.0, 1), ("INFY", BASE_NS, 50.0, 2),
+                                  ("TCS", BASE_NS + DAY_NS, 101.0, 3)])
+
+        self.assertEqual(self.archive.partitions("ticks"),
+                         [("INFY", "2023-11-15"), ("TCS", "2023-11-15"), ("TCS", "2023-11-16")])
+
+    def test_read_filters_ticker_range_and_columns(self):
+        """Reads return only the requested ticker, [start, end) rows and columns."""
+        self.archive.write_ticks([("TCS", BASE_NS + i * 10**9, 100.0 + i, 1) for i in range(10)]
+                                 + [("INFY", BASE_NS + i * 10**9, 50.0, 1) for i in range(10)])
+
+        frame = self.archive.read("ticks", ["TCS"], BASE_NS + 2 * 10**9, BASE_NS + 5 * 10**9, columns=["price"])
+        self.assertEqual(list(frame.columns), ["price"])
+        self.assertEqual(frame["price"].tolist(), [102.0, 103.0, 104.0])
+
+    def test_bars_round_trip_and_compaction_dedup(self):
+        """Re-written bars replace older copies once the partition is compacted."""
+        index = pd.date_range("2024-01-01", periods=5, freq="min", tz="UTC")
+        bars = pd.DataFrame({"open": 1.0, "high": 2.0, "low": 0.5, "close": 1.5, "volume": 10}, index=index)
+        self.archive.write_bars("1m", bars, ticker="TCS")
+        self.archive.write_bars("1m", bars.iloc[-2:].assign(close=9.0), ticker="TCS")
+
+        self.assertEqual(self.archive.compact("bars_1m"), 1)
+        result = self.archive.read_bars("TCS", "1m")
+        self.assertEqual(list(result.index), list(index))
+        self.assertEqual(result["close"].tolist(), [1.5, 1.5, 1.5, 9.0, 9.0])
+        self.assertEqual(len(list((Path(self.tmp_dir.name) / "bars_1m").rglob("*.parquet"))), 1)
+
+    def test_writes_with_the_same_clock_keep_both_parts(self):
+        """Two writes to one partition within one clock tick do not overwrite each other."""
+        with patch("src.data_handler.parquet_archive.time.time_ns", return_value=BASE_NS):
+            self.archive.write_ticks([("TCS", BASE_NS, 100.0, 1)])
+            self.archive.write_ticks([("TCS", BASE_NS + 10**9, 101.0, 2)])
+
+        self.assertEqual(self.archive.read("ticks", ["TCS"])["price"].tolist(), [100.0, 101.0])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import asyncio
 import unittest
 from unittest.mock import Mock, patch
 import sys
@@ -6,7 +7,7 @@ from pathlib import Path
 # Add src to path for testing
 sys.path.append(str(Path(__file__).parent.parent / "src"))
 
-from src.core.sentiment import SentimentAnalyzer
+from src.core.sentiment import SentimentAnalyzer, SentimentService
 
 class TestSentimentAnalysis(unittest.TestCase):
     def setUp(self):
@@ -35,5 +36,65 @@ class TestSentimentAnalysis(unittest.TestCase):
         score = self.sentiment_analyzer.get_sentiment("")
         self.assertEqual(score, 0.0, "Empty text should return neutral sentiment")
 
+class TestSentimentService(unittest.TestCase):
+    def setUp(self):
+        self.analyzer = SentimentAnalyzer()
+        self.texts = [
+            "Stock market rallies to new highs, great profits expected!",
+            "Market crashes, huge losses, disaster for investors!",
+            "Stock  market rallies to new highs, great profits expected! ",
+            "The market is open today.",
+        ]
+
+    def test_batch_matches_single_scores_and_caches(self):
+        """score_many returns get_sentiment's scores in order, scoring each distinct text once."""
+        service = SentimentService(self.analyzer, executor="none")
+        expected = [self.analyzer.get_sentiment(text) for text in self.texts]
+        self.assertEqual(service.score_many(self.texts), expected)
+        self.assertEqual((service.hits, service.misses), (1, 3))
+
+        with patch.object(self.analyzer, "get_sentiment", side_effect=AssertionError("scored again")):
+            self.assertEqual(service.score_many(self.texts), expected)
+        self.assertEqual(service.stats()["hits"], 5)
+
+    def test_cache_evicts_least_recently_used(self):
+        service = SentimentService(self.analyzer, cache_size=2, executor="none")
+        service.score_many(self.texts[:2])
+        service.score(self.texts[0])
+        service.score(self.texts[3])
+        self.assertEqual(list(service.cache), [self.texts[0], self.texts[3]])
+
+    def test_batch_larger_than_cache_is_scored_once(self):
+        """Scores evicted while storing a large batch are not recomputed."""
+        texts = [f"Headline number {i} beats estimates" for i in range(10)]
+        with patch.object(self.analyzer, "get_sentiment", wraps=self.analyzer.get_sentiment) as scorer:
+            service = SentimentService(self.analyzer, cache_size=3, executor="none")
+            scores = service.score_many(texts)
+        self.assertEqual(scorer.call_count, 10)
+        self.assertEqual(scores, [self.analyzer.get_sentiment(text) for text in texts])
+        self.assertEqual(len(service.cache), 3)
+
+    def test_async_scoring_on_a_thread(self):
+        service = SentimentService(self.analyzer, executor="thread")
+        try:
+            scores = asyncio.run(service.ascore_many(self.texts))
+        finally:
+            service.close()
+        self.assertEqual(scores, [self.analyzer.get_sentiment(text) for text in self.texts])
+
+    def test_process_executor_falls_back_to_threads_in_a_worker(self):
+        """The news worker is daemonic and may not start a process pool."""
+        config = Mock()
+        settings = {"sentiment_executor": "process", "sentiment_workers": "2"}
+        config.get.side_effect = lambda section, key, fallback=None: settings.get(key, fallback)
+        with patch("src.core.sentiment.multiprocessing.current_process", return_value=Mock(daemon=True)):
+            service = SentimentService.from_config(config)
+        try:
+            self.assertEqual(service.executor_kind, "thread")
+            scores = asyncio.run(service.ascore_many(self.texts))
+        finally:
+            service.close()
+        self.assertEqual(scores, [self.analyzer.get_sentiment(text) for text in self.texts])
+
 if __name__ == "__main__":
     unittest.main()
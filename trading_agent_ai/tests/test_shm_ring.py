@@ -0,0 +1,50 @@
+import unittest
+import sys
+from pathlib import Path
+from datetime import datetime
+
+# Add src to path for testing
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from src.core.event_types import MarketEvent, NewsEvent
+from src.core.shm_ring import SharedRingBuffer
+
+class TestSharedRingBuffer(unittest.TestCase):
+    def setUp(self):
+        self.ring = SharedRingBuffer.create(size=256)
+
+    def tearDown(self):
+        self.ring.close()
+
+    def test_push_and_pop_in_order(self):
+        """Events come out in the order they were pushed."""
+        news = NewsEvent(timestamp=datetime(2024, 1, 2, 9, 15), headline="RBI holds rates",
+                         source="Mint", sentiment=0.1)
+        tick = MarketEvent("TCS", 3500.0, 10)
+        self.ring.push_event(news)
+        self.ring.push_event(tick)
+
+        self.assertEqual(self.ring.pop(), news)
+        self.assertEqual(self.ring.pop(), tick)
+        self.assertIsNone(self.ring.pop())
+
+    def test_wraps_around(self):
+        """Records keep flowing after the write position wraps."""
+        received = []
+        for i in range(100):
+            self.assertTrue(self.ring.push_event(MarketEvent("INFY", float(i), i)))
+            received.extend(event.volume for event in self.ring.drain())
+
+        self.assertEqual(received, list(range(100)))
+
+    def test_full_ring_drops_and_counts(self):
+        """A full ring rejects new events instead of overwriting unread ones."""
+        pushed = 0
+        while self.ring.push_event(MarketEvent("SBIN", 600.0, pushed)):
+            pushed += 1
+
+        self.assertEqual(self.ring.dropped, 1)
+        self.assertEqual([e.volume for e in self.ring.drain()], list(range(pushed)))
+
+if __name__ == "__main__":
+    unittest.main()
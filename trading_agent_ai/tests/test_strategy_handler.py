@@ -0,0 +1,80 @@
+import asyncio
+import unittest
+from unittest.mock import Mock
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add src to path for testing
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from src.core.event_bus import EventBus
+from src.core.event_types import DepthEvent, MarketEvent, NewsEvent
+from src.data_handler.order_book import OrderBook
+from src.news_handler.sentiment_aggregator import SentimentAggregator
+from src.strategy_handler.main_fuser import MainFuser
+from src.strategy_handler.strategies.multi_fusion import MultiFusionStrategy
+
+class TestMultiFusionStrategy(unittest.TestCase):
+    def test_book_imbalance_is_a_vote(self):
+        """A bid-heavy book confirms bullish news; without a book the signal is unchanged."""
+        strategy = MultiFusionStrategy()
+        tick = MarketEvent("TCS", 3500.0, 10)
+        news = NewsEvent(datetime(2024, 1, 2), "Strong quarter", "news.test", sentiment=0.8)
+        book = OrderBook("TCS")
+        book.apply(DepthEvent("TCS", bids=((3499.5, 900),), asks=((3500.5, 100),)))
+
+        self.assertEqual(strategy.calculate_signal(tick, news, None), "HOLD")
+        self.assertEqual(strategy.calculate_signal(tick, news, None, order_book=book), "BUY")
+
+    def test_rolling_sentiment_outvotes_a_stray_headline(self):
+        """One negative headline after several positive ones does not flip the news vote."""
+        strategy = MultiFusionStrategy()
+        tick = MarketEvent("TCS", 3500.0, 10)
+        book = OrderBook("TCS")
+        book.apply(DepthEvent("TCS", bids=((3499.5, 900),), asks=((3500.5, 100),)))
+        aggregator = SentimentAggregator()
+        headlines = [NewsEvent(datetime(2024, 1, 2, 9, minute), "TCS news", "news.test", sentiment, tickers=("TCS",))
+                     for minute, sentiment in ((10, 0.7), (12, 0.6), (14, 0.8), (16, -0.4))]
+        for news in headlines:
+            aggregator.on_event(news)
+        sentiment = aggregator.snapshot("TCS", datetime(2024, 1, 2, 9, 16).timestamp())
+
+        self.assertEqual(strategy.calculate_signal(tick, headlines[-1], None, order_book=book), "HOLD")
+        self.assertEqual(strategy.calculate_signal(tick, headlines[-1], None, order_book=book, sentiment=sentiment),
+                         "BUY")
+
+class TestMainFuser(unittest.IsolatedAsyncioTestCase):
+    async def test_news_only_reaches_the_tickers_it_mentions(self):
+        bus = EventBus()
+        fuser = MainFuser()
+        fuser.subscription = bus.subscribe("main_fuser", (MarketEvent,), conflate=True)
+        fuser.news_subscription = bus.subscribe("main_fuser_news", (NewsEvent,))
+        fuser.strategy = Mock()
+        fuser.strategy.calculate_signal.return_value = "HOLD"
+        tasks = [asyncio.create_task(fuser._listen_for_events(subscription))
+                 for subscription in (fuser.subscription, fuser.news_subscription)]
+        try:
+            await bus.put(MarketEvent("RELIANCE", 2500.0, 10))
+            await bus.put(MarketEvent("TCS", 3500.0, 10))
+            await bus.join()
+            fuser.strategy.calculate_signal.reset_mock()
+
+            reliance_news = NewsEvent(datetime(2024, 1, 2), "RIL beats estimates", "news.test", 0.8,
+                                      tickers=("RELIANCE",))
+            await bus.put(reliance_news)
+            await bus.join()
+            calls = fuser.strategy.calculate_signal.call_args_list
+            self.assertEqual([(c.args[0].ticker, c.args[1]) for c in calls], [("RELIANCE", reliance_news)])
+
+            market_news = NewsEvent(datetime(2024, 1, 2), "RBI holds rates", "news.test", 0.1)
+            await bus.put(market_news)
+            await bus.join()
+            latest = {c.args[0].ticker: c.args[1] for c in fuser.strategy.calculate_signal.call_args_list[1:]}
+            self.assertEqual(latest, {"RELIANCE": reliance_news, "TCS": market_news})
+        finally:
+            for task in tasks:
+                task.cancel()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+Local Broker Emulator
+Stands in for the broker on a laptop: streams ticks over a websocket in the
+format WebsocketManager decodes ([Feed] format), and serves the REST
+endpoints APIClient calls (/orders, /orders/{id}, /historical-data/{ticker},
+/user/balance, /feed/market-data-feed/authorize) with configurable latency
+and fill behaviour. Ticks come from the market simulator ([Simulator]) or
+from a recorded event journal replayed at any speed.
+
+Clients that send {"type": "subscribe"|"unsubscribe", "tickers": [...]}
+only receive their subscribed tickers; clients that never subscribe
+receive everything.
+
+GET /stats reports tick-to-order latency (time from sending the last tick
+of a ticker to receiving an order for it) and per-endpoint service times.
+
+Point the agent at it with:
+    [Broker] websocket_url = ws://localhost:8080, rest_url = http://localhost:8081
+
+Usage: python tools/broker_emulator.py [--journal events.journal --speed 10 --loop]
+                                       [--latency-ms 20 --jitter-ms 5] [--fill-mode delayed --fill-delay-ms 200]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+import time
+import zlib
+from datetime import date, datetime, timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import websockets
+
+# Add the project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.core.config_loader import ConfigLoader
+from src.core.event_types import MarketEvent, MarketEventBatch
+from src.core.journal import JournalReader
+from src.core.metrics import LatencyHistogram
+from src.data_handler.feed_decoders import BinaryDecoder, parse_instruments
+from src.data_handler.market_simulator import MarketSimulator, SESSION_SECONDS
+
+logger = logging.getLogger(__name__)
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+HISTORY_EPOCH = date(2000, 1, 1)
+
+
+async def simulator_ticks(simulator: MarketSimulator) -> AsyncIterator[Any]:
+    """Paced simulator steps (see MarketSimulator.run)."""
+    started = time.monotonic()
+    simulator.start_ns = time.time_ns()
+    while True:
+        event = simulator.step()
+        if event is not None:
+            yield event
+        delay = started + simulator.elapsed / simulator.speed - time.monotonic() if simulator.speed > 0 else 0.0
+        await asyncio.sleep(max(delay, 0.0))
+
+
+async def journal_ticks(path: str, speed: float, loop: bool) -> AsyncIterator[Any]:
+    """Market events from a journal, with recorded gaps scaled by 1/speed (0 = unpaced)."""
+    while True:
+        started_ns = time.monotonic_ns()
+        first_ns = None
+        with JournalReader(path) as reader:
+            for enqueued_ns, event in reader:
+                if not isinstance(event, (MarketEvent, MarketEventBatch)):
+                    continue
+                if speed > 0:
+                    first_ns = enqueued_ns if first_ns is None else first_ns
+                    delay_ns = started_ns + (enqueued_ns - first_ns) / speed - time.monotonic_ns()
+                    if delay_ns > 0:
+                        await asyncio.sleep(delay_ns / 1e9)
+                else:
+                    await asyncio.sleep(0)
+                yield event
+        if not loop:
+            return
+
+
+class BrokerEmulator:
+    """
+    Websocket tick stream plus a minimal keep-alive HTTP/1.1 JSON server.
+    Orders fill at the last streamed price plus `slippage_bps`, either
+    immediately or after `fill_delay_ms`; `reject_rate` rejects a random
+    share of them. Historical bars are synthesised from a per-ticker seed,
+    so repeated requests for the same range return the same data.
+    """
+
+    def __init__(self, ticks: AsyncIterator[Any], feed_format: str = "json", instruments: Optional[Dict[int, str]] = None,
+                 latency_ms: float = 0.0, jitter_ms: float = 0.0, fill_mode: str = "immediate",
+                 fill_delay_ms: float = 0.0, reject_rate: float = 0.0, slippage_bps: float = 0.0,
+                 cash: float = 100000.0, ws_url: str = "ws://localhost:8080", seed: Optional[int] = None):
+        self.ticks = ticks
+        self.feed_format = feed_format
+        self.binary = BinaryDecoder(instruments or {}) if feed_format == "binary" else None
+        self.latency = latency_ms / 1000.0
+        self.jitter = jitter_ms / 1000.0
+        self.fill_mode = fill_mode
+        self.fill_delay = fill_delay_ms / 1000.0
+        self.reject_rate = reject_rate
+        self.slippage = slippage_bps / 10000.0
+        self.cash = cash
+        self.ws_url = ws_url
+        self.rng = random.Random(seed)
+        self.clients: Set[Any] = set()
+        self.subscriptions: Dict[Any, Set[str]] = {}
+        self.last_prices: Dict[str, float] = {}
+        self.last_sent_ns: Dict[str, int] = {}
+        self.orders: Dict[str, Dict[str, Any]] = {}
+        self.frames_sent = 0
+        self.ticks_sent = 0
+        self.tick_to_order = LatencyHistogram()
+        self.service_times: Dict[str, LatencyHistogram] = {}
+        self._history: Dict[str, np.ndarray] = {}
+
+    # --- Tick stream ---
+
+    def encode(self, event) -> Any:
+        events = event if isinstance(event, MarketEventBatch) else (event,)
+        if self.binary is not None:
+            known = self.binary.instruments.values()
+            return self.binary.encode(((e.ticker, e.price, e.volume) for e in events if e.ticker in known), event.ts_ns)
+        if isinstance(event, MarketEvent):
+            return json.dumps({"type": "tick", "ticker": event.ticker, "price": event.price,
+                               "volume": event.volume, "ts": event.ts_ns})
+        return json.dumps({"type": "ticks", "ts": event.ts_ns, "data": [
+            {"ticker": e.ticker, "price": e.price, "volume": e.volume} for e in events
+        ]})
+
+    @staticmethod
+    def select(event, tickers: Set[str]):
+        """The part of `event` for `tickers`, or None."""
+        if isinstance(event, MarketEvent):
+            return event if event.ticker in tickers else None
+        wanted = [i for i, symbol in enumerate(event.symbols) if symbol in tickers]
+        mask = np.isin(event.ticker_ids, wanted)
+        if not mask.any():
+            return None
+        return MarketEventBatch(event.symbols, event.ticker_ids[mask], event.prices[mask], event.volumes[mask],
+                                event.ts_ns)
+
+    async def stream(self) -> None:
+        async for event in self.ticks:
+            latest = event.latest() if isinstance(event, MarketEventBatch) else {event.ticker: event}
+            for ticker, tick in latest.items():
+                self.last_prices[ticker] = tick.price
+            if not self.clients:
+                continue
+            groups: Dict[Optional[frozenset], List[Any]] = {}
+            for client in self.clients:
+                tickers = self.subscriptions.get(client)
+                groups.setdefault(frozenset(tickers) if tickers is not None else None, []).append(client)
+            for tickers, clients in groups.items():
+                selected = event if tickers is None else self.select(event, tickers)
+                if selected is not None:
+                    websockets.broadcast(clients, self.encode(selected))
+            sent_ns = time.monotonic_ns()
+            for ticker in latest:
+                self.last_sent_ns[ticker] = sent_ns
+            self.frames_sent += 1
+            self.ticks_sent += len(event) if isinstance(event, MarketEventBatch) else 1
+        logger.info("Tick source exhausted.")
+
+    async def serve_websocket(self, websocket) -> None:
+        self.clients.add(websocket)
+        logger.info(f"Feed client connected ({len(self.clients)} total)")
+        try:
+            async for message in websocket:
+                request = json.loads(message)
+                tickers = self.subscriptions.setdefault(websocket, set())
+                if request.get("type") == "subscribe":
+                    tickers.update(request.get("tickers", ()))
+                elif request.get("type") == "unsubscribe":
+                    tickers.difference_update(request.get("tickers", ()))
+        except (websockets.exceptions.ConnectionClosed, ValueError):
+            pass
+        finally:
+            self.clients.discard(websocket)
+            self.subscriptions.pop(websocket, None)
+
+    # --- REST ---
+
+    async def serve_http(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length") or 0))
+
+                started = time.monotonic_ns()
+                status, payload, route = await self.handle(method.upper(), target, body)
+                data = json.dumps(payload).encode()
+                close = headers.get("connection", "").lower() == "close"
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n{'Connection: close' if close else 'Connection: keep-alive'}"
+                    f"\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+                histogram = self.service_times.setdefault(route, LatencyHistogram())
+                histogram.record(time.monotonic_ns() - started)
+                if close:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def handle(self, method: str, target: str, body: bytes) -> Tuple[int, Any, str]:
+        parts = urlsplit(target)
+        path = parts.path.rstrip("/")
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        if path == "/stats":
+            return 200, self.stats(), "stats"
+
+        delay = self.rng.gauss(self.latency, self.jitter) if self.jitter else self.latency
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if path == "/orders":
+            if method != "POST":
+                return 405, {"error": "use POST"}, "orders"
+            return (*self.place_order(json.loads(body or b"{}")), "orders")
+        if path.startswith("/orders/"):
+            order = self.orders.get(path[len("/orders/"):])
+            return (200, order, "order_status") if order else (404, {"error": "unknown order"}, "order_status")
+        if path.startswith("/historical-data/"):
+            try:
+                bars = self.history(path[len("/historical-data/"):], query.get("interval", "1day"),
+                                    date.fromisoformat(query["from"]), date.fromisoformat(query["to"]))
+            except (KeyError, ValueError) as e:
+                return 400, {"error": f"bad request: {e}"}, "historical_data"
+            return 200, bars, "historical_data"
+        if path == "/user/balance":
+            return 200, {"balance": round(self.cash, 2)}, "balance"
+        if path == "/feed/market-data-feed/authorize":
+            return 200, {"data": {"authorized_redirect_uri": self.ws_url}}, "authorize"
+        return 404, {"error": f"no route for {path}"}, "other"
+
+    def place_order(self, details: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        ticker = details.get("ticker")
+        sent_ns = self.last_sent_ns.get(ticker)
+        if sent_ns is not None:
+            self.tick_to_order.record(time.monotonic_ns() - sent_ns)
+
+        order_id = f"EMU{len(self.orders) + 1:08d}"
+        order = {"order_id": order_id, "status": "PENDING", "ticker": ticker, "action": details.get("action"),
+                 "quantity": details.get("quantity"), "fill_price": None}
+        self.orders[order_id] = order
+        if ticker not in self.last_prices or self.rng.random() < self.reject_rate:
+            order["status"] = "REJECTED"
+        elif self.fill_mode == "delayed":
+            asyncio.get_running_loop().call_later(self.fill_delay, self._fill, order)
+        else:
+            self._fill(order)
+        return 200, {"order_id": order_id, "status": order["status"]}
+
+    def _fill(self, order: Dict[str, Any]) -> None:
+        side = 1.0 if order["action"] == "BUY" else -1.0
+        price = round(self.last_prices[order["ticker"]] * (1.0 + side * self.slippage), 2)
+        order.update(status="FILLED", fill_price=price)
+        self.cash -= side * price * float(order["quantity"] or 0)
+
+    def _daily_closes(self, ticker: str, until: date) -> np.ndarray:
+        """Deterministic daily close path since HISTORY_EPOCH, extended on demand."""
+        days = (max(until, date.today()) - HISTORY_EPOCH).days + 1
+        closes = self._history.get(ticker)
+        if closes is None or len(closes) < days:
+            rng = np.random.default_rng(zlib.crc32(ticker.encode()))
+            base = float(rng.uniform(100, 5000))
+            closes = base * np.exp(np.cumsum(rng.normal(0.0, 0.015, days)))
+            self._history[ticker] = closes
+        return closes
+
+    def history(self, ticker: str, interval: str, start: date, end: date):
+        """Synthetic OHLCV bars for weekdays in [start, end]: `1day` or `<n>minute` intervals."""
+        closes = self._daily_closes(ticker, end)
+        minutes = int(interval[:-len("minute")]) if interval.endswith("minute") else 0
+        bars = []
+        day = start
+        while day <= end:
+            if day.weekday() < 5 and day >= HISTORY_EPOCH:
+                index = (day - HISTORY_EPOCH).days
+                close = closes[index]
+                prev = closes[index - 1] if index else close
+                rng = np.random.default_rng((zlib.crc32(ticker.encode()), index))
+                session = datetime.combine(day, datetime.min.time()) + timedelta(hours=9, minutes=15)
+                if minutes:
+                    count = SESSION_SECONDS // 60 // minutes
+                    path = prev * np.exp(np.cumsum(rng.normal(0.0, 0.015 / np.sqrt(count), count)))
+                    path *= close / path[-1]
+                    opens = np.concatenate(([prev], path[:-1]))
+                    for i in range(count):
+                        bars.append(self._bar(session + timedelta(minutes=i * minutes), opens[i], path[i], rng))
+                else:
+                    bars.append(self._bar(session.replace(hour=0, minute=0), prev, close, rng))
+            day += timedelta(days=1)
+        return bars
+
+    @staticmethod
+    def _bar(timestamp: datetime, open_: float, close: float, rng) -> Dict[str, Any]:
+        spread = abs(rng.normal(0.0, 0.003))
+        return {
+            "date": timestamp.isoformat(),
+            "open": round(float(open_), 2),
+            "high": round(float(max(open_, close) * (1 + spread)), 2),
+            "low": round(float(min(open_, close) * (1 - spread)), 2),
+            "close": round(float(close), 2),
+            "volume": int(rng.integers(1000, 100000)),
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "clients": len(self.clients),
+            "frames_sent": self.frames_sent,
+            "ticks_sent": self.ticks_sent,
+            "orders": len(self.orders),
+            "tick_to_order_us": self.tick_to_order.summary(1000.0),
+            "service_us": {route: h.summary(1000.0) for route, h in self.service_times.items()},
+        }
+
+
+async def main(args) -> None:
+    config = ConfigLoader()
+    if args.journal:
+        ticks = journal_ticks(args.journal, args.speed, args.loop)
+    else:
+        simulator = MarketSimulator.from_config(config)
+        simulator.speed = args.speed
+        if args.seed is not None:
+            simulator.seed, simulator.rng = args.seed, np.random.default_rng(args.seed)
+        if args.rate:
+            simulator.rate = args.rate
+        ticks = simulator_ticks(simulator)
+
+    feed_format = args.format or config.get("Feed", "format", fallback="json").lower()
+    instruments = parse_instruments(config.get("Feed", "instruments", fallback=""))
+    if feed_format == "binary" and not instruments:
+        raise SystemExit("The binary feed needs [Feed] instruments (token:TICKER,...).")
+    ws_url = f"ws://{args.host}:{args.ws_port}"
+    emulator = BrokerEmulator(
+        ticks, feed_format, instruments,
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, fill_mode=args.fill_mode,
+        fill_delay_ms=args.fill_delay_ms, reject_rate=args.reject_rate, slippage_bps=args.slippage_bps,
+        cash=args.cash, ws_url=ws_url, seed=args.seed,
+    )
+
+    rest = await asyncio.start_server(emulator.serve_http, args.host, args.rest_port)
+    async with websockets.serve(emulator.serve_websocket, args.host, args.ws_port):
+        print(f"Broker emulator: feed {ws_url} ({feed_format}), REST http://{args.host}:{args.rest_port}")
+        try:
+            async with rest:
+                await emulator.stream()
+                await rest.serve_forever()
+        finally:
+            print(json.dumps(emulator.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    config_port = urlsplit(ConfigLoader().get("Broker", "websocket_url", fallback="ws://localhost:8080")).port or 8080
+    parser = argparse.ArgumentParser(description="Run a local broker stand-in (websocket feed + REST).")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--ws-port", type=int, default=config_port, help="Feed port (default: [Broker] websocket_url).")
+    parser.add_argument("--rest-port", type=int, default=8081)
+    parser.add_argument("--format", choices=["json", "binary"], help="Feed format (default: [Feed] format).")
+    parser.add_argument("--journal", help="Replay market events from this journal instead of the simulator.")
+    parser.add_argument("--loop", action="store_true", help="Restart the journal when it ends.")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="Replay/simulation rate relative to wall clock (0 = as fast as possible).")
+    parser.add_argument("--rate", type=float, help="Simulator ticks per second (default: [Simulator] rate).")
+    parser.add_argument("--seed", type=int, help="Seed for the simulator, latency jitter and rejections.")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Added REST latency.")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Std deviation of the REST latency.")
+    parser.add_argument("--fill-mode", choices=["immediate", "delayed"], default="immediate")
+    parser.add_argument("--fill-delay-ms", type=float, default=200.0, help="Fill delay in delayed mode.")
+    parser.add_argument("--reject-rate", type=float, default=0.0, help="Share of orders rejected (0-1).")
+    parser.add_argument("--slippage-bps", type=float, default=0.0, help="Fill price slippage against the order.")
+    parser.add_argument("--cash", type=float, default=100000.0, help="Starting account balance.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    try:
+        asyncio.run(main(args))
+    except KeyboardInterrupt:
+        pass
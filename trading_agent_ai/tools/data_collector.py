@@ -1,69 +1,75 @@
 """
 Data Collector Tool
-Downloads historical market data from broker APIs and saves to data/raw/
+Downloads historical market data from broker APIs into the Parquet archive
+(local_database/archive/bars_<interval>/) and, with --csv, to data/raw/.
+Days already in the archive are not downloaded again.
 """
 
+import argparse
+import asyncio
 import sys
+from datetime import date, timedelta
 from pathlib import Path
-import pandas as pd
 import logging
 
-# Add src to path
-sys.path.append(str(Path(__file__).parent.parent / "src"))
+# Add the project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from core.config_loader import ConfigLoader
-from data_handler.api_client import APIClient
+from src.core.config_loader import ConfigLoader
+from src.data_handler.api_client import APIClient
+from src.data_handler.historical_cache import HistoricalDataCache
+from src.data_handler.parquet_archive import ParquetArchive
 
 logger = logging.getLogger(__name__)
 
 class DataCollector:
-    def __init__(self):
+    def __init__(self, write_csv: bool = False):
         self.config = ConfigLoader()
         self.api_client = APIClient(self.config)
+        self.archive = ParquetArchive.from_config(self.config)
+        # Only days not already in the archive are downloaded
+        self.cache = HistoricalDataCache(self.api_client, self.archive)
+        self.write_csv = write_csv
         self.raw_data_dir = Path("data/raw")
         self.raw_data_dir.mkdir(parents=True, exist_ok=True)
 
-    def collect_historical_data(self, ticker: str, interval: str = "1day", days: int = 365):
+    async def collect_historical_data(self, ticker: str, interval: str = "1day", days: int = 365):
         """
         Collects historical data for a given ticker.
         """
         try:
-            from datetime import datetime, timedelta
-            
-            end_date = datetime.now()
+            end_date = date.fromisoformat(self.archive.today())
             start_date = end_date - timedelta(days=days)
-            
-            # Format dates for API
-            start_str = start_date.strftime("%Y-%m-%d")
-            end_str = end_date.strftime("%Y-%m-%d")
-            
-            # Fetch data from broker API
-            data = self.api_client.get_historical_data(
-                ticker=ticker,
-                interval=interval,
-                from_date=start_str,
-                to_date=end_str
-            )
-            
-            # Convert to DataFrame and save
-            df = pd.DataFrame(data)
-            filename = f"{ticker}_{interval}_{days}days.csv"
-            filepath = self.raw_data_dir / filename
-            
-            df.to_csv(filepath, index=False)
-            logger.info(f"Saved {len(df)} records to {filepath}")
+
+            requests_before = self.cache.requests
+            bars = await self.cache.get(ticker, interval, start_date, end_date)
+            logger.info(f"{ticker}: {len(bars)} {interval} bars in the archive, "
+                        f"{self.cache.requests - requests_before} request(s) made")
+
+            if self.write_csv:
+                filepath = self.raw_data_dir / f"{ticker}_{interval}_{days}days.csv"
+                bars.rename_axis("date").to_csv(filepath)
+                logger.info(f"Saved {len(bars)} records to {filepath}")
             
         except Exception as e:
             logger.error(f"Error collecting data for {ticker}: {e}")
 
+    async def collect_all(self, tickers, interval: str, days: int):
+        for ticker in tickers:
+            print(f"Collecting data for {ticker}...")
+            await self.collect_historical_data(ticker, interval, days)
+        await self.api_client.aclose()
+
 if __name__ == "__main__":
-    collector = DataCollector()
-    
-    # Example: Collect data for major Indian indices
-    tickers = ["NIFTY", "BANKNIFTY", "RELIANCE", "TCS", "INFY"]
-    
-    for ticker in tickers:
-        print(f"Collecting data for {ticker}...")
-        collector.collect_historical_data(ticker)
-    
+    parser = argparse.ArgumentParser(description="Download historical bars into the Parquet archive.")
+    # Default: major Indian indices and large caps
+    parser.add_argument("tickers", nargs="*", default=["NIFTY", "BANKNIFTY", "RELIANCE", "TCS", "INFY"])
+    parser.add_argument("--interval", default="1day", help="Broker bar interval, e.g. 1minute or 1day.")
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--csv", action="store_true", help="Also write data/raw/<ticker>_<interval>_<days>days.csv")
+    args = parser.parse_args()
+
+    collector = DataCollector(write_csv=args.csv)
+    asyncio.run(collector.collect_all(args.tickers, args.interval, args.days))
+
     print("Data collection complete!")
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Journal Replay Tool
+Re-publishes a recorded event journal into a fresh MainFuser / RiskManager /
+Portfolio stack, either as fast as possible or at a scaled wall-clock rate.
+Use it to reproduce a session offline or to benchmark the pipeline.
+
+Usage: python tools/replay_journal.py local_database/journals/events_20260101_091500.journal --speed 0
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+
+# Add the project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.core.event_bus import event_bus
+from src.core.event_types import SignalEvent, OrderRequestEvent, FillEvent
+from src.core.journal import JournalReplayer
+from src.strategy_handler.main_fuser import MainFuser
+from src.portfolio_manager.portfolio import Portfolio
+from src.portfolio_manager.risk_manager import RiskManager
+
+logger = logging.getLogger(__name__)
+
+
+async def replay(path: str, speed: float, lockstep: bool) -> None:
+    main_fuser = MainFuser()
+    portfolio = Portfolio()
+    risk_manager = RiskManager(portfolio)
+    counts = {"signals": 0, "orders": 0}
+
+    # Orders are counted but not executed: recorded fills stand in for the broker
+    subscription = event_bus.subscribe("replay_dispatcher", (SignalEvent, OrderRequestEvent, FillEvent))
+
+    async def dispatcher():
+        while True:
+            event = await subscription.get()
+            if isinstance(event, SignalEvent):
+                counts["signals"] += 1
+                await risk_manager.on_signal(event)
+            elif isinstance(event, OrderRequestEvent):
+                counts["orders"] += 1
+            elif isinstance(event, FillEvent):
+                portfolio.on_fill(event)
+            subscription.task_done()
+
+    main_fuser.start()
+    dispatcher_task = asyncio.create_task(dispatcher())
+
+    replayer = JournalReplayer(path, event_bus, speed=speed, lockstep=lockstep)
+    published = await replayer.run()
+    await event_bus.join()
+    dispatcher_task.cancel()
+
+    rate = published / replayer.elapsed if replayer.elapsed else 0.0
+    print("\n--- Replay Results ---")
+    print(f"Events replayed : {published} in {replayer.elapsed:.2f}s ({rate:,.0f} events/s)")
+    print(f"Signals         : {counts['signals']}")
+    print(f"Order requests  : {counts['orders']}")
+    print(f"Final cash      : {portfolio.get_cash():.2f}")
+    print(f"Final positions : {portfolio.get_positions()}")
+    print("----------------------\n")
+    event_bus.log_stats()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a recorded event journal.")
+    parser.add_argument("journal", type=str, help="Path to the .journal file.")
+    parser.add_argument("--speed", type=float, default=0.0,
+                        help="Replay rate relative to wall clock (1.0 = real time, 0 = as fast as possible).")
+    parser.add_argument("--no-lockstep", action="store_true",
+                        help="Don't wait for each event to be fully processed (faster, not deterministic).")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    asyncio.run(replay(args.journal, args.speed, not args.no_lockstep))